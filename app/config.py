@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Dict, List, Any
 
 
 class Settings(BaseSettings):
@@ -7,12 +7,170 @@ class Settings(BaseSettings):
     LLM_PROVIDER: str = "openai"
     OPENAI_API_KEY: Optional[str] = None
     OLLAMA_BASE_URL: str = "http://localhost:11434/v1"
+    OPENAI_MODEL: str = "gpt-3.5-turbo"
+    OLLAMA_MODEL: str = "llama3.1"
+    LLM_TIMEOUT_SECONDS: float = 120.0  # 응답 생성까지 포함한 요청 타임아웃
+    LLM_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    LLM_MAX_RETRIES: int = 2  # 연결 오류/429/5xx 재시도 횟수 (지수 백오프)
+    LLM_MAX_CONNECTIONS: int = 32
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 16
+    LLM_CONCURRENCY: Dict[str, int] = {"openai": 16, "ollama": 2}  # Provider별 동시 요청 수
+    LLM_DEFAULT_CONCURRENCY: int = 4
+    LLM_TEMPERATURE: float = 0.5
+
+    # Long Transcript (Map-Reduce) Settings
+    SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS: int = 3000  # 이 토큰 수를 넘는 대화는 구간별 추출 후 병합
+    SUMMARY_CHUNK_TOKENS: int = 1500  # 구간별 추출 호출에 보내는 최대 토큰 수
+    SUMMARY_EXTRACT_TEMPLATE: str = "soap_extract"
+
+    # Extractive (rule-based) Summary Settings
+    SUMMARY_EXTRACTIVE_MAX_SENTENCES: int = 5
+    SUMMARY_EXTRACTIVE_RATIO: float = 0.2  # 전체 문장 중 선택할 비율 (최대 MAX_SENTENCES)
+    SUMMARY_KEYWORD_BOOST: float = 0.5  # 의료 용어/수치 1개당 점수 가중치 (최대 3개)
+    SUMMARY_EXTRA_KEYWORDS: List[str] = []  # 기본 의료 용어 목록에 추가할 키워드
+    SUMMARY_LLM_FALLBACK: bool = True  # LLM 호출 실패 시 추출 요약으로 대체
+
+    # Summary Cache Settings
+    SUMMARY_CACHE_ENABLED: bool = True
+    SUMMARY_CACHE_MAX_ENTRIES: int = 1024  # LRU 최대 항목 수
+    SUMMARY_CACHE_TTL_SECONDS: int = 6 * 60 * 60
+    SUMMARY_CACHE_DB_PATH: Optional[str] = None  # 지정 시 SQLite 디스크 캐시 사용
+
+    # Prompt Template Settings
+    PROMPT_DIR: Optional[str] = None  # 기본값: app/prompts
+    PROMPT_DEFAULT_TEMPLATE: str = "soap_summary"
+    PROMPT_RELOAD_INTERVAL_SECONDS: float = 2.0  # 템플릿 파일 변경 확인 주기 (0: 비활성화)
 
     # EMR Settings
     EMR_API_URL: Optional[str] = None
+    EMR_MAX_CONNECTIONS: int = 100
+    EMR_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    EMR_KEEPALIVE_EXPIRY_SECONDS: float = 30.0  # 유휴 연결을 닫기까지의 시간
+    EMR_HTTP2: bool = False  # h2 패키지가 설치된 경우에만 적용
+    EMR_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    EMR_TIMEOUT_SECONDS: float = 10.0  # 단건 조회 기본 타임아웃
+    # 경로 패턴(fnmatch)별 타임아웃, 먼저 맞는 패턴 적용 (목록 조회는 더 길게)
+    EMR_ROUTE_TIMEOUTS: Dict[str, float] = {
+        "patients/": 30.0,
+        "doctors/": 30.0,
+        "visits/": 30.0,
+        "patients/*/visits": 30.0,
+    }
+
+    # EMR Read-through Cache
+    EMR_CACHE_ENABLED: bool = True
+    EMR_CACHE_MAX_ENTRIES: int = 2048
+    # 리소스별 TTL (초), 만료 후에는 ETag/Last-Modified로 재검증
+    EMR_CACHE_TTLS: Dict[str, int] = {
+        "doctors": 60 * 60,  # 의사 목록
+        "doctor": 60 * 60,
+        "patient": 60,
+    }
+    # 쓰기 요청 시 함께 무효화할 리소스 (경로 첫 구간 기준)
+    EMR_CACHE_INVALIDATION: Dict[str, List[str]] = {
+        "visits": ["patients"],
+    }
+    # 캐시 키에 포함하는 인증 헤더 (사용자별로 응답을 분리)
+    EMR_CACHE_CREDENTIAL_HEADERS: List[str] = [
+        "authorization",
+        "proxy-authorization",
+        "cookie",
+        "x-api-key",
+    ]
+
+    # /emr/patients/{id}/context
+    EMR_CONTEXT_CONCURRENCY: int = 8  # 요청 하나가 동시에 보내는 EMR 요청 수
+    EMR_CONTEXT_MAX_VISITS: int = 10  # 포함할 최근 방문 수
+
+    # /emr/{collection}/export
+    EMR_EXPORT_PAGE_SIZE: int = 100  # EMR에 한 번에 요청하는 레코드 수 (EMR 목록 API 최대값)
+    EMR_EXPORT_MAX_PAGE_SIZE: int = 5000
 
     # App Settings
     UPLOAD_DIR: str = "uploads"
+    UPLOAD_SPOOL_MAX_BYTES: int = 32 * 1024 * 1024  # 이 크기를 넘는 업로드만 디스크로 넘김
+
+    # Per-request Profiling (X-Profile: 1 헤더 또는 ?trace=1)
+    PROFILING_ENABLED: bool = False  # 켜져 있어도 요청한 경우에만 프로파일링
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_DIR: str = "profiles"  # {trace_id}.json (구간), {trace_id}.prof (cProfile)
+    PROFILING_CPROFILE: bool = True  # False이면 구간 시간만 기록
+
+    # STT Model Settings
+    STT_DEVICE: str = "auto"  # 'auto' (CUDA 시도 후 CPU), 'cuda', 'cpu'
+    STT_PRELOAD_MODELS: List[str] = ["base"]  # 서버 시작 시 로딩 및 워밍업할 모델
+    STT_MODEL_MEMORY_BUDGET_MB: Optional[float] = None  # 초과 시 LRU 모델 해제
+
+    # STT Decoding Profiles
+    # compute_type/cpu_threads/num_workers는 모델 생성 옵션, 나머지는 model.transcribe() 인자
+    STT_DECODING_PROFILES: Dict[str, Dict[str, Any]] = {
+        "fast": {
+            "compute_type": "int8",
+            "beam_size": 1,
+            "best_of": 1,
+            "temperature": [0.0],
+            "vad_filter": True,
+            "condition_on_previous_text": False,
+        },
+        "balanced": {
+            "beam_size": 5,
+            "temperature": [0.0, 0.2, 0.4, 0.6, 0.8, 1.0],
+            "vad_filter": False,
+            "condition_on_previous_text": True,
+        },
+        "accurate": {
+            "compute_type": "float32",
+            "beam_size": 5,
+            "best_of": 5,
+            "patience": 2.0,
+            "temperature": [0.0, 0.2, 0.4, 0.6, 0.8, 1.0],
+            "vad_filter": False,
+            "condition_on_previous_text": True,
+        },
+    }
+    STT_DEFAULT_PROFILE: str = "balanced"
+
+    # STT Inference Settings
+    STT_MAX_QUEUE_SIZE: int = 8  # 대기 가능한 최대 요청 수 (초과 시 503)
+    STT_MODEL_CONCURRENCY: Dict[str, int] = {}  # 모델별 동시 실행 수 (예: {"base": 2})
+    STT_DEFAULT_MODEL_CONCURRENCY: int = 1
+    STT_RETRY_AFTER_SECONDS: int = 10
+    STT_LANGUAGE: Optional[str] = None  # 지정 시 언어 감지 생략 (예: "ko")
+
+    # STT Micro-batching Settings
+    STT_BATCHING_ENABLED: bool = False
+    STT_BATCH_MAX_SIZE: int = 8  # 한 배치에 묶을 최대 요청 수
+    STT_BATCH_MAX_WAIT_MS: int = 50  # 배치 수집으로 인한 최대 추가 지연
+    STT_BATCH_MAX_AUDIO_SECONDS: float = 30.0  # 이 길이 이하의 오디오만 배치 처리 (최대 30초)
+
+    # STT Long Audio Settings (침묵 기준으로 나눈 구간을 프로세스 풀에서 병렬 전사)
+    # 워커 프로세스마다 모델을 따로 로딩하므로 메모리가 워커 수만큼 늘어남
+    # (예: small 모델 x 4 워커). 메모리 여유를 확인한 뒤 켜야 하므로 기본값은 꺼짐
+    STT_LONG_AUDIO_ENABLED: bool = False
+    STT_LONG_AUDIO_SECONDS: float = 300.0  # 이 길이를 넘는 오디오에 자동 적용
+    STT_LONG_AUDIO_CHUNK_SECONDS: float = 60.0  # 구간 최대 길이 (가능하면 침묵에서 분할)
+    STT_LONG_AUDIO_MIN_SILENCE_MS: int = 500  # 분할 지점으로 사용할 최소 침묵 길이
+    STT_LONG_AUDIO_WORKERS: int = 4  # 워커 프로세스 수 (프로세스마다 모델 인스턴스 보유)
+    STT_LONG_AUDIO_CPU_THREADS: int = 0  # 워커당 CPU 스레드 (0: 코어 수 / 워커 수)
+
+    # STT Result Cache Settings
+    STT_CACHE_ENABLED: bool = True
+    STT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 메모리 캐시 바이트 예산
+    STT_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    STT_CACHE_DB_PATH: Optional[str] = None  # 지정 시 SQLite 디스크 캐시 사용
+
+    # Background Job Settings (POST /jobs)
+    JOB_DB_PATH: Optional[str] = None  # 기본값: UPLOAD_DIR/jobs.db
+    JOB_WORKERS: int = 2  # 동시에 처리할 작업 수
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0  # 새 작업 확인 주기
+    JOB_PROGRESS_INTERVAL_SECONDS: float = 1.0  # 진행률/부분 세그먼트 저장 주기
+
+    # Streaming (WebSocket) Settings
+    STREAM_MIN_SILENCE_MS: int = 600  # 발화 종료로 간주할 최소 침묵 길이
+    STREAM_SPEECH_PAD_MS: int = 200
+    STREAM_MAX_WINDOW_SECONDS: float = 20.0  # 확정되지 않은 구간의 최대 길이
+    STREAM_PARTIAL_BEAM_SIZE: int = 1  # 부분 결과는 greedy 디코딩
+    STREAM_DECODER_JOIN_TIMEOUT: float = 5.0
 
     class Config:
         env_file = ".env"
@@ -1,16 +1,36 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from typing import Optional
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import (
+    JSONResponse,
+    FileResponse,
+    PlainTextResponse,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
-import shutil
 import os
-import uuid
+import json
+import time
+import asyncio
 import logging
 from dotenv import load_dotenv
 
 from app.services.stt_service import stt_service
+from app.services.inference_executor import QueueFullError
 from app.services.summary_service import summary_service
-from app.routers import emr
+from app.services.llm_client import llm_client
+from app.services.emr_client import emr_client
+from app.services.emr_cache import emr_cache
+from app.services import metrics, profiling
+from app.services.prompt_registry import prompt_registry, TOKEN_COUNTER
+from app.services.job_service import job_service
+from app.services.audio_io import (
+    SAMPLE_RATE,
+    configure_upload_spool,
+    hash_upload,
+    load_audio,
+)
+from app.routers import emr, jobs, stream
 from app.schemas import STTResponse
 
 from app.config import settings
@@ -19,10 +39,28 @@ from app.config import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 설정된 모델을 미리 로딩/워밍업하여 첫 요청의 로딩 지연 제거
+    await asyncio.to_thread(stt_service.preload, settings.STT_PRELOAD_MODELS)
+    # 프롬프트 템플릿을 메모리에 올리고 파일 변경 감지 시작
+    prompt_registry.start()
+    # 백그라운드 전사 작업 워커 시작 (중단된 작업은 다시 대기열로)
+    await job_service.start()
+    yield
+    await job_service.stop()
+    prompt_registry.stop()
+    stt_service.shutdown()
+    await llm_client.aclose()
+    await emr_client.aclose()
+
+
 app = FastAPI(
     title="STT & Summary API",
     description="Faster-Whisper 기반 STT 및 요약 API 서버",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -35,13 +73,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 라우트별 응답 시간/처리 중 요청 수 기록 (/metrics)
+app.add_middleware(metrics.MetricsMiddleware)
+# 요청별 프로파일링 (PROFILING_ENABLED, X-Profile 헤더 또는 ?trace=1)
+app.add_middleware(profiling.ProfilingMiddleware)
+
 app.include_router(emr.router)
+app.include_router(stream.router)
+app.include_router(jobs.router)
 
 # Static file settings
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
-# 임시 파일 저장 경로
-os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+# 업로드는 메모리 스풀에서 바로 디코딩 (한도 초과 시에만 디스크 사용)
+configure_upload_spool(settings.UPLOAD_SPOOL_MAX_BYTES)
 
 
 @app.post("/upload-audio", response_model=STTResponse)
@@ -50,12 +95,30 @@ async def upload_audio(
     model_size: str = Form(
         "base", description="사용할 STT 모델 크기 ('base' 또는 'small')"
     ),
+    stream: bool = Form(
+        False, description="True이면 세그먼트를 디코딩되는 즉시 NDJSON으로 전송"
+    ),
+    profile: Optional[str] = Form(
+        None, description="디코딩 프로필 ('fast', 'balanced', 'accurate' 등)"
+    ),
+    summary_method: str = Form(
+        "rule-based", description="요약 방식 ('rule-based' 또는 'llm')"
+    ),
+    template: Optional[str] = Form(
+        None, description="LLM 요약 프롬프트 템플릿 이름 (기본값: PROMPT_DEFAULT_TEMPLATE)"
+    ),
 ):
     """
     오디오 파일을 업로드하여 텍스트로 변환(STT)하고 요약을 생성합니다.
 
     - **file**: .wav 또는 .m4a 음성 파일
     - **model_size**: 'base' (기본값) 또는 'small' 선택 가능
+    - **stream**: True이면 `application/x-ndjson` 응답으로 세그먼트를 한 줄씩 보낸 뒤
+      마지막 줄에 언어, 요약, 소요 시간을 담은 결과 레코드를 보냅니다.
+    - **profile**: 디코딩 속도/정확도 프로필 (기본값: STT_DEFAULT_PROFILE)
+    - **summary_method**: 'llm'이면 전사 중에 완료된 구간부터 LLM 요약을 진행하고
+      전사가 끝나면 짧은 merge 단계로 SOAP 요약을 완성합니다.
+    - **template**: summary_method='llm'일 때 사용할 프롬프트 템플릿
     """
 
     # 지원하는 파일 확장자 확인
@@ -67,53 +130,240 @@ async def upload_audio(
             detail="지원되지 않는 파일 형식입니다. (.wav, .m4a, .mp3, .webm 만 허용)",
         )
 
-    # 고유한 파일명 생성하여 저장 (동시 요청 충돌 방지)
-    unique_filename = f"{uuid.uuid4()}{ext}"
-    file_path = os.path.join(settings.UPLOAD_DIR, unique_filename)
+    # model_size 유효성 검사는 디코딩 전에 먼저 처리
+    if model_size not in ["base", "small"]:
+        raise HTTPException(
+            status_code=400, detail="model_size는 'base' 또는 'small'이어야 합니다."
+        )
 
     try:
-        # 1. 파일 저장
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        logger.info(f"파일 저장 완료: {file_path}")
-
-        # 2. STT 처리
-        # model_size 유효성 검사는 stt_service 내부 혹은 여기서 간단히 처리 가능
-        if model_size not in ["base", "small"]:
-            # 요청사항에는 'base' 또는 'small'을 선택할 수 있게 해달라고 했으므로 강제하거나 에러 처리
-            # 여기서는 편의상 base로 fallback하거나 에러를 낼 수 있음. 에러 처리:
-            raise HTTPException(
-                status_code=400, detail="model_size는 'base' 또는 'small'이어야 합니다."
-            )
+        profile, _ = stt_service.resolve_profile(profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        logger.info(f"STT 변환 시작 (Modelsize: {model_size})")
-        stt_result = stt_service.transcribe(file_path, model_size=model_size)
+    if summary_method not in ["rule-based", "llm"]:
+        raise HTTPException(
+            status_code=400,
+            detail="summary_method는 'rule-based' 또는 'llm'이어야 합니다.",
+        )
+    if summary_method == "llm" and template:
+        try:
+            prompt_registry.get(template, include_internal=False)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-        # 3. 요약 처리
-        full_text = stt_result["text"]
-        logger.info("요약 생성 시작")
-        summary_text = summary_service.summarize(full_text, method="rule-based")
+    try:
+        request_start = time.time()
+        audio_decode_time = 0.0
+        pipeline = None
+
+        # 1. 동일 오디오의 전사 결과가 캐시에 있으면 디코딩 생략
+        hash_start = time.time()
+        with profiling.span("upload_hash"):
+            audio_hash = await profiling.to_thread(hash_upload, file.file)
+        metrics.STAGE_DURATION.observe(time.time() - hash_start, stage="upload_hash")
+        cached = stt_service.lookup(audio_hash, model_size, profile)
+        if cached is not None:
+            logger.info(f"STT 캐시 적중: {filename}")
+            if stream:
+                return StreamingResponse(
+                    _stream_upload_result(
+                        stt_service.replay_stream(cached),
+                        request_start,
+                        cached=True,
+                        summary_method=summary_method,
+                        template=template,
+                    ),
+                    media_type="application/x-ndjson",
+                )
+            stt_result = cached
+            stt_result["processing_time"] = time.time() - request_start
+        else:
+            # 2. 업로드 스트림을 메모리에서 바로 16kHz 파형으로 디코딩
+            try:
+                decode_start = time.time()
+                with profiling.span("audio_decode"):
+                    audio = await profiling.to_thread(load_audio, file.file)
+                audio_decode_time = time.time() - decode_start
+                metrics.STAGE_DURATION.observe(audio_decode_time, stage="audio_decode")
+            except Exception as e:
+                logger.error(f"오디오 디코딩 실패: {str(e)}")
+                raise HTTPException(
+                    status_code=400, detail=f"오디오를 디코딩할 수 없습니다: {str(e)}"
+                )
+            logger.info(
+                f"오디오 디코딩 완료: {filename} ({len(audio) / SAMPLE_RATE:.1f}s)"
+            )
 
-        # 4. 응답 생성
+            # 3. STT 처리
+            logger.info(f"STT 변환 시작 (Modelsize: {model_size}, Profile: {profile})")
+            if stream:
+                events = stt_service.transcribe_stream(
+                    audio, model_size=model_size, audio_hash=audio_hash, profile=profile
+                )
+                return StreamingResponse(
+                    _stream_upload_result(
+                        events,
+                        request_start,
+                        audio_decode_time=audio_decode_time,
+                        summary_method=summary_method,
+                        template=template,
+                    ),
+                    media_type="application/x-ndjson",
+                )
+
+            with profiling.span("stt", model=model_size, profile=profile):
+                if summary_method == "llm":
+                    # 세그먼트가 나오는 대로 요약 파이프라인에 넣어 전사와 LLM 요약을 겹침
+                    pipeline = summary_service.pipeline(template=template)
+                    events = stt_service.transcribe_stream(
+                        audio, model_size=model_size, audio_hash=audio_hash, profile=profile
+                    )
+                    stt_result = await _transcribe_pipelined(events, pipeline)
+                else:
+                    stt_result = await stt_service.transcribe_async(
+                        audio, model_size=model_size, audio_hash=audio_hash, profile=profile
+                    )
+
+        # 4. 요약 처리
+        full_text = stt_result["text"]
+        logger.info(f"요약 생성 시작 ({summary_method})")
+        summary_start = time.time()
+        with profiling.span("summary", method=summary_method):
+            if pipeline is not None:
+                summary_text = (await pipeline.finish())["summary"]
+            else:
+                summary_text = await summary_service.summarize(
+                    full_text, method=summary_method, template=template
+                )
+        summary_time = time.time() - summary_start
+        metrics.STAGE_DURATION.observe(summary_time, stage="summary")
+
+        # 5. 응답 생성
         response = STTResponse(
             text=full_text,
             summary=summary_text,
             language=stt_result["language"],
             processing_time=stt_result["processing_time"],
             segments=stt_result["segments"],
+            cached=cached is not None,
+            profile=stt_result["profile"],
+            timings={
+                **({} if cached is not None else stt_result["timings"]),
+                "audio_decode": audio_decode_time,
+                "stt": stt_result["processing_time"],
+                "summary": summary_time,
+                "total": time.time() - request_start,
+            },
         )
 
         return response
 
+    except QueueFullError as e:
+        # 대기열 초과: 즉시 거절하고 재시도 시점을 안내
+        raise HTTPException(
+            status_code=503,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"처리 중 오류 발생: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+
+def _ndjson(record: dict) -> str:
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+async def _transcribe_pipelined(events, pipeline) -> dict:
+    """
+    STT 이벤트를 모아 전사 결과를 만들면서 세그먼트를 요약 파이프라인에 전달합니다.
+    """
+    segments = []
+    info = {}
+    try:
+        async for event in events:
+            if event["type"] == "segment":
+                segments.append(
+                    {"start": event["start"], "end": event["end"], "text": event["text"]}
+                )
+                pipeline.add(event["text"])
+            else:
+                info = event
+    except BaseException:
+        pipeline.cancel()
+        raise
     finally:
-        # 5. 임시 파일 정리
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            logger.info(f"임시 파일 삭제 완료: {file_path}")
+        await events.aclose()
+    return stt_service.build_result(segments, info)
+
+
+async def _stream_upload_result(
+    events,
+    request_start: float,
+    cached: bool = False,
+    audio_decode_time: float = 0.0,
+    summary_method: str = "rule-based",
+    template: Optional[str] = None,
+):
+    """
+    STT 이벤트를 NDJSON 줄로 변환합니다.
+    세그먼트를 받는 즉시 전송하고, 마지막에 요약과 소요 시간을 담은 결과 레코드를 보냅니다.
+    summary_method='llm'이면 세그먼트 전송과 동시에 구간별 LLM 요약을 진행합니다.
+    """
+    pipeline = (
+        summary_service.pipeline(template=template) if summary_method == "llm" else None
+    )
+    try:
+        texts = []
+        info = {}
+        async for event in events:
+            if event["type"] == "segment":
+                texts.append(event["text"])
+                if pipeline is not None:
+                    pipeline.add(event["text"])
+                yield _ndjson(event)
+            else:
+                info = event
+
+        full_text = " ".join(texts).strip()
+        summary_start = time.time()
+        if pipeline is not None:
+            summary_text = (await pipeline.finish())["summary"]
+        else:
+            summary_text = await summary_service.summarize(
+                full_text, method="rule-based"
+            )
+        summary_time = time.time() - summary_start
+        metrics.STAGE_DURATION.observe(summary_time, stage="summary")
+
+        yield _ndjson(
+            {
+                "type": "result",
+                "text": full_text,
+                "summary": summary_text,
+                "language": info.get("language", ""),
+                "processing_time": info.get("processing_time", 0.0),
+                "cached": cached,
+                "profile": info.get("profile"),
+                "timings": {
+                    **({} if cached else info.get("timings", {})),
+                    "audio_decode": audio_decode_time,
+                    "stt": info.get("processing_time", 0.0),
+                    "summary": summary_time,
+                    "total": time.time() - request_start,
+                },
+            }
+        )
+    except Exception as e:
+        logger.error(f"스트리밍 처리 중 오류 발생: {str(e)}")
+        yield _ndjson({"type": "error", "detail": str(e)})
+    finally:
+        if pipeline is not None:
+            pipeline.cancel()
+        await events.aclose()
 
 
 @app.get("/")
@@ -133,44 +383,145 @@ class TextSummaryRequest(BaseModel):
     text: str
     method: str = "llm"  # 'llm' or 'rule-based'
     custom_prompt: Optional[str] = None
+    template: Optional[str] = None  # 프롬프트 템플릿 이름 (예: soap_summary, discharge_note, referral)
+    stream: bool = False  # True이면 토큰을 server-sent events로 전송
 
 
 @app.post("/summarize-text")
 async def summarize_text(request: TextSummaryRequest):
     """
     텍스트를 입력받아 요약(SOAP Note 등)을 반환합니다.
-    custom_prompt가 제공되면 해당 프롬프트를 사용하여 요약합니다.
+    custom_prompt가 제공되면 해당 프롬프트를, 아니면 template 이름의 템플릿을 사용하여 요약합니다.
+    stream=true이면 text/event-stream으로 token 이벤트를 보내고 마지막에 done 이벤트를 보냅니다.
     """
+    if request.template and not request.custom_prompt:
+        try:
+            prompt_registry.get(request.template, include_internal=False)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    if request.stream:
+        return StreamingResponse(
+            _stream_summary_events(request),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     try:
-        summary = summary_service.summarize(
-            request.text, method=request.method, custom_prompt=request.custom_prompt
+        return await summary_service.summarize_result(
+            request.text,
+            method=request.method,
+            custom_prompt=request.custom_prompt,
+            template=request.template,
         )
-        return {"summary": summary}
     except Exception as e:
         logger.error(f"Error in summarize_text: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _stream_summary_events(request: TextSummaryRequest):
+    events = summary_service.stream_summary(
+        request.text,
+        method=request.method,
+        custom_prompt=request.custom_prompt,
+        template=request.template,
+    )
+    try:
+        async for event in events:
+            yield _sse(event.pop("type"), event)
+    except Exception as e:
+        logger.error(f"Error in streaming summary: {e}")
+        yield _sse("error", {"detail": str(e)})
+    finally:
+        await events.aclose()
+
+
 @app.get("/prompt")
-async def get_prompt():
+async def get_prompt(name: Optional[str] = None):
     """
-    현재 설정된 프롬프트 내용을 반환합니다.
+    프롬프트 템플릿 내용을 반환합니다. (name 미지정 시 기본 템플릿)
     """
     try:
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        prompt_path = os.path.join(
-            base_dir, "app", "prompts", "soap_summary_template.txt"
+        template = prompt_registry.get(
+            name or settings.PROMPT_DEFAULT_TEMPLATE, include_internal=False
         )
+    except ValueError as e:
+        if name:
+            raise HTTPException(status_code=404, detail=str(e))
+        return JSONResponse(content={"content": ""})
+    return template.to_dict(include_content=True)
 
-        if not os.path.exists(prompt_path):
-            return JSONResponse(content={"content": ""})
 
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        return {"content": content}
-    except Exception as e:
-        logger.error(f"Error reading prompt: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+@app.get("/prompts")
+async def list_prompts():
+    """
+    사용 가능한 프롬프트 템플릿 목록과 템플릿별 토큰 길이를 반환합니다.
+    """
+    return {
+        "default": settings.PROMPT_DEFAULT_TEMPLATE,
+        "token_counter": TOKEN_COUNTER,
+        "templates": prompt_registry.list_templates(),
+    }
+
+
+@app.get("/models")
+async def get_models():
+    """
+    로딩된 STT 모델과 디바이스, 추정 메모리 사용량을 반환합니다.
+    """
+    return stt_service.registry.stats()
+
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """
+    결과 캐시의 적중/미스 통계를 반환합니다.
+    """
+    return {
+        "stt": stt_service.cache.stats() if stt_service.cache is not None else None,
+        "summary": (
+            summary_service.cache.stats() if summary_service.cache is not None else None
+        ),
+    }
+
+
+def _collect_metrics():
+    # 다른 객체가 이미 세고 있는 값은 스크레이프 시점에만 읽음
+    executor = stt_service.executor.stats()
+    metrics.STT_QUEUE.set(executor["waiting"], state="waiting")
+    metrics.STT_QUEUE.set(executor["running"], state="running")
+    for name, cache in [("stt", stt_service.cache), ("summary", summary_service.cache)]:
+        if cache is not None:
+            stats = cache.stats()
+            metrics.RESULT_CACHE_LOOKUPS.set_total(stats["hits"], cache=name, result="hit")
+            metrics.RESULT_CACHE_LOOKUPS.set_total(stats["misses"], cache=name, result="miss")
+    stats = emr_cache.stats()
+    for key, result in [
+        ("hits", "hit"),
+        ("misses", "miss"),
+        ("revalidated", "revalidated"),
+        ("coalesced", "coalesced"),
+        ("bypassed", "bypass"),
+    ]:
+        metrics.RESULT_CACHE_LOOKUPS.set_total(stats[key], cache="emr", result=result)
+
+
+metrics.registry.collector(_collect_metrics)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus 텍스트 형식의 메트릭을 반환합니다.
+    (단계별/라우트별 지연 시간, 처리한 오디오 길이와 RTF, 대기열, 캐시, LLM, EMR)
+    """
+    return PlainTextResponse(
+        metrics.registry.render(), media_type="text/plain; version=0.0.4"
+    )
 
 
 @app.get("/llm-config")
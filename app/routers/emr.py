@@ -1,10 +1,15 @@
 import os
 import httpx
 from fastapi import APIRouter, Request, HTTPException, Response, Depends
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 import logging
 from app import schemas
 from app.config import settings
+from app.services.emr_client import emr_client
+from app.services.emr_cache import emr_cache
+from app.services.emr_context import EMRError, build_patient_context
+from app.services.emr_export import export_collection
 
 logger = logging.getLogger(__name__)
 
@@ -15,64 +20,134 @@ router = APIRouter(
 )
 
 
-async def forward_request(request: Request, method: str, path: str):
+def _rewrite_location(request: Request, headers: dict, base_url: str) -> dict:
+    """
+    Rewrite an upstream Location header to point back to the proxy.
+    """
+    if "location" in headers:
+        location = headers["location"]
+        if location.startswith(base_url):
+            # logic to rewrite location to point back to proxy
+            # We assume the path structure mirrors the proxy structure relative to /emr
+            # e.g. EMR /patients/1 -> Proxy /emr/patients/1
+            proxy_root = str(request.base_url).rstrip("/") + "/emr"
+            new_location = location.replace(base_url, proxy_root, 1)
+            headers["location"] = new_location
+    return headers
+
+
+# Client headers that describe the incoming request itself rather than the caller
+_EXCLUDED_HEADERS = {"host", "content-length"}
+# Additionally dropped for GETs the proxy builds itself (context, export): their
+# bodies are decoded here, not relayed, so the client's negotiation does not apply
+_DERIVED_EXCLUDED_HEADERS = {
+    "accept-encoding",
+    "content-type",
+    "transfer-encoding",
+    "if-none-match",
+    "if-modified-since",
+    "range",
+}
+
+
+def _upstream_headers(request: Request, derived: bool = False) -> dict:
+    """
+    Client headers to forward to the EMR (credentials such as Authorization,
+    Cookie or X-Api-Key included), shared by all proxy routes.
+    """
+    excluded = _EXCLUDED_HEADERS | (_DERIVED_EXCLUDED_HEADERS if derived else set())
+    return {
+        key: value
+        for key, value in request.headers.items()
+        if key.lower() not in excluded
+    }
+
+
+class _UpstreamStreamingResponse(StreamingResponse):
+    """
+    Relay the raw upstream body and always return the connection to the pool.
+
+    The upstream response is closed when sending finishes for any reason,
+    including a client disconnect mid-stream or before the body starts
+    (neither background tasks nor a generator's `finally` run reliably then).
+    """
+
+    def __init__(self, upstream: httpx.Response, **kwargs):
+        super().__init__(upstream.aiter_raw(), **kwargs)
+        self.upstream = upstream
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.upstream.aclose()
+
+
+async def forward_request(
+    request: Request, method: str, path: str, cache: Optional[str] = None
+):
     """
     Forward request to EMR API.
+
+    If `cache` names a resource in EMR_CACHE_TTLS, GETs are served through the
+    read-through cache; any other method invalidates the cached resource.
     """
     emr_url = settings.EMR_API_URL
     if not emr_url:
         logger.error("EMR_API_URL not configured")
         raise HTTPException(status_code=500, detail="EMR_API_URL configuration missing")
 
-    base_url = emr_url.rstrip("/")
+    base_url = emr_client.base_url()
     target_url = f"{base_url}/{path}"
 
     # Get URL query parameters
     params = dict(request.query_params)
 
     # Prepare headers
-    headers = {
-        key: value
-        for key, value in request.headers.items()
-        if key.lower() not in ["host", "content-length"]
-    }
+    headers = _upstream_headers(request)
 
     try:
-        body = await request.body()
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
+        if cache and method == "GET" and settings.EMR_CACHE_ENABLED:
+            return await _cached_response(request, cache, path, params, headers, base_url)
+
+        # Stream the incoming body upstream only when there is one
+        # (a streamed body would otherwise turn bodiless GETs into chunked requests)
+        has_body = (
+            "content-length" in request.headers
+            or "transfer-encoding" in request.headers
+        )
+        try:
+            response = await emr_client.send(
                 method,
-                target_url,
+                path,
                 headers=headers,
                 params=params,
-                content=body,
-                timeout=60.0,
+                content=request.stream() if has_body else None,
             )
+        finally:
+            # Invalidate once the write has reached the EMR (also on errors, when it
+            # may have landed): a GET racing the write can no longer refill the
+            # cache with the pre-write version afterwards
+            if method != "GET":
+                emr_cache.invalidate_for_write(path)
 
-            # Rewrite Location header if present
-            res_headers = {
-                key: value
-                for key, value in response.headers.items()
-                if key.lower()
-                not in ["content-length", "transfer-encoding", "content-encoding"]
-            }
-
-            if "location" in res_headers:
-                location = res_headers["location"]
-                if location.startswith(base_url):
-                    # logic to rewrite location to point back to proxy
-                    # We assume the path structure mirrors the proxy structure relative to /emr
-                    # e.g. EMR /patients/1 -> Proxy /emr/patients/1
-                    proxy_root = str(request.base_url).rstrip("/") + "/emr"
-                    new_location = location.replace(base_url, proxy_root, 1)
-                    res_headers["location"] = new_location
-
-            return Response(
-                content=response.content,
-                status_code=response.status_code,
-                headers=res_headers,
-                media_type=response.headers.get("content-type"),
-            )
+        # Body bytes are relayed untouched (aiter_raw), so content-encoding and
+        # content-length still describe them; only hop-by-hop framing is dropped
+        res_headers = {
+            key: value
+            for key, value in response.headers.items()
+            if key.lower() not in ["transfer-encoding", "connection", "keep-alive"]
+        }
+        _rewrite_location(request, res_headers, base_url)
+
+        # Relay the upstream body chunk by chunk so memory stays constant
+        # regardless of the listing/export size
+        return _UpstreamStreamingResponse(
+            response,
+            status_code=response.status_code,
+            headers=res_headers,
+            media_type=response.headers.get("content-type"),
+        )
     except httpx.RequestError as exc:
         logger.error(f"EMR proxy error to {target_url}: {exc}")
         raise HTTPException(
@@ -80,6 +155,83 @@ async def forward_request(request: Request, method: str, path: str):
         )
 
 
+async def _cached_response(
+    request: Request,
+    resource: str,
+    path: str,
+    params: dict,
+    headers: dict,
+    base_url: str,
+) -> Response:
+    """
+    Serve a GET through the read-through cache (see EMRCache).
+    The cache status is reported in the X-Cache header.
+    """
+    entry, status = await emr_cache.get(resource, path, params, headers)
+    res_headers = _rewrite_location(request, dict(entry.headers), base_url)
+    res_headers["x-cache"] = status
+
+    # The client already holds this version
+    if entry.etag and request.headers.get("if-none-match") == entry.etag:
+        return Response(status_code=304, headers=res_headers)
+
+    return Response(
+        content=entry.body,
+        status_code=entry.status_code,
+        headers=res_headers,
+        media_type=entry.headers.get("content-type"),
+    )
+
+
+@router.get("/pool")
+async def read_pool_stats():
+    """
+    Shared EMR client stats: request counts, latency and connection pool usage.
+    """
+    return emr_client.stats()
+
+
+@router.get("/cache")
+async def read_cache_stats():
+    """
+    Read-through cache stats: entries, hits, revalidations and coalesced requests.
+    """
+    return emr_cache.stats()
+
+
+@router.delete("/cache")
+async def invalidate_cache(prefix: str = ""):
+    """
+    Invalidate cached EMR responses whose path starts with `prefix` (all if empty).
+    Intended for EMR change events, e.g. `DELETE /emr/cache?prefix=patients/42`.
+    """
+    return {"invalidated": emr_cache.invalidate(prefix)}
+
+
+def _export_response(request: Request, path: str, page_size: Optional[int]):
+    """
+    Stream a whole EMR collection as NDJSON.
+
+    Each line is {"type": "record", "data": ...}; the stream always ends with an
+    {"type": "end", "count": N} or {"type": "error", "detail": ..., "count": N}
+    trailer, so a missing trailer means the export was truncated.
+    """
+    if not settings.EMR_API_URL:
+        logger.error("EMR_API_URL not configured")
+        raise HTTPException(status_code=500, detail="EMR_API_URL configuration missing")
+
+    page_size = min(
+        page_size or settings.EMR_EXPORT_PAGE_SIZE, settings.EMR_EXPORT_MAX_PAGE_SIZE
+    )
+    if page_size < 1:
+        raise HTTPException(status_code=400, detail="page_size must be positive")
+
+    return StreamingResponse(
+        export_collection(path, page_size, _upstream_headers(request, derived=True)),
+        media_type="application/x-ndjson",
+    )
+
+
 # --- Patients ---
 
 
@@ -91,9 +243,55 @@ async def read_patients(request: Request, skip: int = 0, limit: int = 100):
     return await forward_request(request, "GET", "patients/")
 
 
+@router.post("/patients/", response_model=schemas.Patient)
+async def create_patient(request: Request, patient: schemas.PatientCreate):
+    # Validated here for the spec; the raw body is forwarded and the cached
+    # patient resources are invalidated once the EMR has answered
+    return await forward_request(request, "POST", "patients/")
+
+
+# Declared before /patients/{patient_id} so "export" is not parsed as an id
+@router.get("/patients/export")
+async def export_patients(request: Request, page_size: Optional[int] = None):
+    """
+    Export all patients as NDJSON, paging through the EMR with next-page prefetch.
+    """
+    return _export_response(request, "patients/", page_size)
+
+
 @router.get("/patients/{patient_id}", response_model=schemas.Patient)
 async def read_patient(request: Request, patient_id: int):
-    return await forward_request(request, "GET", f"patients/{patient_id}")
+    return await forward_request(
+        request, "GET", f"patients/{patient_id}", cache="patient"
+    )
+
+
+@router.get("/patients/{patient_id}/context")
+async def read_patient_context(request: Request, patient_id: int):
+    """
+    Patient, recent visits and their doctors in one compact document.
+
+    Upstream calls are fanned out concurrently (doctor lookups deduplicated);
+    `context` is a plain-text rendering ready to prepend to a SOAP prompt.
+    """
+    if not settings.EMR_API_URL:
+        logger.error("EMR_API_URL not configured")
+        raise HTTPException(status_code=500, detail="EMR_API_URL configuration missing")
+
+    try:
+        return await build_patient_context(
+            patient_id, _upstream_headers(request, derived=True)
+        )
+    except EMRError as exc:
+        raise HTTPException(
+            status_code=exc.status_code if exc.status_code < 500 else 502,
+            detail=str(exc),
+        )
+    except httpx.RequestError as exc:
+        logger.error(f"EMR context error for patient {patient_id}: {exc}")
+        raise HTTPException(
+            status_code=502, detail=f"Failed to connect to EMR service: {str(exc)}"
+        )
 
 
 @router.get("/patients/{patient_id}/visits", response_model=List[schemas.Visit])
@@ -106,12 +304,26 @@ async def read_patient_visits(request: Request, patient_id: int):
 
 @router.get("/doctors/", response_model=List[schemas.Doctor])
 async def read_doctors(request: Request, skip: int = 0, limit: int = 100):
-    return await forward_request(request, "GET", "doctors/")
+    return await forward_request(request, "GET", "doctors/", cache="doctors")
+
+
+@router.post("/doctors/", response_model=schemas.Doctor)
+async def create_doctor(request: Request, doctor: schemas.DoctorCreate):
+    return await forward_request(request, "POST", "doctors/")
+
+
+# Declared before /doctors/{doctor_id} so "export" is not parsed as an id
+@router.get("/doctors/export")
+async def export_doctors(request: Request, page_size: Optional[int] = None):
+    """
+    Export all doctors as NDJSON, paging through the EMR with next-page prefetch.
+    """
+    return _export_response(request, "doctors/", page_size)
 
 
 @router.get("/doctors/{doctor_id}", response_model=schemas.Doctor)
 async def read_doctor(request: Request, doctor_id: int):
-    return await forward_request(request, "GET", f"doctors/{doctor_id}")
+    return await forward_request(request, "GET", f"doctors/{doctor_id}", cache="doctor")
 
 
 # --- Visits ---
@@ -122,6 +334,21 @@ async def read_visits(request: Request, skip: int = 0, limit: int = 100):
     return await forward_request(request, "GET", "visits/")
 
 
+@router.post("/visits/", response_model=schemas.Visit)
+async def create_visit(request: Request, visit: schemas.VisitCreate):
+    # Also invalidates cached patients (see EMR_CACHE_INVALIDATION)
+    return await forward_request(request, "POST", "visits/")
+
+
+# Declared before /visits/{visit_id} so "export" is not parsed as an id
+@router.get("/visits/export")
+async def export_visits(request: Request, page_size: Optional[int] = None):
+    """
+    Export all visits as NDJSON, paging through the EMR with next-page prefetch.
+    """
+    return _export_response(request, "visits/", page_size)
+
+
 @router.get("/visits/{visit_id}", response_model=schemas.Visit)
 async def read_visit(request: Request, visit_id: int):
     return await forward_request(request, "GET", f"visits/{visit_id}")
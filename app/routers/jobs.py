@@ -0,0 +1,97 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import JSONResponse
+
+from app.services.stt_service import stt_service
+from app.services.job_service import job_service
+from app.services.audio_io import hash_upload, save_upload
+from app.services import metrics, profiling
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["jobs"])
+
+
+@router.post("/jobs", status_code=202)
+async def create_job(
+    file: UploadFile = File(...),
+    model_size: str = Form(
+        "base", description="사용할 STT 모델 크기 ('base' 또는 'small')"
+    ),
+    profile: Optional[str] = Form(
+        None, description="디코딩 프로필 ('fast', 'balanced', 'accurate' 등)"
+    ),
+):
+    """
+    오디오를 업로드하고 백그라운드 전사 작업을 등록합니다. 작업 ID를 바로 반환합니다.
+
+    같은 오디오/모델/프로필의 작업이 이미 있으면 새 작업을 만들지 않고 기존 작업을 반환합니다.
+    (created=false, 실패한 작업만 다시 등록)
+    """
+    ext = os.path.splitext(file.filename)[1].lower()
+    if ext not in [".wav", ".m4a", ".mp3", ".webm"]:
+        raise HTTPException(
+            status_code=400,
+            detail="지원되지 않는 파일 형식입니다. (.wav, .m4a, .mp3, .webm 만 허용)",
+        )
+
+    if model_size not in ["base", "small"]:
+        raise HTTPException(
+            status_code=400, detail="model_size는 'base' 또는 'small'이어야 합니다."
+        )
+
+    try:
+        profile, _ = stt_service.resolve_profile(profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    audio_hash = await asyncio.to_thread(hash_upload, file.file)
+
+    # 재시도: 오디오를 다시 저장하지 않고 기존 작업 반환
+    job = await asyncio.to_thread(job_service.find, audio_hash, model_size, profile)
+    if job is not None:
+        return JSONResponse(
+            status_code=200,
+            content={"job_id": job["id"], "status": job["status"], "created": False},
+        )
+
+    audio_path = job_service.audio_path(audio_hash, model_size, profile, ext)
+    save_start = time.time()
+    with profiling.span("upload_save"):
+        await profiling.to_thread(save_upload, file.file, audio_path)
+    metrics.STAGE_DURATION.observe(time.time() - save_start, stage="upload_save")
+    created = False
+    try:
+        job, created = await asyncio.to_thread(
+            job_service.submit, audio_hash, model_size, profile, file.filename, audio_path
+        )
+    finally:
+        if not created:
+            # 동시에 들어온 같은 업로드가 먼저 등록된 경우 (또는 등록 실패) 저장한 파일은 쓰이지 않음
+            os.remove(audio_path)
+    logger.info(f"작업 등록: {job['id']} ({file.filename}, created={created})")
+    return JSONResponse(
+        status_code=202 if created else 200,
+        content={"job_id": job["id"], "status": job["status"], "created": created},
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    작업 상태를 반환합니다.
+
+    - **status**: queued, running, completed, failed
+    - **progress**: 0~1 (디코딩된 오디오 위치 기준)
+    - **segments**: 지금까지 디코딩된 세그먼트 (완료 전에도 부분 결과 제공)
+    - **result**: 완료 시 /upload-audio와 같은 형식의 결과
+    """
+    job = await asyncio.to_thread(job_service.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job_service.public_view(job)
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Optional
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from app.services.stt_service import stt_service
+from app.services.streaming_service import StreamingSession
+from app.services.inference_executor import QueueFullError
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["stream"])
+
+
+@router.websocket("/ws/transcribe")
+async def ws_transcribe(websocket: WebSocket, model_size: str = "base"):
+    """
+    녹음 중인 webm/opus 청크를 받아 실시간으로 전사합니다.
+
+    Protocol:
+    - client -> server: 바이너리 오디오 청크, 종료 시 텍스트 {"type": "stop"}
+    - server -> client:
+        {"type": "partial", "text": ...}         진행 중인 발화의 임시 결과
+        {"type": "segments", "segments": [...]}  새로 확정된 세그먼트
+        {"type": "final", "text", "language", "segments", "processing_time"}
+        {"type": "error", "detail": ...}
+    """
+    await websocket.accept()
+
+    if model_size not in ["base", "small"]:
+        await websocket.send_json(
+            {"type": "error", "detail": "model_size는 'base' 또는 'small'이어야 합니다."}
+        )
+        await websocket.close()
+        return
+
+    session = StreamingSession(stt_service, model_size=model_size)
+    step_task: Optional[asyncio.Task] = None
+
+    async def send_decode_error():
+        # 손상되었거나 지원하지 않는 스트림: 더 이상 전사할 수 없으므로 알리고 종료
+        await websocket.send_json(
+            {
+                "type": "error",
+                "detail": f"오디오 스트림을 디코딩할 수 없습니다: {session.error}",
+            }
+        )
+        await websocket.close()
+
+    async def run_step():
+        try:
+            result = await stt_service.executor.run(model_size, session.step)
+        except QueueFullError:
+            # 부분 처리는 다음 청크에서 다시 시도
+            return
+        if result["segments"]:
+            await websocket.send_json(
+                {"type": "segments", "segments": result["segments"]}
+            )
+        if result["partial"]:
+            await websocket.send_json({"type": "partial", "text": result["partial"]})
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if session.error is not None:
+                await send_decode_error()
+                break
+
+            if message.get("bytes"):
+                session.feed(message["bytes"])
+                # 이전 처리가 끝난 경우에만 새 처리 시작 (처리 중 도착한 청크는 다음 단계에 포함)
+                if step_task is None or step_task.done():
+                    step_task = asyncio.create_task(run_step())
+                continue
+
+            if message.get("text"):
+                try:
+                    payload = json.loads(message["text"])
+                except ValueError:
+                    payload = {}
+                if payload.get("type") != "stop":
+                    continue
+
+                stop_time = time.time()
+                if step_task is not None:
+                    await step_task
+                try:
+                    result = await stt_service.executor.run(
+                        model_size, session.step, True
+                    )
+                except QueueFullError as e:
+                    await websocket.send_json(
+                        {"type": "error", "detail": e.detail, "retry_after": e.retry_after}
+                    )
+                    break
+                if session.error is not None:
+                    await send_decode_error()
+                    break
+
+                if result["segments"]:
+                    await websocket.send_json(
+                        {"type": "segments", "segments": result["segments"]}
+                    )
+                await websocket.send_json(
+                    {
+                        "type": "final",
+                        "text": session.text,
+                        "language": session.language or "",
+                        "segments": session.segments,
+                        "processing_time": time.time() - stop_time,
+                    }
+                )
+                await websocket.close()
+                break
+
+    except WebSocketDisconnect:
+        logger.info("스트리밍 전사 클라이언트 연결 종료")
+    except Exception as e:
+        logger.error(f"스트리밍 전사 중 오류 발생: {str(e)}")
+        try:
+            await websocket.send_json({"type": "error", "detail": str(e)})
+            await websocket.close()
+        except Exception:
+            pass
+    finally:
+        session.close()
+        if step_task is not None and not step_task.done():
+            step_task.cancel()
@@ -14,6 +14,11 @@ class STTResponse(BaseModel):
     segments: Optional[List[Dict[str, Any]]] = Field(
         None, description="세그먼트별 상세 정보 (시작/종료 시간, 텍스트 등)"
     )
+    cached: bool = Field(False, description="캐시된 전사 결과 사용 여부")
+    profile: Optional[str] = Field(None, description="사용된 디코딩 프로필")
+    timings: Optional[Dict[str, float]] = Field(
+        None, description="단계별 소요 시간 (초 단위)"
+    )
 
 
 from datetime import date, datetime
@@ -0,0 +1,63 @@
+import hashlib
+import os
+import logging
+from typing import BinaryIO
+
+import numpy as np
+from faster_whisper import decode_audio
+from starlette.formparsers import MultiPartParser
+
+logger = logging.getLogger(__name__)
+
+# Whisper 입력 샘플링 레이트
+SAMPLE_RATE = 16000
+
+
+def configure_upload_spool(max_bytes: int):
+    """
+    업로드 파일을 담는 SpooledTemporaryFile의 메모리 한도를 설정합니다.
+    한도 이하의 업로드는 디스크를 전혀 거치지 않고 메모리에서만 처리됩니다.
+    """
+    if hasattr(MultiPartParser, "spool_max_size"):
+        MultiPartParser.spool_max_size = max_bytes
+    else:
+        # starlette < 0.38
+        MultiPartParser.max_file_size = max_bytes
+    logger.info(f"업로드 스풀 메모리 한도: {max_bytes} bytes")
+
+
+def load_audio(fileobj: BinaryIO) -> np.ndarray:
+    """
+    업로드 스트림(wav/m4a/mp3/webm)을 16kHz mono float32 배열로 바로 디코딩합니다.
+    """
+    fileobj.seek(0)
+    return decode_audio(fileobj, sampling_rate=SAMPLE_RATE)
+
+
+def hash_upload(fileobj: BinaryIO, chunk_size: int = 1024 * 1024) -> str:
+    """
+    업로드된 오디오 바이트의 SHA-256 해시를 반환합니다. (결과 캐시 키로 사용)
+    """
+    fileobj.seek(0)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def save_upload(fileobj: BinaryIO, path: str, chunk_size: int = 1024 * 1024):
+    """
+    업로드 스트림을 파일로 저장합니다. 임시 파일에 쓴 뒤 교체하므로
+    중간에 실패해도 불완전한 파일이 남지 않습니다.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.part"
+    fileobj.seek(0)
+    with open(temp_path, "wb") as output:
+        for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+            output.write(chunk)
+    os.replace(temp_path, path)
+    fileobj.seek(0)
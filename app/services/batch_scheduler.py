@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.inference_executor import InferenceExecutor
+
+logger = logging.getLogger(__name__)
+
+
+def _resolve(
+    futures: List[Future],
+    results: Optional[List[Dict[str, Any]]] = None,
+    error: Optional[BaseException] = None,
+):
+    """
+    호출자별 Future에 결과(또는 오류)를 전달합니다.
+    """
+    for index, future in enumerate(futures):
+        # 연결이 끊긴 호출자의 Future는 이미 취소되어 있으므로 건너뜀
+        # (취소는 이벤트 루프 스레드에서 일어나므로 done() 확인 후에도 경합 가능)
+        if future.done():
+            continue
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results[index])
+        except InvalidStateError:
+            pass
+
+
+class BatchScheduler:
+    """
+    짧은 시간 창(max_wait_ms) 안에 도착한 전사 요청을 모아 한 번에 실행하는 스케줄러입니다.
+
+    - 첫 요청이 도착한 시점부터 최대 max_wait_ms 동안, 또는 max_batch_size개가 모일 때까지 수집합니다.
+    - (모델, variant)별로 묶은 배치를 InferenceExecutor의 모델 스레드에 하나의 작업으로 제출합니다.
+    - run_batch(model_key, variant, audios)는 입력 순서대로 결과 리스트를 반환해야 합니다.
+    """
+
+    def __init__(
+        self,
+        executor: InferenceExecutor,
+        run_batch: Callable[[str, str, List[np.ndarray]], List[Dict[str, Any]]],
+        max_batch_size: int = 8,
+        max_wait_ms: int = 50,
+    ):
+        self.executor = executor
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000.0
+
+        self._queue: "queue.Queue[Tuple[str, str, np.ndarray, Future]]" = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._collect_loop, name="stt-batch-scheduler", daemon=True
+                )
+                self._thread.start()
+
+    async def submit(
+        self, model_key: str, audio: np.ndarray, variant: str = ""
+    ) -> Dict[str, Any]:
+        """
+        오디오 한 건을 배치 대기열에 넣고 해당 요청의 전사 결과를 기다립니다.
+        variant(예: 디코딩 프로필)가 다른 요청은 같은 배치에 묶이지 않습니다.
+
+        Raises:
+            QueueFullError: 추론 대기열이 가득 찬 경우
+        """
+        self._ensure_started()
+        self.executor.admit()
+        future: Future = Future()
+        self._queue.put((model_key, variant, audio, future))
+        return await asyncio.wrap_future(future)
+
+    def _collect_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            groups: Dict[Tuple[str, str], List[Tuple[np.ndarray, Future]]] = (
+                defaultdict(list)
+            )
+            for model_key, variant, audio, future in batch:
+                groups[(model_key, variant)].append((audio, future))
+
+            for (model_key, variant), items in groups.items():
+                try:
+                    self._dispatch(model_key, variant, items)
+                except Exception as e:
+                    # 수집 스레드가 죽으면 이후 요청이 모두 멈추므로, 이 배치만 실패시키고
+                    # 대기열에 등록된 자리를 반환한 뒤 계속 수집
+                    logger.error(
+                        f"배치 전사 제출 실패: model={model_key}, variant={variant}: {e}"
+                    )
+                    self.executor.release(len(items))
+                    _resolve([future for _, future in items], error=e)
+
+    def _dispatch(
+        self, model_key: str, variant: str, items: List[Tuple[np.ndarray, Future]]
+    ):
+        audios = [audio for audio, _ in items]
+        futures = [future for _, future in items]
+        logger.info(
+            f"배치 전사 제출: model={model_key}, variant={variant}, size={len(items)}"
+        )
+
+        batch_future = self.executor.submit_admitted(
+            model_key,
+            lambda: self.run_batch(model_key, variant, audios),
+            count=len(items),
+        )
+
+        def _fan_out(done: Future):
+            if done.cancelled():
+                # 실행되지 못했으므로 대기열에 등록된 자리를 직접 반환
+                self.executor.release(len(futures))
+                _resolve(futures, error=RuntimeError("배치 전사 작업이 취소되었습니다."))
+            elif done.exception() is not None:
+                _resolve(futures, error=done.exception())
+            else:
+                _resolve(futures, results=done.result())
+
+        batch_future.add_done_callback(_fan_out)
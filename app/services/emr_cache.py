@@ -0,0 +1,241 @@
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.emr_client import emr_client
+
+logger = logging.getLogger(__name__)
+
+# 설정에 없는 헤더라도 이름에 이 단어가 있으면 인증 정보로 보고 캐시를 건너뜀
+_CREDENTIAL_HINTS = ("auth", "token", "key", "session", "cookie", "secret")
+
+# 캐시된 본문은 디코딩된 상태로 저장하므로 인코딩/길이 관련 헤더는 보관하지 않음
+_DROP_HEADERS = {
+    "content-encoding",
+    "content-length",
+    "transfer-encoding",
+    "connection",
+    "keep-alive",
+}
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+    expires_at: float
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("last-modified")
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class EMRCache:
+    """
+    EMR GET 응답의 read-through 캐시입니다.
+
+    - 리소스별 TTL(EMR_CACHE_TTLS) 동안은 EMR을 호출하지 않고 바로 응답합니다.
+    - TTL이 지난 항목은 ETag(If-None-Match)/Last-Modified(If-Modified-Since)로 재검증하여
+      304이면 본문을 다시 받지 않고 TTL만 연장합니다.
+    - 같은 키의 요청이 진행 중이면 새로 보내지 않고 그 결과를 함께 기다립니다. (single-flight)
+    - 쓰기 요청과 외부 이벤트(invalidate)로 항목을 무효화합니다.
+    - 인증 헤더(EMR_CACHE_CREDENTIAL_HEADERS)가 다른 요청끼리는 응답을 공유하지 않으며,
+      알 수 없는 인증 헤더가 있는 요청은 캐시를 거치지 않습니다. (BYPASS)
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.coalesced = 0
+        self.bypassed = 0
+        # 무효화될 때마다 증가. 무효화 전에 시작된 조회의 응답은 저장하지 않음
+        self._generation = 0
+
+    @staticmethod
+    def key(path: str, params: Dict[str, str], headers: Dict[str, str]) -> Optional[str]:
+        """
+        캐시 키를 만듭니다. 알 수 없는 인증 헤더가 있어 사용자를 구분할 수 없으면 None을 반환합니다.
+        """
+        known = {name.lower() for name in settings.EMR_CACHE_CREDENTIAL_HEADERS}
+        credentials = []
+        for name, value in headers.items():
+            name = name.lower()
+            if name in known:
+                credentials.append(f"{name}={value}")
+            elif any(hint in name for hint in _CREDENTIAL_HINTS):
+                return None
+        query = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+        # 인증 정보가 다른 요청끼리는 응답을 공유하지 않음 (토큰 원문은 키에 남기지 않음)
+        digest = hashlib.sha256("\n".join(sorted(credentials)).encode()).hexdigest()
+        return f"{path}?{query}#{digest}"
+
+    async def get(
+        self,
+        resource: str,
+        path: str,
+        params: Dict[str, str],
+        headers: Dict[str, str],
+    ) -> Tuple[CachedResponse, str]:
+        """
+        캐시를 거쳐 응답을 반환합니다.
+
+        Returns:
+            (응답, 캐시 상태: 'HIT', 'MISS', 'REVALIDATED', 'COALESCED', 'BYPASS')
+        """
+        key = self.key(path, params, headers)
+        if key is None:
+            self.bypassed += 1
+            response = await emr_client.request("GET", path, headers=headers, params=params)
+            return self._entry(response, 0), "BYPASS"
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.is_fresh():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry, "HIT"
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            response, _ = await asyncio.shield(task)
+            return response, "COALESCED"
+
+        task = asyncio.create_task(self._fetch(key, resource, path, params, headers))
+        self._inflight[key] = task
+
+        def _forget(done: asyncio.Task):
+            # 무효화로 이미 새 조회가 등록되었으면 그대로 둠
+            if self._inflight.get(key) is done:
+                del self._inflight[key]
+
+        task.add_done_callback(_forget)
+        # 요청한 클라이언트가 연결을 끊어도 기다리는 다른 요청을 위해 계속 진행
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self,
+        key: str,
+        resource: str,
+        path: str,
+        params: Dict[str, str],
+        headers: Dict[str, str],
+    ) -> Tuple[CachedResponse, str]:
+        # 클라이언트의 조건부 헤더는 캐시 항목 기준으로 다시 만듦
+        headers = {
+            k: v
+            for k, v in headers.items()
+            if k.lower() not in ["if-none-match", "if-modified-since"]
+        }
+        generation = self._generation
+        stale = self._entries.get(key)
+        if stale is not None:
+            if stale.etag:
+                headers["if-none-match"] = stale.etag
+            if stale.last_modified:
+                headers["if-modified-since"] = stale.last_modified
+
+        response = await emr_client.request("GET", path, headers=headers, params=params)
+        ttl = settings.EMR_CACHE_TTLS.get(resource, 0)
+
+        if response.status_code == 304 and stale is not None:
+            if generation == self._generation and key in self._entries:
+                stale.expires_at = time.time() + ttl
+                self._entries.move_to_end(key)
+            self.revalidated += 1
+            return stale, "REVALIDATED"
+
+        self.misses += 1
+        entry = self._entry(response, ttl)
+        cache_control = response.headers.get("cache-control", "").lower()
+        if (
+            response.status_code == 200
+            and ttl > 0
+            and "no-store" not in cache_control
+            and generation == self._generation
+        ):
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.pop(key, None)
+        return entry, "MISS"
+
+    @staticmethod
+    def _entry(response, ttl: int) -> CachedResponse:
+        return CachedResponse(
+            status_code=response.status_code,
+            headers={
+                k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS
+            },
+            body=response.content,
+            expires_at=time.time() + ttl,
+        )
+
+    @staticmethod
+    def _matches(key: str, prefix: str) -> bool:
+        """
+        prefix가 경로 구간 단위로 일치하는지 확인합니다.
+        ('patients/4'는 'patients/4', 'patients/4/visits'와 맞고 'patients/42'와는 맞지 않음)
+        """
+        if not key.startswith(prefix):
+            return False
+        if not prefix or prefix.endswith("/"):
+            return True
+        return key[len(prefix) : len(prefix) + 1] in ("/", "?", "#")
+
+    def invalidate(self, prefix: str = "") -> int:
+        """
+        경로가 prefix로 시작하는 항목을 삭제합니다. (경로 구간 단위, 빈 문자열이면 전체)
+        """
+        self._generation += 1
+        # 무효화 이후의 요청은 진행 중인 (무효화 전) 조회에 합류하지 않고 새로 조회
+        for key in [key for key in self._inflight if self._matches(key, prefix)]:
+            del self._inflight[key]
+        keys = [key for key in self._entries if self._matches(key, prefix)]
+        for key in keys:
+            del self._entries[key]
+        if keys:
+            logger.info(f"EMR 캐시 무효화: '{prefix}' ({len(keys)}개)")
+        return len(keys)
+
+    def invalidate_for_write(self, path: str) -> int:
+        """
+        쓰기 요청 경로의 리소스와, EMR_CACHE_INVALIDATION에 설정된 관련 리소스를 무효화합니다.
+        (예: visits 쓰기 -> patients 캐시도 무효화)
+        """
+        resource = path.strip("/").split("/")[0]
+        prefixes: List[str] = [resource] + settings.EMR_CACHE_INVALIDATION.get(resource, [])
+        return sum(self.invalidate(prefix) for prefix in prefixes)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "coalesced": self.coalesced,
+            "bypassed": self.bypassed,
+        }
+
+
+emr_cache = EMRCache(max_entries=settings.EMR_CACHE_MAX_ENTRIES)
@@ -0,0 +1,148 @@
+import time
+import logging
+import importlib.util
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.config import settings
+from app.services import metrics, profiling
+
+logger = logging.getLogger(__name__)
+
+
+class EMRClient:
+    """
+    EMR 프록시가 공유하는 httpx.AsyncClient입니다.
+
+    - 요청마다 클라이언트를 만들지 않고 keep-alive 커넥션 풀을 재사용하여
+      EMR 서버와의 TCP/TLS 연결 비용을 없앱니다.
+    - 풀 크기, keep-alive 만료 시간, HTTP/2 사용 여부는 설정값으로 조정합니다.
+    - 경로 패턴별 타임아웃(EMR_ROUTE_TIMEOUTS)을 적용합니다.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._requests = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._total_latency = 0.0
+
+    @staticmethod
+    def base_url() -> Optional[str]:
+        return settings.EMR_API_URL.rstrip("/") if settings.EMR_API_URL else None
+
+    def get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            http2 = settings.EMR_HTTP2
+            if http2 and importlib.util.find_spec("h2") is None:
+                logger.warning("EMR_HTTP2가 설정되었지만 h2 패키지가 없어 HTTP/1.1을 사용합니다.")
+                http2 = False
+            self._client = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=settings.EMR_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.EMR_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.EMR_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+                timeout=httpx.Timeout(
+                    settings.EMR_TIMEOUT_SECONDS,
+                    connect=settings.EMR_CONNECT_TIMEOUT_SECONDS,
+                ),
+            )
+            logger.info(
+                f"EMR HTTP 클라이언트 생성 (http2={http2}, "
+                f"max_connections={settings.EMR_MAX_CONNECTIONS})"
+            )
+        return self._client
+
+    @staticmethod
+    def timeout(path: str) -> httpx.Timeout:
+        """
+        경로에 맞는 타임아웃을 반환합니다. EMR_ROUTE_TIMEOUTS의 패턴을 순서대로 비교하고,
+        맞는 패턴이 없으면 EMR_TIMEOUT_SECONDS를 사용합니다.
+        """
+        seconds = settings.EMR_TIMEOUT_SECONDS
+        for pattern, value in settings.EMR_ROUTE_TIMEOUTS.items():
+            if fnmatchcase(path, pattern):
+                seconds = value
+                break
+        return httpx.Timeout(seconds, connect=settings.EMR_CONNECT_TIMEOUT_SECONDS)
+
+    async def send(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """
+        EMR_API_URL 기준 경로로 요청을 보내고 응답 헤더까지만 받은 상태로 반환합니다.
+        (경로별 타임아웃 적용, 지연 시간은 응답 헤더 수신까지)
+        본문은 response.aiter_raw()로 스트리밍하며, 호출자가 response.aclose()로 닫아야 합니다.
+        """
+        client = self.get_client()
+        request = client.build_request(
+            method, f"{self.base_url()}/{path}", timeout=self.timeout(path), **kwargs
+        )
+        # 라벨 수가 늘지 않도록 경로의 첫 구간(patients, doctors, visits)만 사용
+        resource = path.strip("/").split("/")[0]
+        self._requests += 1
+        self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            with profiling.span("emr_upstream", path=path):
+                response = await client.send(request, stream=True)
+            metrics.EMR_UPSTREAM_RESPONSES.inc(
+                resource=resource, status=str(response.status_code)
+            )
+            return response
+        except httpx.RequestError:
+            self._errors += 1
+            metrics.EMR_UPSTREAM_RESPONSES.inc(resource=resource, status="error")
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self._in_flight -= 1
+            self._total_latency += elapsed
+            metrics.EMR_UPSTREAM_DURATION.observe(elapsed, resource=resource)
+
+    async def request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """
+        send()와 같지만 본문까지 모두 읽은 응답을 반환합니다.
+        """
+        response = await self.send(method, path, **kwargs)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        요청 수/지연 시간과 커넥션 풀 상태(열린 연결, 유휴 연결)를 반환합니다.
+        """
+        connections = []
+        if self._client is not None:
+            # httpx는 풀 상태를 공개 API로 제공하지 않으므로 transport의 풀을 직접 조회
+            pool = getattr(self._client._transport, "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+        return {
+            "requests": self._requests,
+            "errors": self._errors,
+            "in_flight": self._in_flight,
+            "avg_latency": self._total_latency / self._requests if self._requests else 0.0,
+            "pool": {
+                "max_connections": settings.EMR_MAX_CONNECTIONS,
+                "max_keepalive_connections": settings.EMR_MAX_KEEPALIVE_CONNECTIONS,
+                "keepalive_expiry": settings.EMR_KEEPALIVE_EXPIRY_SECONDS,
+                "connections": len(connections),
+                "idle": sum(1 for c in connections if c.is_idle()),
+                "http2": sum(
+                    1 for c in connections if getattr(c, "is_http2", lambda: False)()
+                ),
+            },
+        }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+
+
+emr_client = EMRClient()
@@ -0,0 +1,164 @@
+import json
+import asyncio
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from app import schemas
+from app.config import settings
+from app.services.emr_cache import emr_cache
+from app.services.emr_client import emr_client
+
+logger = logging.getLogger(__name__)
+
+
+class EMRError(Exception):
+    """
+    EMR가 200이 아닌 응답을 반환한 경우
+    """
+
+    def __init__(self, status_code: int, path: str):
+        super().__init__(f"EMR returned {status_code} for {path}")
+        self.status_code = status_code
+        self.path = path
+
+
+async def _get_json(
+    path: str, headers: Dict[str, str], resource: Optional[str] = None
+) -> Any:
+    """
+    EMR GET 요청. resource가 주어지고 캐시가 켜져 있으면 read-through 캐시를 거칩니다.
+    """
+    if resource and settings.EMR_CACHE_ENABLED:
+        entry, _ = await emr_cache.get(resource, path, {}, headers)
+        status_code, body = entry.status_code, entry.body
+    else:
+        response = await emr_client.request("GET", path, headers=headers)
+        status_code, body = response.status_code, response.content
+    if status_code != 200:
+        raise EMRError(status_code, path)
+    return json.loads(body)
+
+
+def _age(dob: date, today: date) -> int:
+    return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+
+
+def _render(patient: schemas.Patient, visits: List[Dict[str, Any]]) -> str:
+    """
+    SOAP 프롬프트에 바로 넣을 수 있는 환자 요약 텍스트
+    """
+    lines = [
+        f"환자: {patient.name} ({patient.gender}, {patient.dob.isoformat()}, "
+        f"만 {_age(patient.dob, date.today())}세)"
+    ]
+    if visits:
+        lines.append("최근 방문:")
+    for visit in visits:
+        doctor = visit["doctor"]
+        header = " ".join(
+            part
+            for part in [
+                visit["visit_date"][:10] if visit["visit_date"] else None,
+                visit["department"] or (doctor["department"] if doctor else None),
+                f"/ {doctor['name']}" if doctor else None,
+            ]
+            if part
+        )
+        details = []
+        if visit["chief_complaint"]:
+            details.append(f"주호소 {visit['chief_complaint']}")
+        if visit["diagnoses"]:
+            details.append("진단 " + ", ".join(visit["diagnoses"]))
+        if visit["medications"]:
+            details.append("처방 " + ", ".join(visit["medications"]))
+        vitals = visit["vitals"]
+        if vitals:
+            details.append(
+                f"활력징후 BP {vitals['systolic']}/{vitals['diastolic']}, "
+                f"HR {vitals['heart_rate']}, BT {vitals['temperature']}, RR {vitals['resp_rate']}"
+            )
+        lines.append(f"- {header}: " + "; ".join(details) if details else f"- {header}")
+    return "\n".join(lines)
+
+
+async def build_patient_context(
+    patient_id: int, headers: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    환자, 방문 기록, 담당 의사 정보를 한 번에 모아 요약 문서로 만듭니다.
+
+    - 환자/방문 조회를 동시에 보내고, 방문에 등장하는 의사는 중복 없이 한 번씩만 조회합니다.
+    - 동시에 보내는 EMR 요청 수는 EMR_CONTEXT_CONCURRENCY로 제한합니다.
+    - 환자/의사 조회는 read-through 캐시를 사용합니다.
+
+    Raises:
+        EMRError: 환자 또는 방문 조회가 실패한 경우 (의사 조회 실패는 해당 의사만 생략)
+    """
+    headers = headers or {}
+    semaphore = asyncio.Semaphore(settings.EMR_CONTEXT_CONCURRENCY)
+
+    async def fetch(path: str, resource: Optional[str] = None) -> Any:
+        async with semaphore:
+            return await _get_json(path, headers, resource)
+
+    patient_data, visits_data = await asyncio.gather(
+        fetch(f"patients/{patient_id}", "patient"),
+        fetch(f"patients/{patient_id}/visits"),
+    )
+    patient = schemas.Patient.model_validate(patient_data)
+    visits = sorted(
+        (schemas.Visit.model_validate(v) for v in visits_data),
+        key=lambda v: (v.visit_date is not None, v.visit_date or 0, v.id),
+        reverse=True,
+    )[: settings.EMR_CONTEXT_MAX_VISITS]
+
+    doctor_ids = sorted({visit.doctor_id for visit in visits})
+    results = await asyncio.gather(
+        *[fetch(f"doctors/{doctor_id}", "doctor") for doctor_id in doctor_ids],
+        return_exceptions=True,
+    )
+    doctors: Dict[int, schemas.Doctor] = {}
+    for doctor_id, result in zip(doctor_ids, results):
+        if isinstance(result, Exception):
+            logger.warning(f"의사 정보 조회 실패 (doctor_id={doctor_id}): {result}")
+            continue
+        doctors[doctor_id] = schemas.Doctor.model_validate(result)
+
+    compact_visits = []
+    for visit in visits:
+        doctor = doctors.get(visit.doctor_id)
+        latest_vitals = max(visit.vitals, key=lambda v: v.timestamp, default=None)
+        compact_visits.append(
+            {
+                "id": visit.id,
+                "visit_date": visit.visit_date.isoformat() if visit.visit_date else None,
+                "department": visit.department,
+                "status": visit.status,
+                "chief_complaint": visit.chief_complaint,
+                "doctor": (
+                    {"id": doctor.id, "name": doctor.name, "department": doctor.department}
+                    if doctor
+                    else None
+                ),
+                "diagnoses": [
+                    f"{d.display_name} ({d.icd_code})" for d in visit.diagnoses
+                ],
+                "medications": [
+                    f"{m.drug_name} {m.dosage} {m.frequency}" for m in visit.medications
+                ],
+                "vitals": (
+                    latest_vitals.model_dump(
+                        include={"systolic", "diastolic", "heart_rate", "temperature", "resp_rate"}
+                    )
+                    if latest_vitals
+                    else None
+                ),
+            }
+        )
+
+    return {
+        "patient": patient.model_dump(mode="json"),
+        "visits": compact_visits,
+        "context": _render(patient, compact_visits),
+    }
@@ -0,0 +1,70 @@
+import json
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.services.emr_client import emr_client
+from app.services.emr_context import EMRError
+
+logger = logging.getLogger(__name__)
+
+
+async def _fetch_page(
+    path: str, skip: int, limit: int, headers: Dict[str, str]
+) -> List[Dict[str, Any]]:
+    response = await emr_client.request(
+        "GET", path, headers=headers, params={"skip": skip, "limit": limit}
+    )
+    if response.status_code != 200:
+        raise EMRError(response.status_code, path)
+    return response.json()
+
+
+def _line(message: Dict[str, Any]) -> str:
+    return json.dumps(message, ensure_ascii=False) + "\n"
+
+
+async def export_collection(
+    path: str, page_size: int, headers: Optional[Dict[str, str]] = None
+) -> AsyncIterator[str]:
+    """
+    EMR 목록 API를 skip/limit로 끝까지 넘기며 레코드를 NDJSON 줄로 전달합니다.
+
+    현재 페이지를 내보내는 동안 다음 페이지를 미리 요청하므로 EMR 왕복 시간이 가려지고,
+    메모리에는 최대 두 페이지만 유지됩니다.
+
+    EMR이 요청한 limit보다 적게 돌려줄 수 있으므로(서버 측 최대 페이지 크기)
+    짧은 페이지에서 멈추지 않고, 받은 개수만큼 skip을 늘려 빈 페이지가 올 때까지 넘깁니다.
+
+    각 줄은 {"type": "record", "data": {...}}이고, 마지막 줄은 항상 트레일러입니다.
+    - 정상 종료: {"type": "end", "count": N}
+    - 중간 실패: {"type": "error", "detail": "...", "count": N}
+    트레일러가 없으면 스트림이 중간에 끊긴 것입니다.
+    """
+    headers = headers or {}
+    skip = 0
+    count = 0
+    next_page: Optional[asyncio.Task] = asyncio.create_task(
+        _fetch_page(path, skip, page_size, headers)
+    )
+    try:
+        while next_page is not None:
+            page = await next_page
+            skip += len(page)
+            # 빈 페이지가 아니면 다음 페이지가 있을 수 있으므로 미리 요청
+            next_page = (
+                asyncio.create_task(_fetch_page(path, skip, page_size, headers))
+                if page
+                else None
+            )
+            for record in page:
+                yield _line({"type": "record", "data": record})
+            count += len(page)
+    except Exception as e:
+        logger.error(f"EMR export failed for {path} (skip={skip}): {e}")
+        yield _line({"type": "error", "detail": str(e), "count": count})
+        return
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+    yield _line({"type": "end", "count": count})
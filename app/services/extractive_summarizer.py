@@ -0,0 +1,212 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# 문장 경계
+# - 문장 부호 뒤의 공백 또는 줄바꿈
+# - 구두점 없는 음성 전사를 위해 한국어 종결 어미(~다, ~요, ~까) 뒤의 공백
+_SENTENCE_BOUNDARY = re.compile(
+    r"(?<=[.?!。])\s+"
+    r"|\n+"
+    r"|(?<=[가-힣])(?<![바가사])다\s+"
+    r"|(?<=[가-힣])(?<![필중주수개])요\s+"
+    r"|(?<=[니을할될일볼])까\s+"
+)
+
+# 경계가 없는 긴 발화는 이 단어 수마다 나눔
+MAX_SENTENCE_WORDS = 40
+
+_WORD = re.compile(r"[가-힣]+|[A-Za-z]+|\d+(?:\.\d+)?[A-Za-z%가-힣/]*")
+
+# 어절 끝에서 떼어내는 조사 (긴 것부터)
+_JOSA = sorted(
+    [
+        "으로부터", "에서부터", "에게서", "으로서", "으로써", "이라고", "까지는",
+        "부터는", "에서는", "으로는", "에게는", "한테", "에게", "에서", "으로",
+        "까지", "부터", "처럼", "보다", "이랑", "하고", "라고", "은", "는",
+        "이", "가", "을", "를", "에", "의", "도", "로", "와", "과", "만", "랑",
+    ],
+    key=len,
+    reverse=True,
+)
+
+_STOPWORDS = {
+    "네", "예", "아", "어", "음", "그", "저", "좀", "이제", "그냥", "그래서", "그리고",
+    "근데", "그런데", "혹시", "약간", "뭐", "이거", "그거", "저거", "여기", "거기",
+    "있어요", "없어요", "합니다", "해요", "하세요", "같아요", "그렇죠", "맞아요",
+}
+
+# 진료 대화에서 요약에 남겨야 할 가능성이 높은 용어
+MEDICAL_KEYWORDS = [
+    # 증상
+    "통증", "아프", "아파", "두통", "복통", "흉통", "요통", "열이", "열나", "발열", "오한", "기침",
+    "가래", "콧물", "인후", "목이", "어지럽", "어지러", "구토", "메스꺼", "설사", "변비",
+    "호흡", "숨", "가슴", "두근", "부종", "붓", "저림", "마비", "발진", "가려", "출혈",
+    "피로", "불면", "식욕", "체중",
+    # 병력/소견
+    "고혈압", "당뇨", "고지혈", "천식", "알레르기", "수술", "입원", "병력", "가족력",
+    "흡연", "음주", "임신",
+    # 진찰/검사
+    "혈압", "맥박", "체온", "산소", "혈당", "검사", "혈액", "소변", "엑스레이", "x-ray",
+    "ct", "mri", "초음파", "심전도", "수치", "결과", "소견",
+    # 평가/계획
+    "진단", "의심", "감염", "염증", "바이러스", "세균", "처방", "복용", "약을", "약은", "항생제",
+    "진통제", "해열제", "주사", "수액", "용량", "하루", "mg", "ml", "재진",
+    "추적", "경과", "의뢰", "치료", "주의",
+]
+_MEASUREMENT = re.compile(
+    r"\d+(?:\.\d+)?\s*(?:mg|ml|cc|mmhg|kg|도|℃|회|번|알|정|일|주|개월|시간|분)",
+    re.IGNORECASE,
+)
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    한국어 대화/음성 전사 텍스트를 문장 단위로 나눕니다.
+    종결 어미 경계는 어미를 문장 끝에 남기고, 경계가 없는 긴 발화는 단어 수 기준으로 자릅니다.
+    """
+    sentences = []
+    position = 0
+    pieces = []
+    for match in _SENTENCE_BOUNDARY.finditer(text):
+        # 종결 어미(다/요/까) 경계는 어미 글자까지 앞 문장에 포함
+        end = match.start() + (1 if match.group(0)[0] in "다요까" else 0)
+        pieces.append(text[position:end])
+        position = match.end()
+    pieces.append(text[position:])
+
+    for piece in pieces:
+        words = piece.split()
+        for start in range(0, len(words), MAX_SENTENCE_WORDS):
+            sentence = " ".join(words[start : start + MAX_SENTENCE_WORDS])
+            if sentence:
+                sentences.append(sentence)
+    return sentences
+
+
+@lru_cache(maxsize=65536)
+def _stem(word: str) -> str:
+    for josa in _JOSA:
+        if len(word) > len(josa) and word.endswith(josa):
+            return word[: -len(josa)]
+    return word
+
+
+def _features(sentence: str) -> List[str]:
+    """
+    문장의 TF-IDF 특징: 조사를 뗀 어절 + 한글 어절의 글자 bigram
+    (형태소 분석기 없이 활용형/복합어가 겹치도록 하기 위함)
+    """
+    features = []
+    for word in _WORD.findall(sentence.lower()):
+        stem = _stem(word)
+        if not stem or stem in _STOPWORDS:
+            continue
+        features.append(stem)
+        if len(stem) > 2 and "가" <= stem[0] <= "힣":
+            features.extend(stem[i : i + 2] for i in range(len(stem) - 1))
+    return features
+
+
+class ExtractiveSummarizer:
+    """
+    네트워크 없이 동작하는 추출 요약기입니다.
+
+    1. 한국어 종결 어미를 고려해 문장을 나누고
+    2. 문장별 TF-IDF 벡터의 코사인 유사도 그래프에서 TextRank 점수를 구한 뒤
+    3. 의료 용어/수치가 포함된 문장에 가중치를 주어 상위 문장을 원래 순서대로 반환합니다.
+
+    모든 행렬 연산은 NumPy로 처리되므로 수백 문장도 수 밀리초 안에 요약됩니다.
+    """
+
+    def __init__(
+        self,
+        max_sentences: int = 5,
+        ratio: float = 0.2,
+        keyword_boost: float = 0.5,
+        keywords: Optional[Iterable[str]] = None,
+        damping: float = 0.85,
+        iterations: int = 50,
+    ):
+        self.max_sentences = max_sentences
+        self.ratio = ratio
+        self.keyword_boost = keyword_boost
+        self.keywords = [k.lower() for k in (keywords or MEDICAL_KEYWORDS)]
+        # 키워드를 하나의 정규식으로 합쳐 문장마다 한 번만 검색
+        self._keyword_pattern = re.compile(
+            "|".join(re.escape(k) for k in sorted(set(self.keywords), key=len, reverse=True))
+        )
+        self.damping = damping
+        self.iterations = iterations
+
+    def _tfidf(self, sentences: List[List[str]]) -> np.ndarray:
+        vocabulary: Dict[str, int] = {}
+        rows, cols = [], []
+        for row, features in enumerate(sentences):
+            for feature in features:
+                rows.append(row)
+                cols.append(vocabulary.setdefault(feature, len(vocabulary)))
+
+        counts = np.zeros((len(sentences), max(1, len(vocabulary))), dtype=np.float32)
+        np.add.at(counts, (rows, cols), 1.0)
+
+        document_frequency = (counts > 0).sum(axis=0)
+        idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1.0
+        tf = counts / np.maximum(counts.sum(axis=1, keepdims=True), 1.0)
+        matrix = tf * idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def _textrank(self, matrix: np.ndarray) -> np.ndarray:
+        n = matrix.shape[0]
+        similarity = matrix @ matrix.T
+        np.fill_diagonal(similarity, 0.0)
+
+        # 연결이 없는 문장은 모든 문장으로 균등하게 이동
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        transition = np.where(
+            out_weight > 0, similarity / np.maximum(out_weight, 1e-12), 1.0 / n
+        )
+
+        scores = np.full(n, 1.0 / n, dtype=np.float32)
+        for _ in range(self.iterations):
+            updated = (1 - self.damping) / n + self.damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < 1e-6:
+                scores = updated
+                break
+            scores = updated
+        return scores
+
+    def _keyword_hits(self, sentence: str) -> int:
+        lowered = sentence.lower()
+        hits = len(set(self._keyword_pattern.findall(lowered)))
+        hits += len(_MEASUREMENT.findall(lowered))
+        return min(hits, 3)
+
+    def rank(self, sentences: List[str]) -> np.ndarray:
+        """
+        문장별 중요도 점수를 반환합니다. (TextRank x 의료 용어 가중치)
+        """
+        features = [_features(sentence) for sentence in sentences]
+        hits = np.array([self._keyword_hits(s) for s in sentences], dtype=np.float32)
+        scores = self._textrank(self._tfidf(features))
+        boost = 1.0 + self.keyword_boost * hits
+        # 특징이 거의 없는 짧은 맞장구 문장("네", "아 그래요")은 제외 (수치/의료 용어가 있으면 유지)
+        informative = np.array(
+            [len(f) >= 2 for f in features], dtype=np.float32
+        ) + (hits > 0)
+        return scores * boost * np.minimum(informative, 1.0)
+
+    def summarize(self, text: str, max_sentences: Optional[int] = None) -> str:
+        sentences = split_sentences(text)
+        limit = max_sentences or self.max_sentences
+        # 최소 3문장(기존 규칙 기반 요약과 동일), 최대 max_sentences
+        count = max(min(3, limit), min(limit, round(len(sentences) * self.ratio)))
+        if len(sentences) <= count:
+            return " ".join(sentences)
+
+        scores = self.rank(sentences)
+        selected = np.sort(np.argsort(-scores, kind="stable")[:count])
+        return " ".join(sentences[index] for index in selected)
@@ -0,0 +1,242 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+from app.services import profiling
+
+logger = logging.getLogger(__name__)
+
+_ITEM, _ERROR, _DONE = "item", "error", "done"
+
+
+class QueueFullError(Exception):
+    """
+    추론 대기열이 가득 차 요청을 받을 수 없을 때 발생합니다.
+    호출 측은 retry_after 초 후 재시도를 안내해야 합니다.
+    """
+
+    def __init__(
+        self, retry_after: int, detail: str = "STT 추론 대기열이 가득 찼습니다."
+    ):
+        super().__init__(detail)
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+def _cancel_producer(stop: threading.Event, future: Future, release: Callable[[], None]):
+    stop.set()
+    # 아직 시작되지 않은 작업이면 대기 카운트를 되돌림
+    if future.cancel():
+        release()
+
+
+class _ProducerStream:
+    """
+    추론 스레드의 제너레이터 출력을 전달하는 비동기 이터레이터입니다.
+
+    생산 중단(stop)과 미실행 작업 취소는 작업 제출 시점에 finalizer로 등록되므로,
+    한 번도 순회하지 않은 채 aclose()하거나 버려져도 대기열 자리가 반환됩니다.
+    """
+
+    def __init__(
+        self,
+        items: asyncio.Queue,
+        stop: threading.Event,
+        future: Future,
+        release: Callable[[], None],
+    ):
+        self._items = items
+        self._finished = False
+        self._cancel = weakref.finalize(self, _cancel_producer, stop, future, release)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._finished:
+            raise StopAsyncIteration
+        try:
+            kind, value = await self._items.get()
+        except BaseException:
+            await self.aclose()
+            raise
+        if kind is _DONE:
+            await self.aclose()
+            raise StopAsyncIteration
+        if kind is _ERROR:
+            await self.aclose()
+            raise value
+        return value
+
+    async def aclose(self):
+        # 소비자가 중간에 끊기면 생산도 중단 (여러 번 호출해도 한 번만 실행)
+        self._finished = True
+        self._cancel()
+
+
+class InferenceExecutor:
+    """
+    Whisper 추론 전용 실행기입니다.
+
+    - 이벤트 루프를 막지 않도록 모든 추론을 별도 스레드에서 실행합니다.
+    - 모델별 스레드 풀 크기로 모델별 동시 실행 수를 제한합니다.
+    - 실행을 기다리는 요청 수가 max_queue_size에 도달하면 즉시 QueueFullError를 발생시킵니다.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int,
+        model_concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: int = 1,
+        retry_after: int = 10,
+    ):
+        self.max_queue_size = max_queue_size
+        self.model_concurrency = model_concurrency or {}
+        self.default_concurrency = default_concurrency
+        self.retry_after = retry_after
+
+        self._lock = threading.Lock()
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._waiting = 0
+        self._running = 0
+
+    def _get_pool(self, model_key: str) -> ThreadPoolExecutor:
+        with self._lock:
+            pool = self._pools.get(model_key)
+            if pool is None:
+                limit = self.model_concurrency.get(model_key, self.default_concurrency)
+                pool = ThreadPoolExecutor(
+                    max_workers=max(1, limit),
+                    thread_name_prefix=f"stt-{model_key}",
+                )
+                self._pools[model_key] = pool
+            return pool
+
+    def admit(self, count: int = 1):
+        """
+        count개의 요청을 대기열에 등록합니다.
+
+        Raises:
+            QueueFullError: 대기열이 가득 찬 경우
+        """
+        with self._lock:
+            if self._waiting + count > self.max_queue_size:
+                logger.warning(
+                    f"추론 대기열 초과 (waiting={self._waiting}, running={self._running})"
+                )
+                raise QueueFullError(self.retry_after)
+            self._waiting += count
+
+    def release(self, count: int = 1):
+        """
+        admit() 후 실행되지 못한 요청을 대기열에서 제거합니다.
+        """
+        with self._lock:
+            self._waiting -= count
+
+    def _execute(self, fn: Callable[..., Any], count: int) -> Any:
+        with self._lock:
+            self._waiting -= count
+            self._running += count
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self._running -= count
+
+    def submit_admitted(
+        self, model_key: str, fn: Callable[..., Any], count: int = 1
+    ) -> Future:
+        """
+        admit()으로 등록된 count개의 요청을 하나의 작업으로 모델 스레드에 제출합니다.
+        """
+        return self._get_pool(model_key).submit(self._execute, fn, count)
+
+    async def run(self, model_key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        fn(*args, **kwargs)를 모델 전용 스레드에서 실행하고 결과를 반환합니다.
+
+        Args:
+            model_key (str): 동시 실행 제한을 적용할 모델 키 (예: 'base')
+            fn (callable): 블로킹 추론 함수
+
+        Raises:
+            QueueFullError: 대기열이 가득 찬 경우
+        """
+        self.admit()
+        # 요청의 contextvars(프로파일링 trace 등)를 추론 스레드에서도 사용
+        context = contextvars.copy_context()
+        future = self.submit_admitted(
+            model_key,
+            functools.partial(context.run, profiling.profile_call, fn, *args, **kwargs),
+        )
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # 아직 시작되지 않은 작업이 취소되면 대기 카운트를 되돌림
+            if future.cancel():
+                self.release()
+            raise
+
+    def stream(
+        self, model_key: str, gen_fn: Callable[..., Iterator[Any]], *args, **kwargs
+    ) -> AsyncIterator[Any]:
+        """
+        제너레이터 gen_fn(*args, **kwargs)를 모델 전용 스레드에서 실행하고,
+        생성되는 항목을 호출한 이벤트 루프로 하나씩 전달하는 비동기 이터레이터를 반환합니다.
+
+        대기열 등록과 작업 제출은 호출 즉시 이루어집니다. 끝까지 소비하지 않는 경우 aclose()로
+        생산을 중단해야 하며, 순회를 시작하지 않았더라도 aclose()하면 대기열 자리가 반환됩니다.
+
+        Raises:
+            QueueFullError: 대기열이 가득 찬 경우
+        """
+        self.admit()
+        loop = asyncio.get_running_loop()
+        items: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        def _put(item):
+            try:
+                loop.call_soon_threadsafe(items.put_nowait, item)
+            except RuntimeError:
+                # 이벤트 루프가 이미 종료된 경우
+                stop.set()
+
+        def _iterate():
+            for item in gen_fn(*args, **kwargs):
+                if stop.is_set():
+                    break
+                _put((_ITEM, item))
+
+        def _produce():
+            try:
+                profiling.profile_call(_iterate)
+            except BaseException as e:
+                _put((_ERROR, e))
+            finally:
+                _put((_DONE, None))
+
+        # 요청의 contextvars(프로파일링 trace 등)를 추론 스레드에서도 사용
+        context = contextvars.copy_context()
+        future = self.submit_admitted(model_key, functools.partial(context.run, _produce))
+        return _ProducerStream(items, stop, future, self.release)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_queue_size": self.max_queue_size,
+                "waiting": self._waiting,
+                "running": self._running,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,249 @@
+import os
+import time
+import uuid
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from faster_whisper import decode_audio
+
+from app.config import settings
+from app.services.audio_io import SAMPLE_RATE
+from app.services.inference_executor import QueueFullError
+from app.services.job_store import JobStore, FAILED
+from app.services.stt_service import stt_service, STTService
+from app.services.summary_service import summary_service
+
+logger = logging.getLogger(__name__)
+
+
+class JobService:
+    """
+    업로드된 오디오를 백그라운드에서 전사하는 작업 관리자입니다.
+
+    - POST /jobs는 오디오를 UPLOAD_DIR에 저장하고 작업을 등록한 뒤 바로 반환합니다.
+    - 워커 태스크가 저장소에서 작업을 하나씩 가져와 추론 실행기로 전사하고,
+      진행률과 부분 세그먼트를 주기적으로 저장합니다.
+    - 작업은 오디오 해시로 식별되므로 같은 업로드를 재시도해도 디코딩은 한 번만 일어납니다.
+    """
+
+    def __init__(
+        self,
+        stt: STTService,
+        db_path: str,
+        workers: int = 2,
+        poll_interval: float = 1.0,
+        progress_interval: float = 1.0,
+    ):
+        self.stt = stt
+        self.db_path = db_path
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.progress_interval = progress_interval
+        self._store: Optional[JobStore] = None
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def store(self) -> JobStore:
+        if self._store is None:
+            self._store = JobStore(self.db_path)
+        return self._store
+
+    def audio_path(self, audio_hash: str, model_size: str, profile: str, ext: str) -> str:
+        """
+        업로드마다 고유한 저장 경로를 반환합니다.
+        같은 오디오가 동시에 업로드되어도 서로의 파일(또는 실행 중인 작업의 파일)을 덮어쓰지 않습니다.
+        """
+        return os.path.join(
+            settings.UPLOAD_DIR,
+            "jobs",
+            f"{audio_hash}_{model_size}_{profile}_{uuid.uuid4().hex}{ext}",
+        )
+
+    def find(
+        self, audio_hash: str, model_size: str, profile: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        재사용할 수 있는 (실패하지 않은) 기존 작업을 반환합니다.
+        """
+        job = self.store.find(audio_hash, model_size, profile)
+        if job is None or job["status"] == FAILED:
+            return None
+        return job
+
+    def submit(
+        self,
+        audio_hash: str,
+        model_size: str,
+        profile: str,
+        filename: str,
+        audio_path: str,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        작업을 등록하고 워커를 깨웁니다. 이미 같은 오디오의 작업이 있으면 그 작업을 반환합니다.
+        """
+        job, created = self.store.create(
+            audio_hash, model_size, profile, filename, audio_path
+        )
+        if created and self._wakeup is not None:
+            self._wakeup.set()
+        return job, created
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    @staticmethod
+    def public_view(job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        API 응답용 작업 정보 (서버 내부 경로 제외)
+        """
+        return {key: value for key, value in job.items() if key != "audio_path"}
+
+    async def start(self):
+        recovered = await asyncio.to_thread(self.store.recover)
+        if recovered:
+            logger.info(f"중단된 작업 {recovered}개를 다시 대기열에 등록")
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(index)) for index in range(self.workers)
+        ]
+        logger.info(f"작업 워커 {self.workers}개 시작")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    async def _worker(self, index: int):
+        while True:
+            job = await asyncio.to_thread(self.store.claim_next)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            logger.info(f"작업 시작 (worker {index}): {job['id']} ({job['filename']})")
+            await self._process(job)
+
+    async def _process(self, job: Dict[str, Any]):
+        job_id = job["id"]
+        try:
+            result = await self._run(job)
+        except QueueFullError as e:
+            # 추론 대기열이 가득 찬 경우 작업을 되돌리고 잠시 후 다시 시도
+            await asyncio.to_thread(self.store.requeue, job_id)
+            await asyncio.sleep(e.retry_after)
+            return
+        except asyncio.CancelledError:
+            # 서버 종료: 다음 시작 시 이어서 처리
+            self.store.requeue(job_id)
+            raise
+        except Exception as e:
+            logger.error(f"작업 실패: {job_id}: {str(e)}")
+            await asyncio.to_thread(self.store.fail, job_id, str(e))
+            self._remove_audio(job["audio_path"])
+            return
+
+        await asyncio.to_thread(self.store.complete, job_id, result)
+        self._remove_audio(job["audio_path"])
+        logger.info(f"작업 완료: {job_id} ({result['timings']['total']:.2f}s)")
+
+    @staticmethod
+    def _remove_audio(path: Optional[str]):
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    async def _run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.time()
+        audio_hash, model_size, profile = (
+            job["audio_hash"],
+            job["model_size"],
+            job["profile"],
+        )
+
+        stt_result = self.stt.lookup(audio_hash, model_size, profile)
+        cached = stt_result is not None
+        audio_decode_time = 0.0
+        if not cached:
+            decode_start = time.time()
+            audio = await asyncio.to_thread(
+                decode_audio, job["audio_path"], sampling_rate=SAMPLE_RATE
+            )
+            audio_decode_time = time.time() - decode_start
+            stt_result = await self._transcribe(
+                job["id"], audio, audio_hash, model_size, profile
+            )
+
+        summary_start = time.time()
+        summary_text = await summary_service.summarize(
+            stt_result["text"], method="rule-based"
+        )
+        summary_time = time.time() - summary_start
+
+        return {
+            "text": stt_result["text"],
+            "summary": summary_text,
+            "language": stt_result["language"],
+            "processing_time": stt_result["processing_time"],
+            "segments": stt_result["segments"],
+            "cached": cached,
+            "profile": stt_result["profile"],
+            "timings": {
+                **({} if cached else stt_result["timings"]),
+                "audio_decode": audio_decode_time,
+                "stt": stt_result["processing_time"],
+                "summary": summary_time,
+                "total": time.time() - start,
+            },
+        }
+
+    async def _transcribe(
+        self, job_id: str, audio, audio_hash: str, model_size: str, profile: str
+    ) -> Dict[str, Any]:
+        """
+        세그먼트를 받는 대로 모으고, progress_interval마다 진행률과 부분 세그먼트를 저장합니다.
+        """
+        duration = audio.shape[0] / SAMPLE_RATE
+        segments = []
+        info = {}
+        last_saved = time.time()
+
+        events = self.stt.transcribe_stream(
+            audio, model_size=model_size, audio_hash=audio_hash, profile=profile
+        )
+        try:
+            async for event in events:
+                if event["type"] != "segment":
+                    info = event
+                    continue
+                segments.append(
+                    {"start": event["start"], "end": event["end"], "text": event["text"]}
+                )
+                if time.time() - last_saved >= self.progress_interval:
+                    progress = min(event["end"] / duration, 0.99) if duration else 0.0
+                    await asyncio.to_thread(
+                        self.store.update_progress, job_id, progress, list(segments)
+                    )
+                    last_saved = time.time()
+        finally:
+            await events.aclose()
+
+        return self.stt.build_result(segments, info)
+
+
+job_service = JobService(
+    stt_service,
+    settings.JOB_DB_PATH or os.path.join(settings.UPLOAD_DIR, "jobs.db"),
+    workers=settings.JOB_WORKERS,
+    poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+    progress_interval=settings.JOB_PROGRESS_INTERVAL_SECONDS,
+)
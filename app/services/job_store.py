@@ -0,0 +1,236 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+_COLUMNS = (
+    "id",
+    "audio_hash",
+    "model_size",
+    "profile",
+    "filename",
+    "audio_path",
+    "status",
+    "progress",
+    "segments",
+    "result",
+    "error",
+    "created_at",
+    "updated_at",
+    "started_at",
+    "finished_at",
+)
+
+
+class JobStore:
+    """
+    전사 작업의 상태와 결과를 저장하는 SQLite 저장소입니다.
+
+    - 같은 오디오 해시/모델/프로필 조합은 하나의 작업만 가지므로,
+      클라이언트가 재시도해도 디코딩이 다시 시작되지 않습니다. (실패한 작업만 재등록)
+    - 서버가 처리 중에 종료되면 다음 시작 시 running 작업을 다시 queued로 돌립니다.
+    """
+
+    def __init__(self, db_path: str):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, audio_hash TEXT NOT NULL, model_size TEXT NOT NULL, "
+            "profile TEXT NOT NULL, filename TEXT, audio_path TEXT, status TEXT NOT NULL, "
+            "progress REAL NOT NULL DEFAULT 0, segments TEXT, result TEXT, error TEXT, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+            "started_at REAL, finished_at REAL)"
+        )
+        self._db.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS jobs_audio "
+            "ON jobs (audio_hash, model_size, profile)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        self._db.commit()
+        logger.info(f"작업 저장소 사용: {db_path}")
+
+    @staticmethod
+    def _to_dict(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(row)
+        job["segments"] = json.loads(job["segments"]) if job["segments"] else []
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def _select(self, where: str, params: Tuple) -> Optional[Dict[str, Any]]:
+        row = self._db.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE {where}", params
+        ).fetchone()
+        return self._to_dict(row)
+
+    def find(
+        self, audio_hash: str, model_size: str, profile: str
+    ) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._select(
+                "audio_hash = ? AND model_size = ? AND profile = ?",
+                (audio_hash, model_size, profile),
+            )
+
+    def create(
+        self,
+        audio_hash: str,
+        model_size: str,
+        profile: str,
+        filename: str,
+        audio_path: str,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        작업을 등록합니다. 같은 오디오의 작업이 이미 있으면 그 작업을 반환합니다.
+        기존 작업이 실패 상태였다면 새 오디오 파일로 다시 대기열에 넣습니다.
+
+        Returns:
+            (작업, 새로 등록되었는지 여부)
+        """
+        now = time.time()
+        with self._lock:
+            existing = self._select(
+                "audio_hash = ? AND model_size = ? AND profile = ?",
+                (audio_hash, model_size, profile),
+            )
+            if existing is not None and existing["status"] != FAILED:
+                return existing, False
+
+            if existing is not None:
+                self._db.execute(
+                    "UPDATE jobs SET status = ?, progress = 0, segments = NULL, "
+                    "result = NULL, error = NULL, filename = ?, audio_path = ?, "
+                    "updated_at = ?, started_at = NULL, finished_at = NULL WHERE id = ?",
+                    (QUEUED, filename, audio_path, now, existing["id"]),
+                )
+                job_id = existing["id"]
+            else:
+                job_id = uuid.uuid4().hex
+                self._db.execute(
+                    "INSERT INTO jobs (id, audio_hash, model_size, profile, filename, "
+                    "audio_path, status, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        job_id,
+                        audio_hash,
+                        model_size,
+                        profile,
+                        filename,
+                        audio_path,
+                        QUEUED,
+                        now,
+                        now,
+                    ),
+                )
+            self._db.commit()
+            return self._select("id = ?", (job_id,)), True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._select("id = ?", (job_id,))
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """
+        가장 오래된 queued 작업을 running으로 바꾸고 반환합니다. (없으면 None)
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                (QUEUED,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, updated_at = ? WHERE id = ?",
+                (RUNNING, now, now, row["id"]),
+            )
+            self._db.commit()
+            return self._select("id = ?", (row["id"],))
+
+    def update_progress(
+        self, job_id: str, progress: float, segments: List[Dict[str, Any]]
+    ):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET progress = ?, segments = ?, updated_at = ? WHERE id = ?",
+                (
+                    progress,
+                    json.dumps(segments, ensure_ascii=False),
+                    time.time(),
+                    job_id,
+                ),
+            )
+            self._db.commit()
+
+    def complete(self, job_id: str, result: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, progress = 1, segments = ?, result = ?, "
+                "audio_path = NULL, updated_at = ?, finished_at = ? WHERE id = ?",
+                (
+                    COMPLETED,
+                    json.dumps(result.get("segments", []), ensure_ascii=False),
+                    json.dumps(result, ensure_ascii=False),
+                    now,
+                    now,
+                    job_id,
+                ),
+            )
+            self._db.commit()
+
+    def fail(self, job_id: str, error: str):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ?, finished_at = ? "
+                "WHERE id = ?",
+                (FAILED, error, now, now, job_id),
+            )
+            self._db.commit()
+
+    def requeue(self, job_id: str):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL, updated_at = ? WHERE id = ?",
+                (QUEUED, time.time(), job_id),
+            )
+            self._db.commit()
+
+    def recover(self) -> int:
+        """
+        이전 프로세스에서 처리 중이던 작업을 다시 대기열에 넣습니다.
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = ?, progress = 0, segments = NULL, "
+                "started_at = NULL, updated_at = ? WHERE status = ?",
+                (QUEUED, time.time(), RUNNING),
+            )
+            self._db.commit()
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._db.close()
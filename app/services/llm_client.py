@@ -0,0 +1,172 @@
+import time
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.config import settings
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LLMConfigError(Exception):
+    """
+    LLM Provider 설정이 올바르지 않은 경우 (예: OPENAI_API_KEY 미설정)
+    """
+
+
+class LLMClient:
+    """
+    프로세스 전체에서 공유하는 비동기 LLM 클라이언트입니다.
+
+    - Provider마다 AsyncOpenAI 클라이언트를 한 번만 만들고, 커넥션 풀을 가진
+      httpx.AsyncClient를 재사용하여 요청마다 TCP/TLS 연결을 새로 맺지 않습니다.
+    - 타임아웃과 재시도(지수 백오프)는 설정값으로 조정합니다.
+    - Provider별 세마포어로 동시에 보내는 요청 수를 제한합니다.
+      (예: 단일 GPU Ollama 서버는 2, OpenAI는 16)
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, AsyncOpenAI] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    @staticmethod
+    def provider_name(provider: Optional[str] = None) -> str:
+        return (provider or settings.LLM_PROVIDER).lower()
+
+    def model_name(self, provider: Optional[str] = None) -> str:
+        if self.provider_name(provider) == "ollama":
+            return settings.OLLAMA_MODEL
+        return settings.OPENAI_MODEL
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+                timeout=httpx.Timeout(
+                    settings.LLM_TIMEOUT_SECONDS,
+                    connect=settings.LLM_CONNECT_TIMEOUT_SECONDS,
+                ),
+            )
+        return self._http_client
+
+    def get_client(self, provider: Optional[str] = None) -> AsyncOpenAI:
+        """
+        Provider의 공유 AsyncOpenAI 클라이언트를 반환합니다. (최초 호출 시 생성)
+
+        Raises:
+            LLMConfigError: OpenAI를 사용하는데 API 키가 없는 경우
+        """
+        name = self.provider_name(provider)
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+
+        if name == "ollama":
+            # 외부 Ollama 서버 주소 지원, API 키는 OpenAI SDK 호환을 위한 dummy 값
+            client_args = {"base_url": settings.OLLAMA_BASE_URL, "api_key": "ollama"}
+        else:
+            if not settings.OPENAI_API_KEY:
+                raise LLMConfigError(
+                    "OPENAI_API_KEY environment variable is not set."
+                )
+            client_args = {"api_key": settings.OPENAI_API_KEY}
+
+        client = AsyncOpenAI(
+            **client_args,
+            http_client=self._get_http_client(),
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            max_retries=settings.LLM_MAX_RETRIES,
+        )
+        self._clients[name] = client
+        logger.info(f"LLM 클라이언트 생성: {name.upper()}")
+        return client
+
+    def _semaphore(self, provider: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(provider)
+        if semaphore is None:
+            limit = settings.LLM_CONCURRENCY.get(
+                provider, settings.LLM_DEFAULT_CONCURRENCY
+            )
+            semaphore = asyncio.Semaphore(limit)
+            self._semaphores[provider] = semaphore
+        return semaphore
+
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.5,
+        provider: Optional[str] = None,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Chat Completion을 호출하고 응답 텍스트를 반환합니다.
+        Provider의 동시 요청 한도에 도달하면 자리가 날 때까지 대기합니다.
+        """
+        name = self.provider_name(provider)
+        client = self.get_client(name)
+        async with self._semaphore(name):
+            start = time.perf_counter()
+            response = await client.chat.completions.create(
+                model=self.model_name(name),
+                messages=messages,
+                temperature=temperature,
+                **kwargs,
+            )
+            elapsed = time.perf_counter() - start
+        # 비스트리밍 호출은 첫 토큰 시점을 알 수 없으므로 전체 호출 시간 기준 (프롬프트 처리 포함)
+        usage = getattr(response, "usage", None)
+        if usage is not None and usage.completion_tokens and elapsed > 0:
+            metrics.LLM_TOKENS_PER_SECOND.observe(
+                usage.completion_tokens / elapsed, provider=name, mode="chat"
+            )
+        return response.choices[0].message.content.strip()
+
+    async def stream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.5,
+        provider: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        """
+        스트리밍 Chat Completion을 호출하고 생성되는 텍스트 조각을 순서대로 반환합니다.
+        동시 요청 슬롯은 스트림이 끝나거나 소비자가 중단할 때까지 유지됩니다.
+        """
+        name = self.provider_name(provider)
+        client = self.get_client(name)
+        async with self._semaphore(name):
+            stream = await client.chat.completions.create(
+                model=self.model_name(name),
+                messages=messages,
+                temperature=temperature,
+                stream=True,
+                **kwargs,
+            )
+            try:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        yield content
+            finally:
+                # 클라이언트 연결이 끊기면 업스트림 생성도 중단
+                await stream.close()
+
+    async def aclose(self):
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        self._http_client = None
+        self._clients.clear()
+        self._semaphores.clear()
+
+
+llm_client = LLMClient()
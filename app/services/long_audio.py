@@ -0,0 +1,215 @@
+import os
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+from app.services.audio_io import SAMPLE_RATE
+from app.services.model_registry import ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkSegment(NamedTuple):
+    start: float
+    end: float
+    text: str
+
+
+class ChunkInfo(NamedTuple):
+    language: Optional[str]
+
+
+# 워커 프로세스마다 하나씩 생성되는 모델 레지스트리
+_worker_registry: Optional[ModelRegistry] = None
+_worker_cpu_threads = 0
+
+
+def _init_worker(device: str, memory_budget_mb: Optional[float], cpu_threads: int):
+    global _worker_registry, _worker_cpu_threads
+    _worker_registry = ModelRegistry(device=device, memory_budget_mb=memory_budget_mb)
+    _worker_cpu_threads = cpu_threads
+
+
+def _worker_model(model_size: str, model_options: Dict[str, Any]):
+    # 프로필에 cpu_threads가 없으면 워커 수에 맞춘 스레드 수 사용 (코어 과다 점유 방지)
+    options = dict(model_options)
+    if not options.get("cpu_threads"):
+        options["cpu_threads"] = _worker_cpu_threads
+    return _worker_registry.get(model_size, **options)
+
+
+def _detect_language(
+    model_size: str, model_options: Dict[str, Any], audio: np.ndarray
+) -> str:
+    model = _worker_model(model_size, model_options)
+    language, _, _ = model.detect_language(audio)
+    return language
+
+
+def _transcribe_chunk(
+    model_size: str,
+    model_options: Dict[str, Any],
+    decode_options: Dict[str, Any],
+    audio: np.ndarray,
+    offset: float,
+) -> List[ChunkSegment]:
+    model = _worker_model(model_size, model_options)
+    segments, _ = model.transcribe(audio, **decode_options)
+    duration = audio.shape[0] / SAMPLE_RATE
+    return [
+        ChunkSegment(
+            offset + segment.start,
+            offset + min(segment.end, duration),
+            segment.text,
+        )
+        for segment in segments
+    ]
+
+
+def plan_chunks(
+    audio: np.ndarray, chunk_seconds: float, min_silence_ms: int
+) -> List[Tuple[int, int]]:
+    """
+    오디오를 chunk_seconds 이하의 구간으로 나눕니다. (샘플 단위 [start, end) 목록)
+
+    분할 지점은 VAD로 찾은 발화 사이 침묵의 가운데로 잡아 단어가 잘리지 않게 하고,
+    침묵 없이 긴 발화가 이어지는 경우에만 chunk_seconds 위치에서 강제로 자릅니다.
+    발화가 전혀 없는 구간은 결과에서 제외합니다.
+    """
+    total = audio.shape[0]
+    target = int(chunk_seconds * SAMPLE_RATE)
+    speech = get_speech_timestamps(
+        audio, VadOptions(min_silence_duration_ms=min_silence_ms)
+    )
+    if not speech:
+        return []
+    if total <= target:
+        return [(0, total)]
+
+    cuts = [(a["end"] + b["start"]) // 2 for a, b in zip(speech, speech[1:])]
+
+    bounds = []
+    start = 0
+    while total - start > target:
+        limit = start + target
+        candidates = [cut for cut in cuts if start < cut <= limit]
+        end = candidates[-1] if candidates else limit
+        bounds.append((start, end))
+        start = end
+    bounds.append((start, total))
+
+    return [
+        (start, end)
+        for start, end in bounds
+        if any(s["start"] < end and s["end"] > start for s in speech)
+    ]
+
+
+class LongAudioTranscriber:
+    """
+    긴 녹음을 침묵 구간에서 나누어 여러 프로세스에서 동시에 전사합니다.
+
+    - 워커 프로세스는 각자 ModelRegistry를 가지며 처음 요청된 모델을 한 번만 로딩합니다.
+    - 언어가 지정되지 않았으면 첫 발화 구간에서 한 번 감지해 모든 구간에 같은 언어를 적용합니다.
+    - 결과는 구간 순서대로 전역 타임스탬프로 변환되어 반환되므로 순서가 항상 유지됩니다.
+    - 구간 간 condition_on_previous_text 문맥은 이어지지 않습니다.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        chunk_seconds: float,
+        min_silence_ms: int,
+        device: str = "auto",
+        memory_budget_mb: Optional[float] = None,
+        cpu_threads: int = 0,
+    ):
+        self.workers = workers
+        self.chunk_seconds = chunk_seconds
+        self.min_silence_ms = min_silence_ms
+        self.device = device
+        self.memory_budget_mb = memory_budget_mb
+        self.cpu_threads = cpu_threads or max(1, (os.cpu_count() or 1) // workers)
+
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # 스레드가 많은 서버 프로세스를 fork하지 않도록 spawn 사용
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.device, self.memory_budget_mb, self.cpu_threads),
+                )
+                logger.info(
+                    f"장시간 오디오 워커 풀 시작 (workers: {self.workers}, "
+                    f"cpu_threads: {self.cpu_threads})"
+                )
+            return self._pool
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        model_size: str,
+        model_options: Dict[str, Any],
+        decode_options: Dict[str, Any],
+    ) -> Tuple[Iterator[ChunkSegment], ChunkInfo]:
+        """
+        WhisperModel.transcribe()와 같은 (segments, info) 형태로 결과를 반환합니다.
+        모든 구간은 호출 즉시 워커 풀에 제출되고, segments는 앞 구간부터 완료되는 대로 반환됩니다.
+        """
+        chunks = plan_chunks(audio, self.chunk_seconds, self.min_silence_ms)
+        if not chunks:
+            return iter([]), ChunkInfo(decode_options.get("language"))
+
+        pool = self._get_pool()
+        decode_options = dict(decode_options)
+        if decode_options.get("language") is None:
+            first_start, first_end = chunks[0]
+            decode_options["language"] = pool.submit(
+                _detect_language,
+                model_size,
+                model_options,
+                audio[first_start : min(first_end, first_start + 30 * SAMPLE_RATE)],
+            ).result()
+
+        logger.info(
+            f"장시간 오디오 {audio.shape[0] / SAMPLE_RATE:.0f}s를 "
+            f"{len(chunks)}개 구간으로 병렬 전사"
+        )
+        futures = [
+            pool.submit(
+                _transcribe_chunk,
+                model_size,
+                model_options,
+                decode_options,
+                audio[start:end],
+                start / SAMPLE_RATE,
+            )
+            for start, end in chunks
+        ]
+        return self._collect(futures), ChunkInfo(decode_options["language"])
+
+    @staticmethod
+    def _collect(futures: List[Future]) -> Iterator[ChunkSegment]:
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            # 소비자가 중간에 멈추면 아직 시작하지 않은 구간은 취소
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
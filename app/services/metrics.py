@@ -0,0 +1,272 @@
+import time
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# 지연 시간 히스토그램 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels: str):
+        """
+        다른 객체가 이미 세고 있는 누적값을 그대로 반영합니다. (collector 전용)
+        """
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str):
+        self.inc(-amount, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets))
+        # label -> (버킷별 개수, 합계, 전체 개수)
+        self._values: Dict[LabelKey, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            if index < len(counts):
+                counts[index] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(c), t, n) for key, (c, t, n) in self._values.items()]
+        lines = self._header()
+        for key, counts, total, count in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {cumulative}"
+                )
+            lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Prometheus 텍스트 형식(0.0.4)으로 내보내는 최소 메트릭 저장소입니다.
+
+    기록은 잠금 하나와 dict 갱신뿐이라 요청 경로에 넣어도 부담이 거의 없습니다.
+    대기열 길이, 캐시 적중 수처럼 이미 다른 객체가 세고 있는 값은 collector로 등록해
+    스크레이프 시점에만 읽습니다.
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self._register(Counter(name, documentation))
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        return self._register(Gauge(name, documentation))
+
+    def histogram(
+        self, name: str, documentation: str, buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, buckets))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn: Callable[[], None]):
+        """
+        스크레이프 직전에 호출되어 게이지 값을 갱신하는 함수를 등록합니다.
+        """
+        self._collectors.append(fn)
+
+    def render(self) -> str:
+        for fn in self._collectors:
+            fn()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# --- HTTP ---
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route"
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being processed"
+)
+
+# --- Pipeline stages (upload_hash, audio_decode, model_load, inference, summary, ...) ---
+STAGE_DURATION = registry.histogram(
+    "pipeline_stage_duration_seconds", "Latency of each STT/summary pipeline stage"
+)
+
+# --- STT ---
+STT_AUDIO_SECONDS = registry.counter(
+    "stt_audio_seconds_total", "Seconds of audio transcribed"
+)
+STT_REAL_TIME_FACTOR = registry.histogram(
+    "stt_real_time_factor",
+    "Transcription time divided by audio duration",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 5),
+)
+STT_QUEUE = registry.gauge("stt_inference_queue", "Inference executor requests by state")
+MODEL_CACHE_LOOKUPS = registry.counter(
+    "stt_model_cache_lookups_total", "Model registry lookups by result (hit/load)"
+)
+RESULT_CACHE_LOOKUPS = registry.counter(
+    "result_cache_lookups_total", "Result cache lookups by cache and result"
+)
+
+# --- LLM ---
+LLM_REQUESTS = registry.counter(
+    "llm_summary_requests_total", "LLM summaries by provider and outcome"
+)
+LLM_TOKENS_PER_SECOND = registry.histogram(
+    "llm_tokens_per_second",
+    "Completion tokens per second by provider and mode (stream, chat)",
+    buckets=(1, 2, 5, 10, 20, 30, 50, 75, 100, 150, 200),
+)
+LLM_TIME_TO_FIRST_TOKEN = registry.histogram(
+    "llm_time_to_first_token_seconds", "Streaming time to first token"
+)
+
+# --- EMR ---
+EMR_UPSTREAM_DURATION = registry.histogram(
+    "emr_upstream_duration_seconds", "EMR upstream latency (until response headers)"
+)
+EMR_UPSTREAM_RESPONSES = registry.counter(
+    "emr_upstream_responses_total", "EMR upstream responses by resource and status code"
+)
+
+
+class MetricsMiddleware:
+    """
+    라우트별 응답 시간과 처리 중인 요청 수를 기록하는 ASGI 미들웨어입니다.
+    스트리밍 응답도 본문 전송이 끝날 때까지를 측정합니다.
+    라벨에는 실제 경로 대신 라우트 템플릿(/jobs/{job_id})을 사용합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                route=getattr(route, "path", "unmatched"),
+                method=scope["method"],
+                status=str(status["code"]),
+            )
@@ -0,0 +1,252 @@
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import ctranslate2
+import numpy as np
+from faster_whisper import WhisperModel
+
+from app.services.audio_io import SAMPLE_RATE
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+# 모델별 파라미터 수 (백만 단위), 메모리 사용량 추정에 사용
+MODEL_PARAMS_M = {
+    "tiny": 39,
+    "base": 74,
+    "small": 244,
+    "medium": 769,
+    "large": 1550,
+    "large-v1": 1550,
+    "large-v2": 1550,
+    "large-v3": 1550,
+    "turbo": 809,
+    "large-v3-turbo": 809,
+}
+
+# compute_type별 파라미터 하나당 바이트 수
+BYTES_PER_PARAM = {
+    "int8": 1,
+    "int8_float16": 1,
+    "int8_float32": 1,
+    "int8_bfloat16": 1,
+    "float16": 2,
+    "bfloat16": 2,
+    "float32": 4,
+}
+
+# 디바이스별 기본 compute_type
+DEFAULT_COMPUTE_TYPE = {"cuda": "float16", "cpu": "int8"}
+
+
+def estimate_model_mb(model_size: str, compute_type: str) -> float:
+    """
+    가중치 크기에 런타임 오버헤드(20%)를 더한 대략적인 메모리 사용량(MB)을 반환합니다.
+    """
+    params = MODEL_PARAMS_M.get(model_size.replace(".en", ""), 244)
+    return params * BYTES_PER_PARAM.get(compute_type, 4) * 1.2
+
+
+class LoadedModel:
+    def __init__(
+        self,
+        model: WhisperModel,
+        model_size: str,
+        device: str,
+        compute_type: str,
+        cpu_threads: int,
+        num_workers: int,
+        load_time: float,
+    ):
+        self.model = model
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.load_time = load_time
+        self.estimated_mb = estimate_model_mb(model_size, compute_type)
+        self.last_used = time.time()
+
+
+class ModelRegistry:
+    """
+    Whisper 모델 인스턴스를 관리하는 레지스트리입니다.
+
+    - 모델별 잠금으로 동시에 첫 요청이 들어와도 한 번만 로딩합니다. (single-flight)
+    - 디바이스/compute_type을 모델마다 따로 기록하므로, 한 모델의 CUDA 실패가
+      다른 모델의 디바이스 선택에 영향을 주지 않습니다.
+    - 추정 메모리 합계가 memory_budget_mb를 넘으면 가장 오래 사용하지 않은 모델부터 내립니다.
+    """
+
+    def __init__(self, device: str = "auto", memory_budget_mb: Optional[float] = None):
+        self.device = device
+        self.memory_budget_mb = memory_budget_mb
+
+        self._lock = threading.Lock()
+        # (model_size, compute_type, cpu_threads, num_workers) -> LoadedModel
+        self._models: "OrderedDict[Tuple, LoadedModel]" = OrderedDict()
+        self._load_locks: Dict[Tuple, threading.Lock] = {}
+        self._device_list: Optional[List[str]] = None
+
+    def _devices(self) -> List[str]:
+        if self._device_list is None:
+            if self.device != "auto":
+                self._device_list = [self.device]
+            else:
+                try:
+                    has_cuda = ctranslate2.get_cuda_device_count() > 0
+                except Exception:
+                    has_cuda = False
+                self._device_list = ["cuda", "cpu"] if has_cuda else ["cpu"]
+        return self._device_list
+
+    def _candidates(self, compute_type: Optional[str]) -> List[Tuple[str, str]]:
+        return [
+            (d, compute_type or DEFAULT_COMPUTE_TYPE.get(d, "default"))
+            for d in self._devices()
+        ]
+
+    def get(
+        self,
+        model_size: str,
+        compute_type: Optional[str] = None,
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+    ) -> WhisperModel:
+        """
+        요청된 모델을 반환합니다. 없으면 로딩하며, 같은 모델의 동시 로딩은 하나로 합쳐집니다.
+        compute_type/cpu_threads/num_workers 조합마다 별도의 인스턴스로 관리됩니다.
+        """
+        # compute_type 미지정 시 첫 후보 디바이스의 기본값으로 맞춰, 같은 설정은 한 인스턴스를 공유
+        resolved_type = self._candidates(compute_type)[0][1]
+        key = (model_size, resolved_type, cpu_threads, num_workers)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                entry.last_used = time.time()
+                self._models.move_to_end(key)
+                metrics.MODEL_CACHE_LOOKUPS.inc(result="hit")
+                return entry.model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # 잠금을 기다리는 동안 다른 요청이 로딩을 마쳤을 수 있음
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    entry.last_used = time.time()
+                    self._models.move_to_end(key)
+                    metrics.MODEL_CACHE_LOOKUPS.inc(result="hit")
+                    return entry.model
+
+            metrics.MODEL_CACHE_LOOKUPS.inc(result="load")
+            entry = self._load(model_size, compute_type, cpu_threads, num_workers)
+            with self._lock:
+                self._models[key] = entry
+                self._evict(keep=key)
+            return entry.model
+
+    def _load(
+        self,
+        model_size: str,
+        compute_type: Optional[str],
+        cpu_threads: int,
+        num_workers: int,
+    ) -> LoadedModel:
+        last_error: Optional[Exception] = None
+        for device, resolved_type in self._candidates(compute_type):
+            start_time = time.time()
+            try:
+                logger.info(
+                    f"모델 '{model_size}' 로딩 중... Device: {device}, compute_type: {resolved_type}"
+                )
+                model = WhisperModel(
+                    model_size,
+                    device=device,
+                    compute_type=resolved_type,
+                    cpu_threads=cpu_threads,
+                    num_workers=num_workers,
+                )
+            except Exception as e:
+                logger.warning(f"{device} 모드로 모델 '{model_size}' 로딩 실패: {e}")
+                last_error = e
+                continue
+            load_time = time.time() - start_time
+            logger.info(
+                f"모델 '{model_size}' 로딩 완료 (Device: {device}, {load_time:.2f}s)"
+            )
+            return LoadedModel(
+                model,
+                model_size,
+                device,
+                resolved_type,
+                cpu_threads,
+                num_workers,
+                load_time,
+            )
+        raise last_error
+
+    def _evict(self, keep: Tuple):
+        if self.memory_budget_mb is None:
+            return
+        total = sum(entry.estimated_mb for entry in self._models.values())
+        for key in list(self._models.keys()):
+            if total <= self.memory_budget_mb:
+                break
+            if key == keep:
+                continue
+            evicted = self._models.pop(key)
+            total -= evicted.estimated_mb
+            logger.info(
+                f"메모리 예산 초과로 모델 '{evicted.model_size}' 해제 (~{evicted.estimated_mb:.0f}MB)"
+            )
+        if total > self.memory_budget_mb:
+            logger.warning(
+                f"모델 메모리 추정치({total:.0f}MB)가 예산({self.memory_budget_mb}MB)을 초과합니다."
+            )
+
+    def warm_up(self, model_size: str, **model_options):
+        """
+        모델을 로딩하고 1초 무음으로 한 번 추론해 첫 요청의 초기화 비용을 미리 치릅니다.
+        """
+        model = self.get(model_size, **model_options)
+        segments, _ = model.transcribe(
+            np.zeros(SAMPLE_RATE, dtype=np.float32),
+            beam_size=1,
+            language="en",
+            vad_filter=False,
+        )
+        for _ in segments:
+            pass
+
+    def preload(self, model_sizes: List[str], **model_options):
+        for model_size in model_sizes:
+            try:
+                self.warm_up(model_size, **model_options)
+            except Exception as e:
+                logger.error(f"모델 '{model_size}' 사전 로딩 실패: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            models = [
+                {
+                    "model_size": entry.model_size,
+                    "device": entry.device,
+                    "compute_type": entry.compute_type,
+                    "cpu_threads": entry.cpu_threads,
+                    "num_workers": entry.num_workers,
+                    "estimated_mb": round(entry.estimated_mb, 1),
+                    "load_time": entry.load_time,
+                    "last_used": entry.last_used,
+                }
+                for entry in self._models.values()
+            ]
+        return {
+            "memory_budget_mb": self.memory_budget_mb,
+            "estimated_mb": round(sum(m["estimated_mb"] for m in models), 1),
+            "models": models,
+        }
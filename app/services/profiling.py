@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import uuid
+import pstats
+import asyncio
+import cProfile
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import parse_qs
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Trace:
+    """
+    프로파일링이 켜진 요청 하나의 기록입니다.
+
+    - spans: 단계별 중첩 구간 (이름, 시작 시각, 소요 시간, 부모, 스레드)
+    - profiles: 단계 함수를 실행한 스레드별 cProfile 결과
+    """
+
+    def __init__(self, trace_id: str, name: str, cprofile: bool = True):
+        self.trace_id = trace_id
+        self.name = name
+        self.cprofile = cprofile
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans: List[Dict[str, Any]] = []
+        self.profiles: List[cProfile.Profile] = []
+
+    def add_span(self, span: Dict[str, Any]):
+        with self._lock:
+            self.spans.append(span)
+
+    def add_profile(self, profile: cProfile.Profile):
+        with self._lock:
+            self.profiles.append(profile)
+
+    def offset(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def write(self, directory: str) -> str:
+        """
+        {trace_id}.json (구간)과 {trace_id}.prof (pstats 형식, 스레드별 결과 병합)를 저장합니다.
+        """
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, self.trace_id)
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start"])
+            profiles = list(self.profiles)
+
+        with open(f"{base}.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "trace_id": self.trace_id,
+                    "name": self.name,
+                    "started_at": self.started_at,
+                    "spans": spans,
+                    "profile": f"{self.trace_id}.prof" if profiles else None,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        if profiles:
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(f"{base}.prof")
+        return base
+
+
+# 현재 요청의 Trace와 열려 있는 구간 ID
+# (contextvars이므로 asyncio 태스크, asyncio.to_thread, 추론 실행기 스레드로 전파됨)
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+_current_span: ContextVar[Optional[int]] = ContextVar("span", default=None)
+_span_ids = iter(range(1, 1 << 62))
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[None]:
+    """
+    현재 요청이 프로파일링 중이면 name 구간의 시작/종료를 기록합니다. (아니면 아무것도 하지 않음)
+    구간 안에서 연 구간은 자식 구간으로 기록됩니다.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    span_id = next(_span_ids)
+    parent = _current_span.get()
+    token = _current_span.set(span_id)
+    start = trace.offset()
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+        trace.add_span(
+            {
+                "id": span_id,
+                "parent": parent,
+                "name": name,
+                "start": start,
+                "duration": trace.offset() - start,
+                "thread": threading.current_thread().name,
+                **attributes,
+            }
+        )
+
+
+def profile_call(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    현재 요청이 프로파일링 중이면 fn을 cProfile로 감싸 실행하고 결과를 Trace에 모읍니다.
+    cProfile은 실행한 스레드만 측정하므로, 블로킹 단계 함수를 실행하는 지점에서 호출합니다.
+    """
+    trace = _current_trace.get()
+    if trace is None or not trace.cprofile:
+        return fn(*args, **kwargs)
+
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # 다른 스레드의 프로파일러가 이미 동작 중 (Python 3.12+), 구간만 기록
+        return fn(*args, **kwargs)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profile.disable()
+        trace.add_profile(profile)
+
+
+async def to_thread(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    asyncio.to_thread()와 같지만 프로파일링 중이면 스레드에서 cProfile을 적용합니다.
+    """
+    return await asyncio.to_thread(profile_call, fn, *args, **kwargs)
+
+
+class ProfilingMiddleware:
+    """
+    요청별 프로파일링을 켜는 ASGI 미들웨어입니다.
+
+    PROFILING_ENABLED일 때 PROFILING_HEADER 헤더나 ?trace=1 쿼리가 있는 요청만
+    Trace를 만들고, 응답 헤더 X-Trace-Id로 trace ID를 돌려줍니다.
+    응답(스트리밍 포함)이 끝나면 PROFILING_DIR에 구간과 cProfile 결과를 저장합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def _requested(scope) -> bool:
+        header = settings.PROFILING_HEADER.lower().encode("latin-1")
+        for key, value in scope.get("headers", []):
+            if key == header and value.decode("latin-1").lower() in ["1", "true", "yes"]:
+                return True
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        # /upload-audio, /jobs의 디코딩 프로필(profile) 폼 필드와 겹치지 않도록 trace 사용
+        return query.get("trace", [""])[0].lower() in ["1", "true", "yes"]
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.PROFILING_ENABLED
+            or not self._requested(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(
+            uuid.uuid4().hex,
+            f"{scope['method']} {scope['path']}",
+            cprofile=settings.PROFILING_CPROFILE,
+        )
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-trace-id", trace.trace_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        token = _current_trace.set(trace)
+        try:
+            with span("request", path=scope["path"], method=scope["method"]):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            try:
+                path = await asyncio.to_thread(trace.write, settings.PROFILING_DIR)
+                logger.info(f"프로파일 저장: {path} ({trace.name})")
+            except Exception as e:
+                logger.error(f"프로파일 저장 실패 ({trace.trace_id}): {e}")
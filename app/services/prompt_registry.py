@@ -0,0 +1,201 @@
+import os
+import re
+import glob
+import threading
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 기본 프롬프트 디렉터리 (app/prompts)
+PROMPTS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prompts"
+)
+
+_HANGUL = re.compile(r"[가-힣]")
+
+
+def _load_tokenizer() -> Optional[Callable[[str], int]]:
+    """
+    tiktoken이 설치되어 있으면 cl100k_base 인코더로 토큰 수를 셉니다. (선택 의존성)
+    """
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+    return lambda text: len(encoding.encode(text))
+
+
+_tokenizer = _load_tokenizer()
+TOKEN_COUNTER = "tiktoken:cl100k_base" if _tokenizer else "estimate"
+
+
+def count_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수를 반환합니다.
+    tiktoken이 없으면 한글 음절 1개당 1토큰, 그 외 문자 4개당 1토큰으로 추정합니다.
+    """
+    if _tokenizer is not None:
+        return _tokenizer(text)
+    hangul = len(_HANGUL.findall(text))
+    others = len(re.sub(r"\s", "", text)) - hangul
+    return hangul + (others + 3) // 4
+
+
+class PromptTemplate:
+    def __init__(self, name: str, path: str, content: str, mtime: float):
+        self.name = name
+        self.path = path
+        self.content = content
+        self.mtime = mtime
+        self.token_length = count_tokens(content.replace("{text}", ""))
+
+    def system_prompt(self) -> str:
+        # 대화 내용은 user 메시지로 전달하므로 placeholder는 제거
+        return self.content.replace("{text}", "").strip()
+
+    def to_dict(self, include_content: bool = False) -> Dict[str, Any]:
+        data = {
+            "name": self.name,
+            "file": os.path.basename(self.path),
+            "token_length": self.token_length,
+            "updated_at": self.mtime,
+        }
+        if include_content:
+            data["content"] = self.content
+        return data
+
+
+class PromptRegistry:
+    """
+    app/prompts/*.txt 템플릿을 메모리에 올려두고 이름으로 제공하는 레지스트리입니다.
+
+    - 템플릿 이름은 파일명에서 '_template.txt'를 뺀 값입니다. (예: soap_summary)
+    - 요청 처리 중에는 파일을 읽지 않고, 백그라운드 스레드가 주기적으로 mtime을 확인해
+      변경/추가/삭제된 파일만 다시 읽습니다.
+    - internal에 지정된 템플릿(예: 구간별 추출용 soap_extract)은 서비스 내부에서만 사용하며
+      목록에 노출하지 않고 사용자가 선택할 수도 없습니다.
+    """
+
+    def __init__(
+        self,
+        directory: str = PROMPTS_DIR,
+        reload_interval: float = 2.0,
+        internal: Iterable[str] = (),
+    ):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self.internal = set(internal)
+
+        self._lock = threading.Lock()
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _name(path: str) -> str:
+        name = os.path.splitext(os.path.basename(path))[0]
+        return name[: -len("_template")] if name.endswith("_template") else name
+
+    def load(self):
+        """
+        디렉터리를 확인하여 새로 생기거나 수정된 템플릿을 읽고, 삭제된 템플릿은 제거합니다.
+        """
+        found = {}
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.txt"))):
+            try:
+                found[self._name(path)] = (path, os.path.getmtime(path))
+            except OSError:
+                continue
+
+        with self._lock:
+            current = dict(self._templates)
+
+        updated = {}
+        for name, (path, mtime) in found.items():
+            template = current.get(name)
+            if template is not None and template.path == path and template.mtime == mtime:
+                updated[name] = template
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    content = f.read()
+            except Exception as e:
+                logger.error(f"프롬프트 템플릿 읽기 실패 ({path}): {e}")
+                if template is not None:
+                    updated[name] = template
+                continue
+            updated[name] = PromptTemplate(name, path, content, mtime)
+            logger.info(f"프롬프트 템플릿 로드: {name} ({updated[name].token_length} tokens)")
+
+        with self._lock:
+            self._templates = updated
+
+    def _watch(self):
+        while not self._stop.wait(self.reload_interval):
+            try:
+                self.load()
+            except Exception as e:
+                logger.error(f"프롬프트 템플릿 갱신 실패: {e}")
+
+    def start(self):
+        """
+        템플릿을 모두 읽고 변경 감지 스레드를 시작합니다.
+        """
+        self.load()
+        if self._watcher is None and self.reload_interval > 0:
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, name="prompt-registry-watcher", daemon=True
+            )
+            self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=self.reload_interval + 1)
+        self._watcher = None
+
+    def get(self, name: str, include_internal: bool = True) -> PromptTemplate:
+        """
+        Args:
+            include_internal (bool): False이면 내부용 템플릿을 찾지 않습니다. (사용자 요청 검증용)
+
+        Raises:
+            ValueError: 등록되지 않은 템플릿 이름인 경우
+        """
+        with self._lock:
+            loaded = bool(self._templates)
+        if not loaded:
+            # start() 전에 호출된 경우 (스크립트 등) 한 번 읽어둠
+            self.load()
+
+        with self._lock:
+            template = self._templates.get(name)
+            names = [n for n in self._templates if n not in self.internal]
+        if not include_internal and name in self.internal:
+            template = None
+        if template is None:
+            raise ValueError(
+                f"알 수 없는 프롬프트 템플릿입니다: '{name}' (사용 가능: {', '.join(names)})"
+            )
+        return template
+
+    def list_templates(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                template.to_dict()
+                for name, template in self._templates.items()
+                if name not in self.internal
+            ]
+
+
+prompt_registry = PromptRegistry(
+    directory=settings.PROMPT_DIR or PROMPTS_DIR,
+    reload_interval=settings.PROMPT_RELOAD_INTERVAL_SECONDS,
+    internal=[settings.SUMMARY_EXTRACT_TEMPLATE],
+)
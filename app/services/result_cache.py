@@ -0,0 +1,146 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    JSON 직렬화 가능한 결과를 저장하는 2단계 캐시입니다.
+
+    - 메모리 계층: LRU, 전체 바이트 예산(max_bytes) 및/또는 항목 수(max_entries) 제한
+    - 디스크 계층(선택): SQLite 파일, 재시작 후에도 유지
+    - 두 계층 모두 ttl_seconds가 지나면 만료됩니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        db_path: Optional[str] = None,
+    ):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        # key -> (expires_at, payload, size in bytes)
+        self._memory: "OrderedDict[str, Tuple[Optional[float], str, int]]" = (
+            OrderedDict()
+        )
+        self._memory_bytes = 0
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            self._db.commit()
+            logger.info(f"[{name}] 디스크 캐시 사용: {db_path}")
+
+    def _expires_at(self) -> Optional[float]:
+        return time.time() + self.ttl_seconds if self.ttl_seconds else None
+
+    @staticmethod
+    def _expired(expires_at: Optional[float]) -> bool:
+        return expires_at is not None and expires_at < time.time()
+
+    def _remember(self, key: str, expires_at: Optional[float], payload: str):
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[2]
+        size = len(payload.encode("utf-8"))
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._memory[key] = (expires_at, payload, size)
+        self._memory_bytes += size
+        while self._memory and (
+            (self.max_bytes is not None and self._memory_bytes > self.max_bytes)
+            or (self.max_entries is not None and len(self._memory) > self.max_entries)
+        ):
+            _, (_, _, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, payload, size = entry
+                if not self._expired(expires_at):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return json.loads(payload)
+                self._memory_bytes -= size
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    payload, expires_at = row
+                    if not self._expired(expires_at):
+                        self._remember(key, expires_at, payload)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return json.loads(payload)
+                    self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]):
+        payload = json.dumps(value, ensure_ascii=False)
+        expires_at = self._expires_at()
+        with self._lock:
+            self._remember(key, expires_at, payload)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, payload, expires_at),
+                )
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._memory),
+                "bytes": self._memory_bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "disk": self._db is not None,
+            }
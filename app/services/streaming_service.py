@@ -0,0 +1,210 @@
+import threading
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+import av
+import numpy as np
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+from app.config import settings
+from app.services.audio_io import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+
+class _ByteStream:
+    """
+    웹소켓으로 들어오는 청크를 PyAV 디코더 스레드에 전달하는 블로킹 파일 객체입니다.
+    read()는 데이터가 들어오거나 스트림이 닫힐 때까지 대기합니다.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def write(self, data: bytes):
+        with self._cond:
+            self._buffer += data
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def read(self, size: int = -1) -> bytes:
+        with self._cond:
+            while not self._buffer and not self._closed:
+                self._cond.wait()
+            if size < 0:
+                size = len(self._buffer)
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+            return data
+
+
+class StreamingSession:
+    """
+    브라우저 녹음(webm/opus) 스트림 하나에 대한 실시간 전사 세션입니다.
+
+    - 들어오는 청크는 전용 스레드에서 16kHz 모노 파형으로 점진적으로 디코딩됩니다.
+    - step()은 아직 확정되지 않은 구간(슬라이딩 윈도우)에 VAD를 적용해
+      침묵으로 끝난 발화를 확정 세그먼트로 전사하고, 진행 중인 발화는 부분 결과로 전사합니다.
+    - 정지 시에는 마지막 윈도우만 남아 있으므로 최종 결과가 곧바로 준비됩니다.
+    """
+
+    def __init__(self, stt_service, model_size: str = "base"):
+        self.stt_service = stt_service
+        self.model_size = model_size
+        self.language: Optional[str] = settings.STT_LANGUAGE
+        self.segments: List[Dict[str, Any]] = []
+        self.committed = 0  # 확정 처리된 샘플 수 (녹음 시작 기준 절대 위치)
+        self.error: Optional[Exception] = None
+
+        self._stream = _ByteStream()
+        # 확정되지 않은 구간(self.committed 이후)의 샘플만 보관
+        self._chunks: List[np.ndarray] = []
+        self._num_samples = 0
+        self._lock = threading.Lock()
+        self._decoder = threading.Thread(
+            target=self._decode_loop, name="stt-stream-decoder", daemon=True
+        )
+        self._decoder.start()
+
+    def feed(self, data: bytes):
+        self._stream.write(data)
+
+    def close(self):
+        self._stream.close()
+
+    def _decode_loop(self):
+        try:
+            container = av.open(self._stream, mode="r")
+            resampler = av.AudioResampler(format="flt", layout="mono", rate=SAMPLE_RATE)
+            for frame in container.decode(audio=0):
+                for resampled in resampler.resample(frame):
+                    samples = resampled.to_ndarray().reshape(-1)
+                    with self._lock:
+                        self._chunks.append(samples)
+                        self._num_samples += samples.shape[0]
+            container.close()
+        except Exception as e:
+            logger.error(f"스트리밍 오디오 디코딩 실패: {e}")
+            self.error = e
+
+    def _snapshot(self) -> np.ndarray:
+        """
+        아직 확정되지 않은 구간의 파형을 반환합니다.
+        """
+        with self._lock:
+            if len(self._chunks) > 1:
+                self._chunks = [np.concatenate(self._chunks)]
+            return self._chunks[0] if self._chunks else np.zeros(0, dtype=np.float32)
+
+    def _discard(self, num_samples: int):
+        """
+        확정된 앞부분 num_samples개를 버립니다. 그 사이 디코딩된 샘플은 유지됩니다.
+        """
+        with self._lock:
+            if len(self._chunks) > 1:
+                self._chunks = [np.concatenate(self._chunks)]
+            if self._chunks:
+                self._chunks = [self._chunks[0][num_samples:]]
+
+    def _decode(
+        self, audio: np.ndarray, offset: int, beam_size: int
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        model = self.stt_service.get_model(self.model_size)
+        segments_generator, info = model.transcribe(
+            audio,
+            beam_size=beam_size,
+            language=self.language,
+            vad_filter=True,
+            condition_on_previous_text=False,
+        )
+        segments = [
+            {
+                "start": offset / SAMPLE_RATE + segment.start,
+                "end": offset / SAMPLE_RATE + segment.end,
+                "text": segment.text,
+            }
+            for segment in segments_generator
+        ]
+        return segments, info.language
+
+    def step(self, final: bool = False) -> Dict[str, Any]:
+        """
+        지금까지 디코딩된 오디오를 처리합니다. (추론 스레드에서 호출)
+
+        Args:
+            final (bool): True이면 입력을 닫고 남은 구간을 모두 확정합니다.
+
+        Returns:
+            dict: {
+                "segments": 새로 확정된 세그먼트,
+                "partial": 진행 중인 발화의 임시 텍스트
+            }
+        """
+        if final:
+            self.close()
+            self._decoder.join(timeout=settings.STREAM_DECODER_JOIN_TIMEOUT)
+
+        pending = self._snapshot()
+        if pending.shape[0] == 0:
+            return {"segments": [], "partial": ""}
+
+        speech = get_speech_timestamps(
+            pending,
+            VadOptions(
+                min_silence_duration_ms=settings.STREAM_MIN_SILENCE_MS,
+                speech_pad_ms=settings.STREAM_SPEECH_PAD_MS,
+            ),
+        )
+        min_silence = int(settings.STREAM_MIN_SILENCE_MS * SAMPLE_RATE / 1000)
+        max_window = int(settings.STREAM_MAX_WINDOW_SECONDS * SAMPLE_RATE)
+
+        if final:
+            commit_to = pending.shape[0]
+        else:
+            # 뒤에 충분한 침묵이 이어진 발화까지만 확정
+            silence_edge = pending.shape[0] - min_silence
+            closed = [s for s in speech if s["end"] <= silence_edge]
+            if closed:
+                commit_to = closed[-1]["end"]
+            elif not speech:
+                commit_to = max(0, silence_edge)
+            else:
+                commit_to = 0
+            if pending.shape[0] - commit_to > max_window:
+                # 윈도우가 너무 길어지면 발화 중이라도 강제로 확정
+                commit_to = pending.shape[0]
+
+        new_segments = []
+        if commit_to > 0:
+            if any(s["start"] < commit_to for s in speech):
+                new_segments, language = self._decode(
+                    pending[:commit_to], self.committed, beam_size=5
+                )
+                if self.language is None and new_segments:
+                    # 첫 확정 구간에서 감지한 언어를 세션 전체에 고정
+                    # (부분 결과의 greedy 디코딩은 짧은 구간이라 감지가 부정확할 수 있음)
+                    self.language = language
+            self.committed += commit_to
+            self.segments.extend(new_segments)
+            self._discard(commit_to)
+
+        partial = ""
+        if not final and any(s["end"] > commit_to for s in speech):
+            tail_segments, _ = self._decode(
+                pending[commit_to:],
+                self.committed,
+                beam_size=settings.STREAM_PARTIAL_BEAM_SIZE,
+            )
+            partial = " ".join(s["text"] for s in tail_segments).strip()
+
+        return {"segments": new_segments, "partial": partial}
+
+    @property
+    def text(self) -> str:
+        return " ".join(s["text"] for s in self.segments).strip()
@@ -1,99 +1,560 @@
-import os
+import json
 import time
+import asyncio
+import hashlib
 import logging
-from typing import Tuple, List, Dict, Any
-from faster_whisper import WhisperModel
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Tuple, List, Dict, Any, Union, Iterable, Iterator, AsyncIterator, Optional
+
+import numpy as np
+from faster_whisper import WhisperModel, BatchedInferencePipeline, decode_audio
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+from app.config import settings
+from app.services.audio_io import SAMPLE_RATE
+from app.services.inference_executor import InferenceExecutor
+from app.services.batch_scheduler import BatchScheduler
+from app.services.result_cache import ResultCache
+from app.services.model_registry import ModelRegistry
+from app.services.long_audio import LongAudioTranscriber
+from app.services import metrics, profiling
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 모델 생성 시 적용되는 프로필 옵션 (나머지는 model.transcribe()에 전달)
+MODEL_OPTION_KEYS = ("compute_type", "cpu_threads", "num_workers")
+
+# BatchedInferencePipeline이 사용하는 디코딩 옵션
+BATCH_DECODE_KEYS = (
+    "language",
+    "beam_size",
+    "best_of",
+    "patience",
+    "length_penalty",
+    "repetition_penalty",
+    "no_repeat_ngram_size",
+    "temperature",
+)
+
+# 배치 추론 구간 최대 길이 (BatchedInferencePipeline의 chunk_length와 같음)
+BATCH_CLIP_SECONDS = 30
+
+
+def split_batch_segments(
+    segments: Iterable[Any], clips: List[Dict[str, Any]], origins: List[float]
+) -> List[List[Dict[str, Any]]]:
+    """
+    이어 붙인 오디오의 배치 추론 결과를 요청별 세그먼트로 나눕니다.
+
+    Args:
+        segments: start/end/text를 가진 세그먼트 (이어 붙인 오디오 기준 시각)
+        clips: 배치 구간 {"start", "end", "owner"} (초, owner는 요청 위치), 시작 시각 순
+        origins: 요청별 오디오가 시작하는 시각 (초)
+
+    Returns:
+        list: 요청 위치별 {"start", "end", "text"} 리스트 (각 요청 오디오 기준 시각)
+    """
+    clip_starts = [clip["start"] for clip in clips]
+    per_request: List[List[Dict[str, Any]]] = [[] for _ in origins]
+    for segment in segments:
+        # faster-whisper는 세그먼트 시각을 ms 단위로 반올림하므로 샘플 단위 구간 경계보다
+        # 조금 앞설 수 있음. 시작 시각 대신 중간점으로 구간을 찾음
+        midpoint = (segment.start + segment.end) / 2
+        position = max(0, bisect_right(clip_starts, midpoint) - 1)
+        owner = clips[position]["owner"]
+        origin = origins[owner]
+        per_request[owner].append(
+            {
+                "start": max(0.0, segment.start - origin),
+                "end": max(0.0, segment.end - origin),
+                "text": segment.text,
+            }
+        )
+    return per_request
+
 
 class STTService:
     def __init__(self):
-        self.models = {}
-        # 기본 디바이스 설정: CUDA를 우선 시도
-        self.device = "cuda"
-        self.compute_type = "float16"  # CUDA의 경우 float16 권장
+        # 모델 로딩/캐시/해제는 레지스트리가 담당 (모델별 디바이스 및 compute_type 관리)
+        self.registry = ModelRegistry(
+            device=settings.STT_DEVICE,
+            memory_budget_mb=settings.STT_MODEL_MEMORY_BUDGET_MB,
+        )
 
-        # 간단한 CUDA 확인 (ctranslate2는 별도 라이브러리지만, 로직 상 try-except로 처리)
-        # 만약 실제 런타임에 CUDA가 없으면 로딩 시 에러가 발생하므로, 아래 get_model에서 처리
+        # 추론 전용 실행기: 이벤트 루프 밖에서 모델을 실행하고 대기열을 제한
+        self.executor = InferenceExecutor(
+            max_queue_size=settings.STT_MAX_QUEUE_SIZE,
+            model_concurrency=settings.STT_MODEL_CONCURRENCY,
+            default_concurrency=settings.STT_DEFAULT_MODEL_CONCURRENCY,
+            retry_after=settings.STT_RETRY_AFTER_SECONDS,
+        )
+        # 동시에 도착한 짧은 요청을 묶어 배치 추론하는 스케줄러
+        self.batch_scheduler = BatchScheduler(
+            self.executor,
+            self.transcribe_batch,
+            max_batch_size=settings.STT_BATCH_MAX_SIZE,
+            max_wait_ms=settings.STT_BATCH_MAX_WAIT_MS,
+        )
+        # 긴 녹음을 침묵 구간별로 나누어 여러 프로세스에서 병렬 전사
+        self.long_audio = LongAudioTranscriber(
+            workers=settings.STT_LONG_AUDIO_WORKERS,
+            chunk_seconds=settings.STT_LONG_AUDIO_CHUNK_SECONDS,
+            min_silence_ms=settings.STT_LONG_AUDIO_MIN_SILENCE_MS,
+            device=settings.STT_DEVICE,
+            memory_budget_mb=settings.STT_MODEL_MEMORY_BUDGET_MB,
+            cpu_threads=settings.STT_LONG_AUDIO_CPU_THREADS,
+        )
+        # 동일 오디오 재요청 시 디코딩을 생략하기 위한 결과 캐시
+        self.cache = (
+            ResultCache(
+                "stt",
+                max_bytes=settings.STT_CACHE_MAX_BYTES,
+                ttl_seconds=settings.STT_CACHE_TTL_SECONDS,
+                db_path=settings.STT_CACHE_DB_PATH,
+            )
+            if settings.STT_CACHE_ENABLED
+            else None
+        )
 
-    def get_model(self, model_size: str) -> WhisperModel:
+    def resolve_profile(self, profile: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        디코딩 프로필 이름을 설정값으로 변환합니다.
+
+        Raises:
+            ValueError: 정의되지 않은 프로필인 경우
+        """
+        name = profile or settings.STT_DEFAULT_PROFILE
+        if name not in settings.STT_DECODING_PROFILES:
+            raise ValueError(
+                f"알 수 없는 디코딩 프로필입니다: '{name}' "
+                f"(사용 가능: {', '.join(settings.STT_DECODING_PROFILES)})"
+            )
+        return name, settings.STT_DECODING_PROFILES[name]
+
+    def model_options(self, profile: Optional[str] = None) -> Dict[str, Any]:
+        """
+        모델 생성 시 적용되는 프로필 옵션 (compute_type, cpu_threads, num_workers)
+        """
+        _, options = self.resolve_profile(profile)
+        return {k: v for k, v in options.items() if k in MODEL_OPTION_KEYS}
+
+    def decode_options(self, profile: Optional[str] = None) -> Dict[str, Any]:
+        """
+        model.transcribe()에 전달되는 프로필 옵션입니다. (결과 캐시 키에 포함)
+        """
+        _, options = self.resolve_profile(profile)
+        decode = {"language": settings.STT_LANGUAGE}
+        decode.update({k: v for k, v in options.items() if k not in MODEL_OPTION_KEYS})
+        return decode
+
+    def get_model(self, model_size: str, profile: Optional[str] = None) -> WhisperModel:
         """
         요청된 사이즈의 모델을 로드하거나 캐시된 모델을 반환합니다.
-        CUDA 초기화 실패 시 CPU로 폴백합니다.
+        CUDA 초기화 실패 시 해당 모델만 CPU로 폴백합니다.
         """
-        if model_size in self.models:
-            return self.models[model_size]
+        return self.registry.get(model_size, **self.model_options(profile))
 
-        try:
-            logger.info(f"모델 '{model_size}' 로딩 중... Device: {self.device}")
-            model = WhisperModel(
-                model_size, device=self.device, compute_type=self.compute_type
+    def preload(self, model_sizes: List[str]):
+        """
+        설정된 모델을 기본 프로필 설정으로 미리 로딩하고 워밍업합니다.
+        """
+        self.registry.preload(model_sizes, **self.model_options())
+
+    def is_long_audio(self, audio: Union[str, np.ndarray]) -> bool:
+        """
+        병렬 구간 전사(장시간 오디오 모드)를 적용할 길이인지 확인합니다.
+        """
+        return (
+            settings.STT_LONG_AUDIO_ENABLED
+            and isinstance(audio, np.ndarray)
+            and audio.shape[0] / SAMPLE_RATE > settings.STT_LONG_AUDIO_SECONDS
+        )
+
+    def shutdown(self):
+        self.executor.shutdown()
+        self.long_audio.shutdown()
+
+    def cache_key(
+        self, audio_hash: str, model_size: str, profile: Optional[str] = None
+    ) -> str:
+        name, options = self.resolve_profile(profile)
+        options = json.dumps(
+            {"profile": name, "language": settings.STT_LANGUAGE, **options},
+            sort_keys=True,
+        )
+        return hashlib.sha256(
+            f"{audio_hash}:{model_size}:{options}".encode("utf-8")
+        ).hexdigest()
+
+    def lookup(
+        self, audio_hash: str, model_size: str, profile: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        같은 오디오/모델/디코딩 옵션의 전사 결과가 캐시에 있으면 반환합니다.
+        """
+        if self.cache is None:
+            return None
+        return self.cache.get(self.cache_key(audio_hash, model_size, profile))
+
+    def store(
+        self,
+        audio_hash: str,
+        model_size: str,
+        result: Dict[str, Any],
+        profile: Optional[str] = None,
+    ):
+        if self.cache is not None:
+            self.cache.set(self.cache_key(audio_hash, model_size, profile), result)
+
+    def iter_transcribe(
+        self,
+        audio_path: Union[str, np.ndarray],
+        model_size: str = "base",
+        profile: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        오디오를 디코딩하면서 세그먼트가 나오는 즉시 하나씩 반환합니다.
+
+        Yields:
+            dict: {"type": "segment", "start", "end", "text"} 를 세그먼트마다,
+                  마지막으로 {"type": "info", "language", "processing_time", "profile", "timings"}
+        """
+        start_time = time.time()
+        profile_name, _ = self.resolve_profile(profile)
+
+        if settings.STT_LONG_AUDIO_ENABLED and not isinstance(audio_path, np.ndarray):
+            with profiling.span("audio_decode"):
+                audio_path = decode_audio(audio_path, sampling_rate=SAMPLE_RATE)
+
+        if self.is_long_audio(audio_path):
+            # 모델은 워커 프로세스에서 로딩되므로 model_load는 0으로 기록
+            model_ready = start_time
+            segments_generator, info = self.long_audio.transcribe(
+                audio_path,
+                model_size,
+                self.model_options(profile_name),
+                self.decode_options(profile_name),
             )
-            # 로딩 성공 시 캐시
-            self.models[model_size] = model
-            logger.info(f"모델 '{model_size}' 로딩 완료 (Device: {self.device})")
-            return model
-        except Exception as e:
-            logger.warning(f"CUDA 모드로 모델 로딩 실패: {e}. CPU 모드로 전환합니다.")
-            self.device = "cpu"
-            self.compute_type = "int8"  # CPU에서는 int8 권장
-
-            try:
-                model = WhisperModel(
-                    model_size, device=self.device, compute_type=self.compute_type
-                )
-                self.models[model_size] = model
-                logger.info(f"모델 '{model_size}' 로딩 완료 (Device: {self.device})")
-                return model
-            except Exception as cpu_e:
-                logger.error(f"CPU 모드로 모델 로딩 실패: {cpu_e}")
-                raise cpu_e
+        else:
+            with profiling.span("model_load", model=model_size):
+                model = self.get_model(model_size, profile_name)
+            model_ready = time.time()
+
+            # transcribe 호출 (beam_size, vad_filter 등은 디코딩 프로필에서 결정)
+            segments_generator, info = model.transcribe(
+                audio_path, **self.decode_options(profile_name)
+            )
+
+        # segments는 제너레이터이므로 디코딩되는 대로 전달
+        with profiling.span("inference", model=model_size, profile=profile_name):
+            for segment in segments_generator:
+                yield {
+                    "type": "segment",
+                    "start": segment.start,
+                    "end": segment.end,
+                    "text": segment.text,
+                }
 
-    def transcribe(self, audio_path: str, model_size: str = "base") -> Dict[str, Any]:
+        end_time = time.time()
+        timings = {
+            "model_load": model_ready - start_time,
+            "inference": end_time - model_ready,
+        }
+        if isinstance(audio_path, np.ndarray):
+            audio_seconds = audio_path.shape[0] / SAMPLE_RATE
+        else:
+            audio_seconds = getattr(info, "duration", 0.0)
+        self._observe(model_size, audio_seconds, end_time - start_time, timings)
+        yield {
+            "type": "info",
+            "language": info.language,
+            "processing_time": end_time - start_time,
+            "profile": profile_name,
+            "timings": timings,
+        }
+
+    @staticmethod
+    def _observe(
+        model_size: str, audio_seconds: float, elapsed: float, timings: Dict[str, float]
+    ):
+        """
+        처리한 오디오 길이, 실시간 배율(RTF), 단계별 소요 시간을 메트릭으로 기록합니다.
+        """
+        metrics.STT_AUDIO_SECONDS.inc(audio_seconds, model=model_size)
+        if audio_seconds > 0:
+            metrics.STT_REAL_TIME_FACTOR.observe(elapsed / audio_seconds, model=model_size)
+        for stage, seconds in timings.items():
+            metrics.STAGE_DURATION.observe(seconds, stage=stage)
+
+    def transcribe(
+        self,
+        audio_path: Union[str, np.ndarray],
+        model_size: str = "base",
+        profile: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         오디오 파일을 텍스트로 변환합니다.
 
         Args:
-            audio_path (str): 오디오 파일 경로
+            audio_path (str | np.ndarray): 오디오 파일 경로 또는 16kHz float32 파형
             model_size (str): 모델 크기 ('base' or 'small')
+            profile (str, optional): 디코딩 프로필 이름 (기본값: STT_DEFAULT_PROFILE)
 
         Returns:
             dict: {
                 "text": 전체 텍스트,
                 "language": 감지된 언어,
                 "segments": 세그먼트 상세,
-                "processing_time": 소요 시간
+                "processing_time": 소요 시간,
+                "profile": 사용한 디코딩 프로필,
+                "timings": 단계별 소요 시간
             }
         """
+        segments = []
+        info = {}
+        for event in self.iter_transcribe(
+            audio_path, model_size=model_size, profile=profile
+        ):
+            if event["type"] == "segment":
+                segments.append(
+                    {"start": event["start"], "end": event["end"], "text": event["text"]}
+                )
+            else:
+                info = event
+
+        return self.build_result(segments, info)
+
+    @staticmethod
+    def build_result(
+        segments: List[Dict[str, Any]], info: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return {
+            "text": " ".join(s["text"] for s in segments).strip(),
+            "language": info["language"],
+            "segments": segments,
+            "processing_time": info["processing_time"],
+            "profile": info["profile"],
+            "timings": info["timings"],
+        }
+
+    def transcribe_batch(
+        self, model_size: str, profile: str, audios: List[np.ndarray]
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 요청의 짧은 오디오(각 30초 이하)를 한 번의 배치 추론으로 변환합니다.
+
+        오디오를 이어 붙인 뒤 요청별 구간을 clip_timestamps로 지정하여
+        BatchedInferencePipeline이 모든 구간을 함께 디코딩하도록 하고,
+        결과 세그먼트를 구간 경계 기준으로 다시 요청별로 나눕니다.
+        프로필의 vad_filter가 켜져 있으면 요청별 발화 구간만 디코딩합니다.
+
+        Returns:
+            list: 입력 순서와 같은 transcribe() 형식의 결과 리스트
+        """
         start_time = time.time()
+        model = self.get_model(model_size, profile)
+        model_ready = time.time()
+        pipeline = BatchedInferencePipeline(model=model)
+        decode = {
+            k: v
+            for k, v in self.decode_options(profile).items()
+            if k in BATCH_DECODE_KEYS
+        }
 
-        model = self.get_model(model_size)
+        # 언어가 다른 요청이 한 배치에 섞이지 않도록 언어별로 묶음
+        groups = defaultdict(list)
+        for index, audio in enumerate(audios):
+            language = decode.get("language")
+            if language is None:
+                language, _, _ = model.detect_language(audio)
+            groups[language].append(index)
 
-        # transcribe 호출
-        # beam_size=5 등은 일반적인 정확도 향상 옵션
-        segments_generator, info = model.transcribe(audio_path, beam_size=5)
+        # 프로필이 vad_filter를 켜면 요청별로 발화 구간만 배치 구간으로 지정
+        # (clip_timestamps를 넘기면 파이프라인 자체 VAD는 동작하지 않으므로 직접 적용)
+        vad_filter = self.decode_options(profile).get("vad_filter", False)
 
-        # segments는 제너레이터이므로 리스트로 변환하며 텍스트 추출
-        segments = []
-        full_text_list = []
+        results: List[Dict[str, Any]] = [None] * len(audios)
+        for language, indices in groups.items():
+            clips = []
+            origins = []
+            offset = 0
+            for position, index in enumerate(indices):
+                audio = audios[index]
+                if vad_filter:
+                    spans = [
+                        (speech["start"], speech["end"])
+                        for speech in get_speech_timestamps(
+                            audio,
+                            VadOptions(
+                                max_speech_duration_s=BATCH_CLIP_SECONDS,
+                                min_silence_duration_ms=160,
+                            ),
+                        )
+                    ]
+                else:
+                    spans = [(0, audio.shape[0])]
+                clips.extend(
+                    {
+                        "start": (offset + start) / SAMPLE_RATE,
+                        "end": (offset + end) / SAMPLE_RATE,
+                        "owner": position,
+                    }
+                    for start, end in spans
+                )
+                origins.append(offset / SAMPLE_RATE)
+                offset += audio.shape[0]
 
-        for segment in segments_generator:
-            full_text_list.append(segment.text)
-            segments.append(
-                {"start": segment.start, "end": segment.end, "text": segment.text}
+            per_request: List[List[Dict[str, Any]]] = [[] for _ in indices]
+            if clips:
+                merged = np.concatenate([audios[index] for index in indices])
+                segments_generator, _ = pipeline.transcribe(
+                    merged,
+                    **{**decode, "language": language},
+                    clip_timestamps=[
+                        {"start": clip["start"], "end": clip["end"]} for clip in clips
+                    ],
+                    batch_size=min(len(clips), settings.STT_BATCH_MAX_SIZE),
+                )
+                per_request = split_batch_segments(segments_generator, clips, origins)
+
+            for position, index in enumerate(indices):
+                results[index] = (per_request[position], language)
+
+        end_time = time.time()
+        info = {
+            "processing_time": end_time - start_time,
+            "profile": profile,
+            "timings": {
+                "model_load": model_ready - start_time,
+                "inference": end_time - model_ready,
+            },
+        }
+        self._observe(
+            model_size,
+            sum(audio.shape[0] for audio in audios) / SAMPLE_RATE,
+            end_time - start_time,
+            info["timings"],
+        )
+        return [
+            self.build_result(segments, {**info, "language": language})
+            for segments, language in results
+        ]
+
+    async def transcribe_async(
+        self,
+        audio_path: Union[str, np.ndarray],
+        model_size: str = "base",
+        audio_hash: Optional[str] = None,
+        profile: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        transcribe()를 추론 실행기에서 비동기로 실행합니다.
+        배치 처리가 켜져 있으면 짧은 오디오는 배치 스케줄러를 거쳐 다른 요청과 함께 디코딩됩니다.
+        audio_hash가 주어지면 결과를 캐시에 저장합니다.
+        대기열이 가득 찬 경우 QueueFullError가 발생합니다.
+        """
+        profile_name, _ = self.resolve_profile(profile)
+        result = await self._run_transcription(audio_path, model_size, profile_name)
+        if audio_hash is not None:
+            self.store(audio_hash, model_size, result, profile_name)
+        return result
+
+    async def _run_transcription(
+        self, audio_path: Union[str, np.ndarray], model_size: str, profile: str
+    ) -> Dict[str, Any]:
+        if not settings.STT_BATCHING_ENABLED:
+            return await self.executor.run(
+                model_size,
+                self.transcribe,
+                audio_path,
+                model_size=model_size,
+                profile=profile,
             )
 
-        processing_time = time.time() - start_time
-        full_text = " ".join(full_text_list).strip()
+        audio = audio_path
+        if not isinstance(audio, np.ndarray):
+            audio = await asyncio.to_thread(
+                decode_audio, audio_path, sampling_rate=SAMPLE_RATE
+            )
+        duration = audio.shape[0] / SAMPLE_RATE
+        if duration == 0:
+            return self.build_result(
+                [],
+                {"language": "", "processing_time": 0.0, "profile": profile, "timings": {}},
+            )
+        if duration <= min(settings.STT_BATCH_MAX_AUDIO_SECONDS, 30.0):
+            return await self.batch_scheduler.submit(model_size, audio, variant=profile)
 
-        return {
-            "text": full_text,
-            "language": info.language,
-            "segments": segments,
-            "processing_time": processing_time,
+        return await self.executor.run(
+            model_size, self.transcribe, audio, model_size=model_size, profile=profile
+        )
+
+    def transcribe_stream(
+        self,
+        audio_path: Union[str, np.ndarray],
+        model_size: str = "base",
+        audio_hash: Optional[str] = None,
+        profile: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        iter_transcribe()를 추론 실행기에서 실행하고 이벤트를 비동기 이터레이터로 전달합니다.
+        대기열 등록은 호출 즉시 이루어지므로, 대기열이 가득 찬 경우 여기서 QueueFullError가 발생합니다.
+        audio_hash가 주어지면 스트림이 끝까지 전송된 뒤 결과를 캐시에 저장합니다.
+        """
+        profile_name, _ = self.resolve_profile(profile)
+        events = self.executor.stream(
+            model_size,
+            self.iter_transcribe,
+            audio_path,
+            model_size=model_size,
+            profile=profile_name,
+        )
+        if audio_hash is None:
+            return events
+        return self._store_stream(events, audio_hash, model_size, profile_name)
+
+    async def _store_stream(
+        self,
+        events: AsyncIterator[Dict[str, Any]],
+        audio_hash: str,
+        model_size: str,
+        profile: str,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        segments = []
+        try:
+            async for event in events:
+                if event["type"] == "segment":
+                    segments.append(
+                        {"start": event["start"], "end": event["end"], "text": event["text"]}
+                    )
+                else:
+                    self.store(
+                        audio_hash,
+                        model_size,
+                        self.build_result(segments, event),
+                        profile,
+                    )
+                yield event
+        finally:
+            await events.aclose()
+
+    async def replay_stream(
+        self, result: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        캐시된 결과를 transcribe_stream()과 같은 이벤트 형식으로 전달합니다.
+        """
+        for segment in result["segments"]:
+            yield {"type": "segment", **segment}
+        yield {
+            "type": "info",
+            "language": result["language"],
+            "processing_time": result["processing_time"],
+            "profile": result["profile"],
+            "timings": result["timings"],
         }
 
 
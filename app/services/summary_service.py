@@ -1,11 +1,96 @@
-from typing import Optional
-from openai import OpenAI
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import unicodedata
+from typing import Any, AsyncIterator, Dict, List, Optional
 from app.config import settings
+from app.services.llm_client import llm_client, LLMConfigError
+from app.services.prompt_registry import prompt_registry, count_tokens
+from app.services.result_cache import ResultCache
+from app.services import metrics, profiling
+from app.services.extractive_summarizer import (
+    ExtractiveSummarizer,
+    MEDICAL_KEYWORDS,
+    split_sentences,
+)
+
+logger = logging.getLogger(__name__)
+
+# 구간 추출 결과를 다시 추출하는 최대 횟수 (병합 입력이 여전히 길 때)
+MAX_REDUCE_DEPTH = 3
+
+
+def split_transcript(text: str, max_tokens: int) -> List[str]:
+    """
+    대화 내용을 max_tokens 이하의 구간으로 나눕니다.
+
+    줄(세그먼트) 단위로 묶되, 한 줄이 너무 길면 문장 경계에서, 그래도 길면 단어 경계에서 나눕니다.
+    """
+    units = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if count_tokens(line) <= max_tokens:
+            units.append(line)
+            continue
+        for sentence in split_sentences(line):
+            if count_tokens(sentence) <= max_tokens:
+                units.append(sentence)
+                continue
+            words = []
+            for word in sentence.split():
+                if words and count_tokens(" ".join(words + [word])) > max_tokens:
+                    units.append(" ".join(words))
+                    words = []
+                words.append(word)
+            if words:
+                units.append(" ".join(words))
+
+    chunks = []
+    current: List[str] = []
+    current_tokens = 0
+    for unit in units:
+        tokens = count_tokens(unit)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(unit)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
 
 
 class SummaryService:
-    def summarize(
-        self, text: str, method: str = "rule-based", custom_prompt: Optional[str] = None
+    def __init__(self):
+        # 네트워크 없이 동작하는 추출 요약기 (rule-based 요약 및 LLM 장애 시 대체 요약)
+        self.extractive = ExtractiveSummarizer(
+            max_sentences=settings.SUMMARY_EXTRACTIVE_MAX_SENTENCES,
+            ratio=settings.SUMMARY_EXTRACTIVE_RATIO,
+            keyword_boost=settings.SUMMARY_KEYWORD_BOOST,
+            keywords=MEDICAL_KEYWORDS + settings.SUMMARY_EXTRA_KEYWORDS,
+        )
+        # 같은 대화/프롬프트/모델로 다시 요약할 때 LLM 호출을 생략하기 위한 캐시
+        self.cache = (
+            ResultCache(
+                "summary",
+                max_entries=settings.SUMMARY_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.SUMMARY_CACHE_TTL_SECONDS,
+                db_path=settings.SUMMARY_CACHE_DB_PATH,
+            )
+            if settings.SUMMARY_CACHE_ENABLED
+            else None
+        )
+
+    async def summarize(
+        self,
+        text: str,
+        method: str = "rule-based",
+        custom_prompt: Optional[str] = None,
+        template: Optional[str] = None,
     ) -> str:
         """
         주어진 텍스트를 요약합니다.
@@ -14,107 +99,455 @@ class SummaryService:
             text (str): 요약할 원본 텍스트
             method (str): 요약 방식 ('rule-based' 또는 'llm')
             custom_prompt (str, optional): LLM 요약 시 사용할 커스텀 프롬프트
+            template (str, optional): 프롬프트 템플릿 이름 (기본값: PROMPT_DEFAULT_TEMPLATE)
 
         Returns:
             str: 요약된 텍스트
         """
+        result = await self.summarize_result(text, method, custom_prompt, template)
+        return result["summary"]
+
+    async def summarize_result(
+        self,
+        text: str,
+        method: str = "rule-based",
+        custom_prompt: Optional[str] = None,
+        template: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        summarize()와 같지만 캐시 사용 여부와 대체 요약 여부를 함께 반환합니다.
+
+        Returns:
+            dict: {
+                "summary": 요약된 텍스트,
+                "cached": 캐시에서 반환했는지 여부,
+                "fallback": LLM 실패로 추출 요약을 대신 반환했는지 여부
+            }
+        """
         if not text:
-            return ""
+            return {"summary": "", "cached": False, "fallback": False}
 
         if method == "llm":
-            return self._summarize_with_llm(text, custom_prompt)
+            return await self._summarize_with_llm(text, custom_prompt, template)
         else:
-            return self._summarize_rule_based(text)
+            return {
+                "summary": self._summarize_rule_based(text),
+                "cached": False,
+                "fallback": False,
+            }
 
     def _summarize_rule_based(self, text: str) -> str:
         """
-        간단한 규칙 기반 요약:
-        텍스트가 길 경우 앞의 3문장만 추출하여 요약으로 간주합니다.
+        추출 요약: 문장을 TF-IDF/TextRank로 점수화하고 의료 용어가 포함된 문장을 우선하여
+        상위 문장을 원래 순서대로 반환합니다. (네트워크 호출 없음)
         """
-        # 문장 분리 (단순히 온점 기준)
-        sentences = [s.strip() for s in text.split(".") if s.strip()]
+        start_time = time.perf_counter()
+        with profiling.span("extractive_summary"):
+            summary = profiling.profile_call(self.extractive.summarize, text)
+        metrics.STAGE_DURATION.observe(
+            time.perf_counter() - start_time, stage="extractive_summary"
+        )
+        return summary
 
-        if len(sentences) <= 3:
-            return text
+    @staticmethod
+    def _messages(
+        text: str, custom_prompt: Optional[str] = None, template: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        if custom_prompt:
+            # Remove the placeholder if present to clean up system prompt
+            system_prompt = custom_prompt.replace("{text}", "").strip()
+        else:
+            # 시작 시 메모리에 올려둔 템플릿 사용 (요청마다 파일을 읽지 않음)
+            system_prompt = prompt_registry.get(
+                template or settings.PROMPT_DEFAULT_TEMPLATE
+            ).system_prompt()
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": text},
+        ]
 
-        # 상위 3문장 결합
-        summary = ". ".join(sentences[:3]) + "."
-        return summary
+    @staticmethod
+    def cache_key(messages: List[Dict[str, str]]) -> str:
+        """
+        정규화한 대화 내용, 최종 프롬프트 내용, Provider, 모델, temperature로 캐시 키를 만듭니다.
+        템플릿 파일이 수정되면 프롬프트 내용이 달라지므로 자동으로 다른 키가 됩니다.
+        """
+        system_prompt, text = messages[0]["content"], messages[1]["content"]
+        # 공백/줄바꿈 차이와 유니코드 조합형 차이는 같은 대화로 간주
+        normalized = " ".join(unicodedata.normalize("NFC", text).split())
+        key = json.dumps(
+            {
+                "text": normalized,
+                "prompt": hashlib.sha256(system_prompt.encode("utf-8")).hexdigest(),
+                "provider": llm_client.provider_name(),
+                "model": llm_client.model_name(),
+                "temperature": settings.LLM_TEMPERATURE,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
 
-    def _summarize_with_llm(
-        self, text: str, custom_prompt: Optional[str] = None
-    ) -> str:
+    def _lookup(self, key: str) -> Optional[str]:
+        if self.cache is None:
+            return None
+        cached = self.cache.get(key)
+        return cached["summary"] if cached is not None else None
+
+    def _store(self, key: str, summary: str):
+        if self.cache is not None and summary:
+            self.cache.set(key, {"summary": summary})
+
+    @staticmethod
+    def _extract_prompt() -> str:
+        return prompt_registry.get(settings.SUMMARY_EXTRACT_TEMPLATE).system_prompt()
+
+    @staticmethod
+    async def _extract(chunk: str, extract_prompt: str) -> str:
+        """
+        대화 구간 하나에서 SOAP 항목별 사실을 추출합니다. (map 단계)
         """
-        LLM API를 호출하여 요약하는 로직을 이곳에 구현합니다.
-        예: OpenAI API, Local LLM 등
+        return await llm_client.chat(
+            [
+                {"role": "system", "content": extract_prompt},
+                {"role": "user", "content": chunk},
+            ],
+            temperature=settings.LLM_TEMPERATURE,
+        )
+
+    async def _reduce_input(
+        self, messages: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
         """
-        # TODO: 실제 LLM API 연동 구현
-        # LLM Provider 확인 (기본값: openai)
-        llm_provider = settings.LLM_PROVIDER.lower()
+        대화가 SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS를 넘으면 map-reduce로 처리합니다.
 
-        # API Key 설정 (Ollama는 dummy 키 허용)
-        api_key = settings.OPENAI_API_KEY
+        - map: 대화를 구간으로 나누어 구간별 SOAP 사실 추출을 동시에 요청
+        - reduce: 추출 결과를 합쳐 원래 프롬프트(템플릿)로 최종 요약하도록 메시지를 바꿈
 
-        client_args = {}
-        model_name = "gpt-3.5-turbo"
+        짧은 대화는 messages를 그대로 반환합니다.
+        """
+        system_prompt, text = messages[0]["content"], messages[1]["content"]
+        if count_tokens(text) <= settings.SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS:
+            return messages
 
-        if llm_provider == "ollama":
-            # Ollama 설정
-            # 외부 Ollama 서버 주소 지원 (기본값: localhost)
-            base_url = settings.OLLAMA_BASE_URL
-            client_args["base_url"] = base_url
-            client_args["api_key"] = (
-                "ollama"  # Ollama requires a dummy key compliant with OpenAI SDK
+        extract_prompt = self._extract_prompt()
+        for depth in range(MAX_REDUCE_DEPTH):
+            chunks = split_transcript(text, settings.SUMMARY_CHUNK_TOKENS)
+            start_time = time.time()
+            # 동시 요청 수는 LLM 클라이언트의 Provider별 세마포어가 제한
+            notes = await asyncio.gather(
+                *[self._extract(chunk, extract_prompt) for chunk in chunks]
             )
-            model_name = "llama3.1"
-        else:
-            # OpenAI 설정
-            if not api_key:
-                return "Error: OPENAI_API_KEY environment variable is not set."
-            client_args["api_key"] = api_key
+            logger.info(
+                f"Map-reduce 요약: {len(chunks)}개 구간 추출 완료 "
+                f"({time.time() - start_time:.2f}s, depth {depth + 1})"
+            )
+            text = "\n\n".join(
+                f"[구간 {index + 1}]\n{note}" for index, note in enumerate(notes)
+            )
+            if (
+                len(chunks) == 1
+                or count_tokens(text) <= settings.SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS
+            ):
+                break
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {
+                "role": "user",
+                "content": "아래는 긴 진료 대화를 순서대로 구간별로 나누어 추출한 내용입니다. "
+                "구간 사이의 중복은 합치고, 전체 대화를 기준으로 작성하세요.\n\n" + text,
+            },
+        ]
+
+    async def _summarize_with_llm(
+        self,
+        text: str,
+        custom_prompt: Optional[str] = None,
+        template: Optional[str] = None,
+        pipeline: Optional["SummaryPipeline"] = None,
+    ) -> Dict[str, Any]:
+        """
+        공유 LLM 클라이언트(OpenAI 또는 Ollama)를 호출하여 요약합니다.
+        생성 중에도 이벤트 루프를 막지 않으므로 다른 요청은 계속 처리됩니다.
+        성공한 요약만 캐시에 저장합니다.
+        pipeline이 주어지면 전사 중에 미리 추출한 구간 결과로 최종 요약만 요청합니다.
+        """
+        llm_provider = llm_client.provider_name()
+        start_time = time.perf_counter()
 
         try:
-            import logging
+            messages = self._messages(text, custom_prompt, template)
+            key = self.cache_key(messages)
+            cached = self._lookup(key)
+            if cached is not None:
+                metrics.LLM_REQUESTS.inc(provider=llm_provider, outcome="cached")
+                return {"summary": cached, "cached": True, "fallback": False}
 
-            logger = logging.getLogger(__name__)
             logger.info(
-                f"Using LLM Provider: {llm_provider.upper()}, Model: {model_name}"
+                f"Using LLM Provider: {llm_provider.upper()}, Model: {llm_client.model_name()}"
             )
-
-            client = OpenAI(**client_args)
-
-            if custom_prompt:
-                template = custom_prompt
+            if pipeline is not None:
+                reduce_input = await pipeline.reduce_input(messages)
             else:
-                # 프롬프트 파일 경로 설정 (app/prompts/soap_summary_template.txt)
-                base_dir = os.path.dirname(
-                    os.path.dirname(os.path.abspath(__file__))
-                )  # app/
-                prompt_path = os.path.join(
-                    base_dir, "prompts", "soap_summary_template.txt"
+                reduce_input = await self._reduce_input(messages)
+            with profiling.span("llm_summary", provider=llm_provider):
+                summary = await llm_client.chat(
+                    reduce_input, temperature=settings.LLM_TEMPERATURE
                 )
+            self._store(key, summary)
+            metrics.LLM_REQUESTS.inc(provider=llm_provider, outcome="success")
+            metrics.STAGE_DURATION.observe(
+                time.perf_counter() - start_time, stage="llm_summary"
+            )
+            return {"summary": summary, "cached": False, "fallback": False}
 
-                try:
-                    with open(prompt_path, "r", encoding="utf-8") as f:
-                        template = f.read()
-                except Exception as e:
-                    return f"Error reading prompt file: {str(e)}"
+        except LLMConfigError as e:
+            metrics.LLM_REQUESTS.inc(provider=llm_provider, outcome="config_error")
+            return {"summary": f"Error: {str(e)}", "cached": False, "fallback": False}
+        except Exception as e:
+            metrics.LLM_REQUESTS.inc(provider=llm_provider, outcome="error")
+            if settings.SUMMARY_LLM_FALLBACK:
+                # LLM 서버 장애/타임아웃 시 추출 요약으로 대체 (캐시에는 저장하지 않음)
+                logger.warning(f"LLM 요약 실패, 추출 요약으로 대체 ({llm_provider}): {e}")
+                return {
+                    "summary": self._summarize_rule_based(text),
+                    "cached": False,
+                    "fallback": True,
+                }
+            return {
+                "summary": f"Error during LLM summarization ({llm_provider}): {str(e)}",
+                "cached": False,
+                "fallback": False,
+            }
 
-            # Remove the placeholder if present to clean up system prompt
-            system_prompt = template.replace("{text}", "").strip()
+    def pipeline(
+        self, custom_prompt: Optional[str] = None, template: Optional[str] = None
+    ) -> "SummaryPipeline":
+        """
+        STT 세그먼트를 받는 동안 LLM 요약을 미리 진행하는 파이프라인을 만듭니다.
+        """
+        return SummaryPipeline(self, custom_prompt, template)
+
+    async def stream_summary(
+        self,
+        text: str,
+        method: str = "llm",
+        custom_prompt: Optional[str] = None,
+        template: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        요약을 생성되는 대로 토큰 단위로 전달합니다.
+        캐시에 있는 요약은 한 번의 token 이벤트로 바로 전달합니다.
+
+        Yields:
+            dict: {"type": "token", "content"} 를 토큰마다,
+                  마지막으로 {"type": "done", "summary", "cached", "fallback", "metrics"}
+                  metrics: ttft(첫 토큰까지 걸린 시간), tokens, tokens_per_second, total_time
+        """
+        start_time = time.time()
+        if method != "llm" or not text:
+            summary = await self.summarize(text, method=method)
+            if summary:
+                yield {"type": "token", "content": summary}
+            yield self._done_event(summary, False, start_time, start_time, 0)
+            return
+
+        messages = self._messages(text, custom_prompt, template)
+        key = self.cache_key(messages)
+        cached = self._lookup(key)
+        if cached is not None:
+            metrics.LLM_REQUESTS.inc(provider=llm_client.provider_name(), outcome="cached")
+            yield {"type": "token", "content": cached}
+            yield self._done_event(cached, True, start_time, time.time(), 0)
+            return
+
+        llm_provider = llm_client.provider_name()
+        parts = []
+        first_token_time = None
+        try:
+            async for content in llm_client.stream_chat(
+                await self._reduce_input(messages), temperature=settings.LLM_TEMPERATURE
+            ):
+                if first_token_time is None:
+                    first_token_time = time.time()
+                parts.append(content)
+                yield {"type": "token", "content": content}
+        except LLMConfigError:
+            metrics.LLM_REQUESTS.inc(provider=llm_provider, outcome="config_error")
+            raise
+        except Exception as e:
+            metrics.LLM_REQUESTS.inc(provider=llm_provider, outcome="error")
+            # 토큰을 하나도 보내기 전에 실패한 경우에만 추출 요약으로 대체
+            if parts or not settings.SUMMARY_LLM_FALLBACK:
+                raise
+            logger.warning(f"LLM 요약 실패, 추출 요약으로 대체 ({llm_provider}): {e}")
+            summary = self._summarize_rule_based(text)
+            yield {"type": "token", "content": summary}
+            yield self._done_event(
+                summary, False, start_time, time.time(), 0, fallback=True
+            )
+            return
+
+        summary = "".join(parts).strip()
+        self._store(key, summary)
+        # 스트림 청크 하나를 토큰 하나로 간주 (OpenAI/Ollama 모두 토큰 단위로 전송)
+        event = self._done_event(summary, False, start_time, first_token_time, len(parts))
+        stream_metrics = event["metrics"]
+        logger.info(
+            f"[{llm_provider}] streaming summary: TTFT {stream_metrics['ttft']:.2f}s, "
+            f"{stream_metrics['tokens']} tokens, "
+            f"{stream_metrics['tokens_per_second']:.1f} tokens/s"
+        )
+        metrics.LLM_REQUESTS.inc(provider=llm_provider, outcome="success")
+        metrics.LLM_TIME_TO_FIRST_TOKEN.observe(stream_metrics["ttft"], provider=llm_provider)
+        metrics.LLM_TOKENS_PER_SECOND.observe(
+            stream_metrics["tokens_per_second"], provider=llm_provider, mode="stream"
+        )
+        metrics.STAGE_DURATION.observe(stream_metrics["total_time"], stage="llm_summary")
+        yield event
+
+    @staticmethod
+    def _done_event(
+        summary: str,
+        cached: bool,
+        start_time: float,
+        first_token_time: Optional[float],
+        tokens: int,
+        fallback: bool = False,
+    ) -> Dict[str, Any]:
+        end_time = time.time()
+        first_token_time = first_token_time or end_time
+        generation_time = end_time - first_token_time
+        return {
+            "type": "done",
+            "summary": summary,
+            "cached": cached,
+            "fallback": fallback,
+            "metrics": {
+                "ttft": first_token_time - start_time,
+                "tokens": tokens,
+                "tokens_per_second": tokens / generation_time if generation_time > 0 else 0.0,
+                "total_time": end_time - start_time,
+            },
+        }
+
+
+class SummaryPipeline:
+    """
+    전사와 LLM 요약을 겹쳐서 실행합니다.
+
+    세그먼트가 SUMMARY_CHUNK_TOKENS만큼 쌓일 때마다 그 구간의 SOAP 사실 추출(map)을
+    바로 요청하고, 전사가 끝나면 추출 결과와 마지막 구간 원문을 합쳐 최종 요약(merge)
+    한 번만 요청합니다. 따라서 전체 소요 시간은 대략 STT 시간 + 마지막 merge 시간입니다.
+
+    구간이 하나도 차지 않은 짧은 대화는 일반 LLM 요약과 같이 한 번에 요약합니다.
+    캐시 키와 실패 시 추출 요약 대체는 summarize(method="llm")과 같습니다.
+    """
+
+    def __init__(
+        self,
+        service: SummaryService,
+        custom_prompt: Optional[str] = None,
+        template: Optional[str] = None,
+    ):
+        self.service = service
+        self.custom_prompt = custom_prompt
+        self.template = template
+        self.window_tokens = settings.SUMMARY_CHUNK_TOKENS
+        self._texts: List[str] = []
+        self._window: List[str] = []
+        self._window_size = 0
+        self._extracts: List[asyncio.Task] = []
+        self._extract_prompt: Optional[str] = None
 
-            response = client.chat.completions.create(
-                model=model_name,
-                messages=[
+    def add(self, text: str):
+        """
+        전사된 세그먼트 텍스트를 추가합니다. 구간이 가득 차면 추출 요청을 시작합니다.
+        """
+        text = text.strip()
+        if not text:
+            return
+        self._texts.append(text)
+        tokens = count_tokens(text)
+        if self._window and self._window_size + tokens > self.window_tokens:
+            self._dispatch()
+        self._window.append(text)
+        self._window_size += tokens
+
+    def _dispatch(self):
+        if self._extract_prompt is None:
+            self._extract_prompt = self.service._extract_prompt()
+        chunk = "\n".join(self._window)
+        self._window, self._window_size = [], 0
+        self._extracts.append(
+            asyncio.create_task(self.service._extract(chunk, self._extract_prompt))
+        )
+
+    async def reduce_input(
+        self, messages: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """
+        미리 추출한 구간 결과와 마지막 구간 원문으로 merge 요청 메시지를 만듭니다.
+        """
+        if not self._extracts:
+            return await self.service._reduce_input(messages)
+
+        start_time = time.time()
+        notes = await asyncio.gather(*self._extracts)
+        logger.info(
+            f"파이프라인 요약: {len(notes)}개 구간 추출 대기 {time.time() - start_time:.2f}s"
+        )
+        sections = [f"[구간 {index + 1}]\n{note}" for index, note in enumerate(notes)]
+        if self._window:
+            sections.append(
+                f"[구간 {len(notes) + 1} - 원문 대화]\n" + "\n".join(self._window)
+            )
+        text = "\n\n".join(sections)
+
+        system_prompt = messages[0]["content"]
+        if count_tokens(text) > settings.SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS:
+            # 추출 결과도 길면 기존 map-reduce로 한 번 더 줄임
+            return await self.service._reduce_input(
+                [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": text},
-                ],
-                temperature=0.5,
+                ]
             )
-            return response.choices[0].message.content.strip()
+        return [
+            {"role": "system", "content": system_prompt},
+            {
+                "role": "user",
+                "content": "아래는 긴 진료 대화를 순서대로 구간별로 나누어 추출한 내용이며, "
+                "마지막 구간은 추출하지 않은 원문 대화입니다. "
+                "구간 사이의 중복은 합치고, 전체 대화를 기준으로 작성하세요.\n\n" + text,
+            },
+        ]
 
-        except Exception as e:
-            return f"Error during LLM summarization ({llm_provider}): {str(e)}"
+    async def finish(self) -> Dict[str, Any]:
+        """
+        전사가 끝난 뒤 호출합니다. summarize_result()와 같은 형식으로 반환합니다.
+        """
+        try:
+            text = "\n".join(self._texts)
+            if not text:
+                return {"summary": "", "cached": False, "fallback": False}
+            return await self.service._summarize_with_llm(
+                text, self.custom_prompt, self.template, pipeline=self
+            )
+        finally:
+            self.cancel()
+
+    def cancel(self):
+        """
+        아직 끝나지 않은 추출 요청을 취소합니다. (캐시 적중, 클라이언트 연결 종료 등)
+        """
+        for task in self._extracts:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # 실패한 요청의 예외를 소비하여 미처리 예외 경고 방지
+                task.exception()
 
 
 summary_service = SummaryService()
@@ -0,0 +1,96 @@
+import os
+import glob
+import logging
+from typing import Dict, List
+
+import numpy as np
+
+from app.services.audio_io import SAMPLE_RATE, load_audio
+
+logger = logging.getLogger(__name__)
+
+# 로컬에 준비한 실제 녹음 파일 위치 (있으면 합성 오디오와 함께 사용)
+AUDIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio")
+AUDIO_EXTENSIONS = (".wav", ".m4a", ".mp3", ".webm")
+
+
+# 모음별 포먼트 주파수 (F1, F2, F3)
+VOWEL_FORMANTS = [
+    (730, 1090, 2440),
+    (270, 2290, 3010),
+    (300, 870, 2240),
+    (530, 1840, 2480),
+    (570, 840, 2410),
+]
+
+
+def _syllable(rng: np.random.Generator, length: int) -> np.ndarray:
+    t = np.arange(length) / SAMPLE_RATE
+    f0 = rng.uniform(100, 220) * (1 + 0.08 * np.sin(2 * np.pi * rng.uniform(1, 3) * t))
+    phase = np.cumsum(f0) / SAMPLE_RATE
+    source = np.diff((phase % 1.0) * 2 - 1, prepend=0.0)  # 성대 펄스열
+
+    # 모음 포먼트를 주파수 영역에서 적용 (source-filter 모델)
+    spectrum = np.fft.rfft(source)
+    freqs = np.fft.rfftfreq(length, 1 / SAMPLE_RATE)
+    formants = VOWEL_FORMANTS[rng.integers(len(VOWEL_FORMANTS))]
+    envelope = sum(
+        gain * np.exp(-(((freqs - f) / (60 + f * 0.05)) ** 2) / 2)
+        for f, gain in zip(formants, (1.0, 0.6, 0.3))
+    )
+    voiced = np.fft.irfft(spectrum * envelope, n=length)
+    voiced /= np.abs(voiced).max() + 1e-9
+
+    # 자음처럼 들리는 짧은 잡음 구간
+    burst = min(length, int(0.05 * SAMPLE_RATE))
+    voiced[:burst] += 0.3 * rng.standard_normal(burst) * np.linspace(1, 0, burst)
+
+    fade = np.clip(np.minimum(t / 0.02, (t[-1] - t) / 0.03), 0, 1)
+    return voiced * fade
+
+
+def synthesize_speech_like(seconds: float, seed: int = 0) -> np.ndarray:
+    """
+    음성과 비슷한 스펙트럼/리듬을 갖는 합성 오디오를 생성합니다.
+
+    - 포먼트를 입힌 음절 4~12개로 이루어진 '발화'
+    - 발화 사이 0.3~1.2초의 침묵 (VAD가 실제 녹음처럼 발화 구간을 찾도록)
+
+    인식 정확도가 아니라 디코딩 속도를 측정하기 위한 용도입니다.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    audio = np.zeros(total, dtype=np.float32)
+
+    position = 0
+    while position < total:
+        for _ in range(rng.integers(4, 12)):
+            end = min(total, position + int(rng.uniform(0.15, 0.3) * SAMPLE_RATE))
+            if end <= position:
+                break
+            audio[position:end] = 0.3 * _syllable(rng, end - position)
+            position = end
+        position += int(rng.uniform(0.3, 1.2) * SAMPLE_RATE)
+
+    audio += 0.003 * rng.standard_normal(total).astype(np.float32)
+    return audio
+
+
+def load_fixtures(durations: List[float]) -> Dict[str, np.ndarray]:
+    """
+    길이별 합성 오디오와 bench/audio/ 아래의 로컬 녹음 파일을 16kHz 파형으로 반환합니다.
+    """
+    fixtures = {}
+    for index, seconds in enumerate(durations):
+        fixtures[f"synthetic_{int(seconds)}s"] = synthesize_speech_like(
+            seconds, seed=index
+        )
+
+    for path in sorted(glob.glob(os.path.join(AUDIO_DIR, "*"))):
+        if not path.lower().endswith(AUDIO_EXTENSIONS):
+            continue
+        with open(path, "rb") as f:
+            fixtures[os.path.basename(path)] = load_audio(f)
+        logger.info(f"로컬 벤치마크 오디오 로드: {path}")
+
+    return fixtures
@@ -0,0 +1,238 @@
+"""
+STT 성능 벤치마크
+
+모델 크기 x 디코딩 프로필 조합마다 STTService로 고정 오디오를 반복 전사하여
+실시간 배율(RTF), 지연 시간 백분위수(p50/p95/p99), 최대 RSS, 모델 로딩 시간을 JSON으로 출력합니다.
+조합마다 별도 프로세스에서 측정하므로 최대 RSS는 해당 조합만의 값입니다.
+
+사용 예:
+    python -m bench.stt_bench --models base small --profiles fast balanced \\
+        --durations 10 60 --repeats 5 --output bench/results/latest.json
+
+    # 이전 결과와 비교하여 p50 지연이 10% 이상 느려지면 종료 코드 1
+    python -m bench.stt_bench --baseline bench/results/previous.json --tolerance 0.1
+
+bench/audio/ 아래에 wav/m4a/mp3/webm 파일을 두면 합성 오디오와 함께 측정합니다.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import platform
+import resource
+import multiprocessing
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import numpy as np
+
+from app.config import settings
+
+# 반복 측정이 캐시 적중으로 끝나지 않도록 결과 캐시와 배치 처리를 끔
+settings.STT_CACHE_ENABLED = False
+settings.STT_BATCHING_ENABLED = False
+
+from app.services.audio_io import SAMPLE_RATE  # noqa: E402
+from app.services.stt_service import STTService  # noqa: E402
+from bench.fixtures import load_fixtures  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_mb() -> float:
+    """
+    프로세스 시작 이후 최대 RSS(MB). Linux는 KB, macOS는 byte 단위로 보고됩니다.
+    프로세스 전체 기간의 최댓값이므로 조합별 값은 조합마다 새 프로세스에서 읽어야 합니다.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    array = np.asarray(values, dtype=np.float64)
+    return {
+        "mean": float(array.mean()),
+        "min": float(array.min()),
+        "max": float(array.max()),
+        "p50": float(np.percentile(array, 50)),
+        "p95": float(np.percentile(array, 95)),
+        "p99": float(np.percentile(array, 99)),
+    }
+
+
+def bench_combination(
+    model_size: str,
+    profile: str,
+    fixtures: Dict[str, np.ndarray],
+    repeats: int,
+) -> Dict[str, Any]:
+    """
+    모델/프로필 한 조합을 측정합니다.
+    조합마다 새 STTService를 만들어 모델 로딩 시간이 이전 조합의 캐시에 가려지지 않게 합니다.
+    """
+    service = STTService()
+
+    start_time = time.perf_counter()
+    service.get_model(model_size, profile)
+    load_time = time.perf_counter() - start_time
+
+    # 첫 추론의 초기화 비용은 측정에서 제외
+    service.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), model_size, profile)
+
+    results = []
+    for name, audio in fixtures.items():
+        duration = audio.shape[0] / SAMPLE_RATE
+        latencies = []
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            service.transcribe(audio, model_size=model_size, profile=profile)
+            latencies.append(time.perf_counter() - start_time)
+
+        latency = summarize(latencies)
+        results.append(
+            {
+                "fixture": name,
+                "audio_seconds": duration,
+                "runs": repeats,
+                "latency": latency,
+                "rtf": {k: v / duration for k, v in latency.items()},
+            }
+        )
+        logger.info(
+            f"[{model_size}/{profile}] {name}: p50 {latency['p50']:.2f}s "
+            f"(RTF {latency['p50'] / duration:.3f})"
+        )
+
+    device = service.registry.stats()["models"]
+    service.shutdown()
+    return {
+        "model_size": model_size,
+        "profile": profile,
+        "device": device[0]["device"] if device else None,
+        "compute_type": device[0]["compute_type"] if device else None,
+        "model_load_time": load_time,
+        "peak_rss_mb": peak_rss_mb(),
+        "fixtures": results,
+    }
+
+
+def _init_worker():
+    logging.basicConfig(level=logging.INFO)
+
+
+def bench_isolated(
+    model_size: str,
+    profile: str,
+    fixtures: Dict[str, np.ndarray],
+    repeats: int,
+) -> Dict[str, Any]:
+    """
+    bench_combination()을 새 프로세스(spawn)에서 실행합니다.
+    ru_maxrss는 줄어들지 않으므로, 같은 프로세스에서 측정하면 가장 큰 모델 이후의
+    모든 조합이 같은 최대 RSS를 보고하게 됩니다.
+    (Linux는 exec 후에도 부모의 최대 RSS를 이어받으므로, 부모 프로세스에서는 모델을 로딩하지 않음)
+    """
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1, initializer=_init_worker) as pool:
+        return pool.apply(bench_combination, (model_size, profile, fixtures, repeats))
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[Dict[str, Any]]:
+    """
+    baseline 대비 p50 지연이 tolerance 비율 이상 늘어난 항목을 반환합니다.
+    """
+    previous = {
+        (r["model_size"], r["profile"], f["fixture"]): f["latency"]["p50"]
+        for r in baseline["results"]
+        for f in r["fixtures"]
+    }
+    regressions = []
+    for r in report["results"]:
+        for f in r["fixtures"]:
+            key = (r["model_size"], r["profile"], f["fixture"])
+            if key not in previous:
+                continue
+            before, after = previous[key], f["latency"]["p50"]
+            if before > 0 and after > before * (1 + tolerance):
+                regressions.append(
+                    {
+                        "model_size": key[0],
+                        "profile": key[1],
+                        "fixture": key[2],
+                        "baseline_p50": before,
+                        "p50": after,
+                        "change": after / before - 1,
+                    }
+                )
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="STT 성능 벤치마크")
+    parser.add_argument("--models", nargs="+", default=["base", "small"])
+    parser.add_argument(
+        "--profiles", nargs="+", default=list(settings.STT_DECODING_PROFILES)
+    )
+    parser.add_argument(
+        "--durations",
+        nargs="+",
+        type=float,
+        default=[10, 60, 300],
+        help="합성 오디오 길이(초)",
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (기본값: 표준 출력)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1, help="허용하는 p50 지연 증가 비율"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    fixtures = load_fixtures(args.durations)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "device": settings.STT_DEVICE,
+            "language": settings.STT_LANGUAGE,
+            "repeats": args.repeats,
+        },
+        "results": [
+            bench_isolated(model_size, profile, fixtures, args.repeats)
+            for model_size in args.models
+            for profile in args.profiles
+        ],
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+        if regressions:
+            logger.warning(f"속도 저하 {len(regressions)}건 감지")
+            exit_code = 1
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        logger.info(f"결과 저장: {args.output}")
+    else:
+        print(output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from app.services.batch_scheduler import BatchScheduler
+from app.services.inference_executor import InferenceExecutor
+
+
+def test_cancelled_caller_does_not_block_batch_siblings():
+    release = threading.Event()
+    batch_sizes = []
+
+    def run_batch(model_key, variant, audios):
+        batch_sizes.append(len(audios))
+        # 배치가 실행 중인 동안 첫 번째 호출자가 연결을 끊도록 대기
+        release.wait(timeout=5)
+        return [{"index": int(audio[0])} for audio in audios]
+
+    executor = InferenceExecutor(max_queue_size=8)
+    scheduler = BatchScheduler(executor, run_batch, max_batch_size=3, max_wait_ms=200)
+
+    async def scenario():
+        tasks = [
+            asyncio.create_task(scheduler.submit("base", np.array([i], dtype=np.float32)))
+            for i in range(3)
+        ]
+        while not batch_sizes:
+            await asyncio.sleep(0.01)
+
+        tasks[0].cancel()
+        await asyncio.sleep(0.05)
+        release.set()
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*tasks[1:]), timeout=5
+        )
+        assert tasks[0].cancelled()
+        return results
+
+    try:
+        results = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert batch_sizes == [3]
+    assert results == [{"index": 1}, {"index": 2}]
+
+
+def test_dispatch_failure_fails_batch_and_keeps_collecting():
+    executor = InferenceExecutor(max_queue_size=2)
+    scheduler = BatchScheduler(
+        executor,
+        lambda model_key, variant, audios: [{"size": len(audios)} for _ in audios],
+        max_batch_size=2,
+        max_wait_ms=10,
+    )
+    submit_admitted = executor.submit_admitted
+    calls = []
+
+    def flaky_submit(*args, **kwargs):
+        calls.append(args[0])
+        if len(calls) == 1:
+            raise RuntimeError("executor is shut down")
+        return submit_admitted(*args, **kwargs)
+
+    executor.submit_admitted = flaky_submit
+
+    async def scenario():
+        audio = np.zeros(1, dtype=np.float32)
+        first = await asyncio.wait_for(
+            asyncio.gather(
+                scheduler.submit("base", audio),
+                scheduler.submit("base", audio),
+                return_exceptions=True,
+            ),
+            timeout=5,
+        )
+        # 실패한 배치의 자리가 반환되지 않았다면 대기열(2)이 가득 차 QueueFullError 발생
+        second = await asyncio.wait_for(
+            asyncio.gather(
+                scheduler.submit("base", audio), scheduler.submit("base", audio)
+            ),
+            timeout=5,
+        )
+        return first, second
+
+    try:
+        first, second = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert all(isinstance(result, RuntimeError) for result in first)
+    assert second == [{"size": 2}, {"size": 2}]
+    assert executor.stats()["waiting"] == 0
@@ -0,0 +1,131 @@
+import json
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.routers import emr
+from app.services import emr_cache as cache_module
+from app.services.emr_cache import EMRCache
+
+
+class _FakeEMR:
+    """
+    경로별 응답 본문을 돌려주고 요청을 기록하는 emr_client.request 대역
+    """
+
+    def __init__(self):
+        self.version = 1
+        self.requests = []
+
+    async def request(self, method, path, headers=None, params=None):
+        self.requests.append((method, path, dict(headers or {})))
+        etag = f'"v{self.version}"'
+        if (headers or {}).get("if-none-match") == etag:
+            return httpx.Response(304, headers={"etag": etag})
+        return httpx.Response(
+            200,
+            json={"path": path, "version": self.version},
+            headers={"etag": etag},
+        )
+
+
+@pytest.fixture
+def fake_emr(monkeypatch):
+    fake = _FakeEMR()
+    monkeypatch.setattr(cache_module.emr_client, "request", fake.request)
+    return fake
+
+
+def _get(cache, path, headers=None):
+    return asyncio.run(cache.get("patient", path, {}, headers or {}))
+
+
+def test_hit_after_miss(fake_emr):
+    cache = EMRCache()
+    assert _get(cache, "patients/1")[1] == "MISS"
+    assert _get(cache, "patients/1")[1] == "HIT"
+    assert len(fake_emr.requests) == 1
+
+
+@pytest.mark.parametrize("header", ["authorization", "cookie", "x-api-key"])
+def test_credentials_are_part_of_the_key(fake_emr, header):
+    cache = EMRCache()
+    _get(cache, "patients/1", {header: "user-a"})
+
+    assert _get(cache, "patients/1", {header: "user-b"})[1] == "MISS"
+    assert _get(cache, "patients/1", {header: "user-a"})[1] == "HIT"
+
+
+def test_unknown_credential_header_bypasses_cache(fake_emr):
+    cache = EMRCache()
+    headers = {"x-session-token": "abc"}
+
+    assert _get(cache, "patients/1", headers)[1] == "BYPASS"
+    assert _get(cache, "patients/1", headers)[1] == "BYPASS"
+    assert cache.stats()["entries"] == 0
+
+
+def test_expired_entry_is_revalidated_with_etag(fake_emr, monkeypatch):
+    monkeypatch.setitem(settings.EMR_CACHE_TTLS, "patient", 0.05)
+    cache = EMRCache()
+    _get(cache, "patients/1")
+
+    asyncio.run(asyncio.sleep(0.06))
+    entry, status = _get(cache, "patients/1")
+
+    assert status == "REVALIDATED"
+    assert fake_emr.requests[-1][2]["if-none-match"] == '"v1"'
+    assert b'"version":1' in entry.body
+
+
+def test_invalidate_matches_whole_path_segments(fake_emr):
+    cache = EMRCache()
+    for path in ["patients/4", "patients/42", "patients/4/visits", "patients_archive/1"]:
+        _get(cache, path)
+
+    assert cache.invalidate("patients/4") == 2
+    assert _get(cache, "patients/42")[1] == "HIT"
+    assert cache.invalidate("patients") == 1
+    assert _get(cache, "patients_archive/1")[1] == "HIT"
+
+
+def test_write_route_invalidates_after_upstream_response(monkeypatch):
+    monkeypatch.setattr(settings, "EMR_API_URL", "http://emr.test")
+    monkeypatch.setattr(emr, "emr_cache", EMRCache())
+    cached_during_write = []
+
+    def upstream(request):
+        # 쓰기 요청이 EMR에 도달한 시점에는 아직 캐시가 남아 있고, 응답 후에 무효화됨
+        cached_during_write.append(emr.emr_cache.stats()["entries"])
+        if request.method == "POST":
+            status, data = 201, {"id": 7, **json.loads(request.content)}
+        else:
+            status, data = 200, {"id": 1, "name": "A", "dob": "2000-01-01", "gender": "F"}
+        return httpx.Response(
+            status,
+            headers={"content-type": "application/json"},
+            stream=httpx.ByteStream(json.dumps(data).encode()),
+        )
+
+    monkeypatch.setattr(
+        emr.emr_client,
+        "_client",
+        httpx.AsyncClient(transport=httpx.MockTransport(upstream)),
+    )
+
+    app = FastAPI()
+    app.include_router(emr.router)
+    with TestClient(app) as client:
+        assert client.get("/emr/patients/1").headers["x-cache"] == "MISS"
+        response = client.post(
+            "/emr/patients/", json={"name": "B", "dob": "1990-05-05", "gender": "M"}
+        )
+        assert response.status_code == 201
+        assert response.json()["name"] == "B"
+        assert client.get("/emr/patients/1").headers["x-cache"] == "MISS"
+
+    assert cached_during_write[1] == 1
@@ -0,0 +1,96 @@
+import json
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.routers import emr
+from app.services import emr_export
+
+TOTAL = 250
+UPSTREAM_MAX_PAGE = 100
+
+
+def _upstream(fail_from=None, cookie=None):
+    """
+    요청한 limit과 관계없이 최대 100개씩 돌려주는 EMR 목록 API 대역
+    """
+    calls = []
+
+    def handle(request):
+        skip = int(request.url.params["skip"])
+        limit = min(int(request.url.params["limit"]), UPSTREAM_MAX_PAGE)
+        calls.append(skip)
+        if cookie is not None and request.headers.get("cookie") != cookie:
+            status, data = 401, {"detail": "unauthorized"}
+        elif fail_from is not None and skip >= fail_from:
+            status, data = 503, {"detail": "unavailable"}
+        else:
+            status, data = 200, [{"id": i} for i in range(skip, min(skip + limit, TOTAL))]
+        return httpx.Response(status, json=data)
+
+    return handle, calls
+
+
+@pytest.fixture
+def emr_api(monkeypatch):
+    monkeypatch.setattr(settings, "EMR_API_URL", "http://emr.test")
+
+    def install(handler):
+        monkeypatch.setattr(
+            emr_export.emr_client,
+            "_client",
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+    return install
+
+
+def _export(page_size):
+    async def collect():
+        return [
+            json.loads(line)
+            async for line in emr_export.export_collection("patients/", page_size)
+        ]
+
+    return asyncio.run(collect())
+
+
+def test_pages_past_short_pages_until_empty(emr_api):
+    handler, calls = _upstream()
+    emr_api(handler)
+
+    lines = _export(page_size=500)
+
+    records = [line["data"]["id"] for line in lines if line["type"] == "record"]
+    assert records == list(range(TOTAL))
+    assert lines[-1] == {"type": "end", "count": TOTAL}
+    assert calls == [0, 100, 200, 250]
+
+
+def test_failure_ends_with_error_trailer(emr_api):
+    handler, _ = _upstream(fail_from=200)
+    emr_api(handler)
+
+    lines = _export(page_size=100)
+
+    assert sum(line["type"] == "record" for line in lines) == 200
+    assert lines[-1]["type"] == "error"
+    assert lines[-1]["count"] == 200
+
+
+def test_route_forwards_cookie_credentials(emr_api):
+    handler, _ = _upstream(cookie="sid=abc")
+    emr_api(handler)
+    app = FastAPI()
+    app.include_router(emr.router)
+
+    response = TestClient(app).get(
+        "/emr/patients/export", headers={"cookie": "sid=abc"}
+    )
+
+    assert response.status_code == 200
+    assert json.loads(response.text.splitlines()[-1]) == {"type": "end", "count": TOTAL}
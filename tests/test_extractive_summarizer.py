@@ -0,0 +1,53 @@
+import pytest
+
+from app.services.extractive_summarizer import MAX_SENTENCE_WORDS, split_sentences
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        (
+            "열이 나요. 기침도 하나요? 네!",
+            ["열이 나요.", "기침도 하나요?", "네!"],
+        ),
+        (
+            "어제부터 열이 났어요 목도 아파요 약은 드셨나요",
+            ["어제부터 열이 났어요", "목도 아파요", "약은 드셨나요"],
+        ),
+        (
+            "검사를 해보겠습니다 결과는 내일 나옵니다",
+            ["검사를 해보겠습니다", "결과는 내일 나옵니다"],
+        ),
+        (
+            "언제부터 아프셨을까 궁금하네요",
+            ["언제부터 아프셨을까", "궁금하네요"],
+        ),
+        ("의사: 안녕하세요\n환자: 목이 아파요", ["의사: 안녕하세요", "환자: 목이 아파요"]),
+    ],
+)
+def test_splits_on_punctuation_and_korean_endings(text, expected):
+    assert split_sentences(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "바다 보러 가요",  # 명사 '바다'
+        "필요 없어요",  # 명사 '필요'
+        "중요 사항",  # 명사 '중요'
+    ],
+)
+def test_nouns_ending_in_da_or_yo_are_not_boundaries(text):
+    assert split_sentences(text) == [text]
+
+
+def test_long_utterance_without_boundary_is_split_by_words():
+    text = " ".join(["word"] * (MAX_SENTENCE_WORDS * 2 + 5))
+
+    sentences = split_sentences(text)
+
+    assert [len(s.split()) for s in sentences] == [
+        MAX_SENTENCE_WORDS,
+        MAX_SENTENCE_WORDS,
+        5,
+    ]
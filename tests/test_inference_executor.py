@@ -0,0 +1,113 @@
+import io
+import wave
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.inference_executor import InferenceExecutor, QueueFullError
+
+
+@pytest.fixture
+def executor():
+    executor = InferenceExecutor(max_queue_size=2, retry_after=7)
+    yield executor
+    executor.shutdown()
+
+
+def test_admission_rejects_beyond_queue_size(executor):
+    executor.admit(2)
+
+    with pytest.raises(QueueFullError) as excinfo:
+        executor.admit()
+    assert excinfo.value.retry_after == 7
+
+    executor.release(2)
+    executor.admit()
+    assert executor.stats()["waiting"] == 1
+
+
+def test_run_counts_waiting_until_the_worker_starts(executor):
+    gate = threading.Event()
+
+    async def scenario():
+        # 스레드가 1개이므로 뒤의 작업은 첫 작업이 끝날 때까지 대기 (실행 중인 작업은 세지 않음)
+        first = asyncio.create_task(executor.run("base", gate.wait, 5))
+        queued = [
+            asyncio.create_task(executor.run("base", lambda i=i: i)) for i in range(2)
+        ]
+        await asyncio.sleep(0.05)
+        stats = executor.stats()
+        with pytest.raises(QueueFullError):
+            await executor.run("base", lambda: None)
+        gate.set()
+        return stats, await first, await asyncio.gather(*queued)
+
+    stats, first, queued = asyncio.run(scenario())
+
+    assert (stats["running"], stats["waiting"]) == (1, 2)
+    assert (first, queued) == (True, [0, 1])
+    assert executor.stats()["waiting"] == executor.stats()["running"] == 0
+
+
+def test_unconsumed_stream_releases_its_slot(executor):
+    gate = threading.Event()
+
+    def blocking():
+        gate.wait(5)
+        yield "busy"
+
+    async def scenario():
+        busy = executor.stream("base", blocking)
+        queued = executor.stream("base", lambda: iter(range(3)))
+        waiting = executor.stats()["waiting"]
+        # 한 번도 순회하지 않고 닫아도 대기열 자리가 반환되어야 함
+        await queued.aclose()
+        released = executor.stats()["waiting"]
+        gate.set()
+        return waiting, released, [item async for item in busy]
+
+    waiting, released, items = asyncio.run(scenario())
+
+    assert (waiting, released) == (1, 0)
+    assert items == ["busy"]
+
+
+def test_stream_propagates_producer_errors(executor):
+    def failing():
+        yield 1
+        raise ValueError("decode failed")
+
+    async def scenario():
+        items = []
+        with pytest.raises(ValueError):
+            async for item in executor.stream("base", failing):
+                items.append(item)
+        return items
+
+    assert asyncio.run(scenario()) == [1]
+
+
+def test_upload_returns_503_with_retry_after_when_queue_is_full(monkeypatch):
+    from app import main
+
+    async def full(*args, **kwargs):
+        raise QueueFullError(retry_after=7)
+
+    monkeypatch.setattr(main.stt_service, "transcribe_async", full)
+    monkeypatch.setattr(main.stt_service, "lookup", lambda *args: None)
+
+    audio = io.BytesIO()
+    with wave.open(audio, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(16000)
+        f.writeframes(b"\x00\x00" * 1600)
+
+    response = TestClient(main.app).post(
+        "/upload-audio", files={"file": ("a.wav", audio.getvalue(), "audio/wav")}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "7"
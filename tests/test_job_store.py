@@ -0,0 +1,75 @@
+import pytest
+
+from app.services.job_store import COMPLETED, FAILED, QUEUED, RUNNING, JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    yield store
+    store.close()
+
+
+def test_same_audio_returns_the_existing_job(store):
+    job, created = store.create("hash", "base", "balanced", "a.wav", "/tmp/a")
+    again, created_again = store.create("hash", "base", "balanced", "a.wav", "/tmp/b")
+
+    assert (created, created_again) == (True, False)
+    assert again["id"] == job["id"]
+    assert again["audio_path"] == "/tmp/a"
+
+    other, created_other = store.create("hash", "base", "fast", "a.wav", "/tmp/c")
+    assert created_other and other["id"] != job["id"]
+
+
+def test_failed_job_is_requeued_with_new_audio(store):
+    job, _ = store.create("hash", "base", "balanced", "a.wav", "/tmp/a")
+    store.claim_next()
+    store.fail(job["id"], "boom")
+
+    retried, created = store.create("hash", "base", "balanced", "a.wav", "/tmp/b")
+
+    assert created
+    assert retried["id"] == job["id"]
+    assert (retried["status"], retried["audio_path"], retried["error"]) == (
+        QUEUED,
+        "/tmp/b",
+        None,
+    )
+
+
+def test_completed_job_is_not_requeued(store):
+    job, _ = store.create("hash", "base", "balanced", "a.wav", "/tmp/a")
+    store.claim_next()
+    store.complete(job["id"], {"text": "완료", "segments": []})
+
+    again, created = store.create("hash", "base", "balanced", "a.wav", "/tmp/b")
+
+    assert not created
+    assert again["status"] == COMPLETED
+    assert again["result"] == {"text": "완료", "segments": []}
+
+
+def test_recover_requeues_running_jobs(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = JobStore(path)
+    job, _ = store.create("hash", "base", "balanced", "a.wav", "/tmp/a")
+    store.claim_next()
+    store.update_progress(job["id"], 0.5, [{"start": 0.0, "end": 1.0, "text": "부분"}])
+    assert store.get(job["id"])["status"] == RUNNING
+    store.close()
+
+    # 처리 중에 종료된 뒤 재시작
+    restarted = JobStore(path)
+    try:
+        assert restarted.recover() == 1
+        recovered = restarted.get(job["id"])
+        assert (recovered["status"], recovered["progress"], recovered["segments"]) == (
+            QUEUED,
+            0,
+            [],
+        )
+        assert restarted.claim_next()["id"] == job["id"]
+        assert restarted.get(job["id"])["status"] != FAILED
+    finally:
+        restarted.close()
@@ -0,0 +1,52 @@
+import numpy as np
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+from app.services.audio_io import SAMPLE_RATE
+from app.services.long_audio import plan_chunks
+from bench.fixtures import synthesize_speech_like
+
+
+def _silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def _speech_with_pauses(utterances, pause):
+    parts = []
+    for seed in range(utterances):
+        parts.extend([synthesize_speech_like(4.0, seed=seed), _silence(pause)])
+    return np.concatenate(parts)
+
+
+def test_silence_only_audio_has_no_chunks():
+    assert plan_chunks(_silence(5), chunk_seconds=10, min_silence_ms=500) == []
+
+
+def test_short_audio_is_a_single_chunk():
+    audio = _speech_with_pauses(1, pause=0.5)
+
+    assert plan_chunks(audio, chunk_seconds=30, min_silence_ms=500) == [
+        (0, audio.shape[0])
+    ]
+
+
+def test_chunks_cover_audio_and_respect_length():
+    audio = _speech_with_pauses(6, pause=1.0)
+    target = 10 * SAMPLE_RATE
+
+    chunks = plan_chunks(audio, chunk_seconds=10, min_silence_ms=500)
+
+    assert len(chunks) > 1
+    assert chunks[0][0] == 0 and chunks[-1][1] == audio.shape[0]
+    assert all(end - start <= target for start, end in chunks)
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+
+
+def test_chunks_are_cut_in_silence_between_utterances():
+    audio = _speech_with_pauses(6, pause=1.0)
+    speech = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500))
+
+    chunks = plan_chunks(audio, chunk_seconds=10, min_silence_ms=500)
+
+    for _, end in chunks[:-1]:
+        # 자른 위치가 발화 중간이 아니라 발화 사이 침묵에 있어야 함
+        assert not any(s["start"] < end < s["end"] for s in speech)
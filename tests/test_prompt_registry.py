@@ -0,0 +1,24 @@
+import pytest
+
+from app.services.prompt_registry import PromptRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    (tmp_path / "soap_summary_template.txt").write_text("요약: {text}", encoding="utf-8")
+    (tmp_path / "soap_extract_template.txt").write_text("추출: {text}", encoding="utf-8")
+    return PromptRegistry(str(tmp_path), reload_interval=0, internal=["soap_extract"])
+
+
+def test_internal_template_is_not_listed(registry):
+    registry.load()
+
+    assert [t["name"] for t in registry.list_templates()] == ["soap_summary"]
+
+
+def test_internal_template_is_only_available_internally(registry):
+    assert registry.get("soap_extract").system_prompt() == "추출:"
+
+    with pytest.raises(ValueError) as excinfo:
+        registry.get("soap_extract", include_internal=False)
+    assert "soap_extract" not in str(excinfo.value).split("사용 가능:")[1]
@@ -0,0 +1,51 @@
+import time
+
+from app.services.result_cache import ResultCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache("test", max_entries=2)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    cache.get("a")
+    cache.set("c", {"v": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.get("c") == {"v": 3}
+
+
+def test_byte_budget_evicts_and_skips_oversized_values():
+    cache = ResultCache("test", max_bytes=40)
+    cache.set("a", {"text": "x" * 10})
+    cache.set("b", {"text": "y" * 10})
+
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] <= 40
+
+    cache.set("huge", {"text": "z" * 100})
+    assert cache.get("huge") is None
+    assert cache.get("b") == {"text": "y" * 10}
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = ResultCache("test", ttl_seconds=0.05, db_path=str(tmp_path / "cache.db"))
+    cache.set("a", {"v": 1})
+    assert cache.get("a") == {"v": 1}
+
+    time.sleep(0.06)
+
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    ResultCache("test", db_path=path).set("a", {"text": "전사 결과"})
+
+    cache = ResultCache("test", db_path=path)
+
+    assert cache.get("a") == {"text": "전사 결과"}
+    assert cache.get("a") == {"text": "전사 결과"}
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["memory_hits"]) == (1, 1)
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.audio_io import SAMPLE_RATE
+from app.services.streaming_service import StreamingSession
+from bench.fixtures import synthesize_speech_like
+
+
+class _FakeModel:
+    """
+    받은 구간 전체를 세그먼트 하나로 돌려주고 입력 길이를 기록하는 WhisperModel 대역
+    """
+
+    def __init__(self):
+        self.lengths = []
+
+    def transcribe(self, audio, **kwargs):
+        self.lengths.append(audio.shape[0])
+        duration = audio.shape[0] / SAMPLE_RATE
+        segment = SimpleNamespace(start=0.0, end=duration, text=f"len={audio.shape[0]}")
+        return iter([segment]), SimpleNamespace(language="ko")
+
+
+def _session():
+    model = _FakeModel()
+    session = StreamingSession(SimpleNamespace(get_model=lambda size: model))
+    # 디코더 스레드 대신 파형을 직접 넣음
+    session.close()
+    session._decoder.join(timeout=5)
+    session.error = None
+    return session, model
+
+
+def _utterance(seed):
+    silence = np.zeros(int(1.5 * SAMPLE_RATE), dtype=np.float32)
+    return np.concatenate([synthesize_speech_like(4.0, seed=seed), silence])
+
+
+def test_committed_audio_is_discarded_and_timestamps_stay_absolute():
+    session, model = _session()
+
+    first = _utterance(seed=1)
+    session._chunks.append(first)
+    result = session.step()
+
+    assert len(result["segments"]) == 1
+    committed = session.committed
+    assert 0 < committed <= first.shape[0]
+    # 확정된 샘플은 버리고 이후 구간만 남김
+    assert session._snapshot().shape[0] == first.shape[0] - committed
+
+    second = _utterance(seed=2)
+    session._chunks.append(second)
+    result = session.step(final=True)
+
+    # 두 번째 전사는 첫 발화를 다시 포함하지 않음
+    assert model.lengths[-1] == first.shape[0] - committed + second.shape[0]
+    assert result["segments"][0]["start"] == pytest.approx(committed / SAMPLE_RATE)
+    assert session._snapshot().shape[0] == 0
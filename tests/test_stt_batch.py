@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services import stt_service as stt_module
+from app.services.audio_io import SAMPLE_RATE
+from app.services.stt_service import split_batch_segments, stt_service
+from bench.fixtures import synthesize_speech_like
+
+
+def _segment(start, end, text=""):
+    return SimpleNamespace(start=start, end=end, text=text)
+
+
+def test_segment_rounded_before_clip_start_stays_with_its_clip():
+    # 두 번째 요청은 19745 샘플(1.2340625s)에서 시작하지만
+    # faster-whisper는 세그먼트 시작을 1.234로 반올림해 돌려줌
+    origins = [0.0, 19745 / SAMPLE_RATE]
+    clips = [
+        {"start": 0.0, "end": origins[1], "owner": 0},
+        {"start": origins[1], "end": 2.5, "owner": 1},
+    ]
+    per_request = split_batch_segments(
+        [_segment(0.0, 1.234, "first"), _segment(1.234, 2.5, "second")],
+        clips,
+        origins,
+    )
+
+    assert [s["text"] for s in per_request[0]] == ["first"]
+    assert [s["text"] for s in per_request[1]] == ["second"]
+    assert per_request[1][0]["start"] == 0.0
+    assert per_request[1][0]["end"] == pytest.approx(2.5 - origins[1])
+
+
+def test_segments_of_multiple_clips_use_request_origin():
+    origins = [0.0, 10.0]
+    clips = [
+        {"start": 1.0, "end": 3.0, "owner": 0},
+        {"start": 11.0, "end": 12.0, "owner": 1},
+        {"start": 14.0, "end": 16.0, "owner": 1},
+    ]
+    per_request = split_batch_segments(
+        [_segment(1.0, 3.0, "a"), _segment(11.0, 12.0, "b"), _segment(14.0, 16.0, "c")],
+        clips,
+        origins,
+    )
+
+    assert [(s["start"], s["text"]) for s in per_request[0]] == [(1.0, "a")]
+    assert [(s["start"], s["text"]) for s in per_request[1]] == [(1.0, "b"), (4.0, "c")]
+
+
+class _FakePipeline:
+    """
+    구간마다 ms 단위로 반올림된 세그먼트 하나를 돌려주는 BatchedInferencePipeline 대역
+    """
+
+    calls = []
+
+    def __init__(self, model):
+        pass
+
+    def transcribe(self, audio, clip_timestamps, **kwargs):
+        _FakePipeline.calls.append(clip_timestamps)
+        segments = [
+            _segment(round(clip["start"], 3), round(clip["end"], 3), f"clip{index}")
+            for index, clip in enumerate(clip_timestamps)
+        ]
+        return iter(segments), None
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch):
+    _FakePipeline.calls = []
+    monkeypatch.setattr(stt_module, "BatchedInferencePipeline", _FakePipeline)
+    monkeypatch.setattr(stt_service, "get_model", lambda *args, **kwargs: object())
+    monkeypatch.setattr(settings, "STT_LANGUAGE", "ko")
+    return _FakePipeline
+
+
+def test_transcribe_batch_assigns_segments_to_each_request(fake_pipeline):
+    audios = [np.zeros(19745, dtype=np.float32), np.zeros(16000, dtype=np.float32)]
+
+    results = stt_service.transcribe_batch("base", "balanced", audios)
+
+    assert [r["text"] for r in results] == ["clip0", "clip1"]
+    assert results[1]["segments"][0]["start"] == 0.0
+    assert all(r["language"] == "ko" for r in results)
+
+
+def test_transcribe_batch_applies_profile_vad_filter(fake_pipeline):
+    silence = np.zeros(2 * SAMPLE_RATE, dtype=np.float32)
+    speech = np.concatenate(
+        [silence, synthesize_speech_like(3.0, seed=1).astype(np.float32)]
+    )
+
+    results = stt_service.transcribe_batch("base", "fast", [silence, speech])
+
+    # 발화가 없는 요청은 디코딩 구간이 없고, 발화 구간은 침묵 뒤에서 시작
+    clips = fake_pipeline.calls[0]
+    assert clips and all(clip["start"] >= 4.0 for clip in clips)
+    assert results[0]["segments"] == []
+    assert results[1]["segments"]
+    assert all(s["start"] >= 2.0 for s in results[1]["segments"])